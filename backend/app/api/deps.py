@@ -29,5 +29,12 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
     if user_data is None:
         raise credentials_exception
     return User(**user_data)
-    
-    raise credentials_exception 
\ No newline at end of file
+
+
+async def get_current_superuser(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends
+from typing import List
+from app.core.metrics import metrics
+from app.models.api import LLMCacheInvalidationResponse, LLMCacheStatsResponse, LLMTaskStats, MetricsSnapshotResponse
+from app.models.database import User
+from app.services.llm import task_stats
+from app.services.llm_cache import cache_stats, invalidate_prompt_version
+from app.services.resume_blobs import invalidate_resume_analyses
+from app.api.deps import get_current_superuser
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/llm-cache/stats", response_model=LLMCacheStatsResponse)
+async def get_llm_cache_stats(
+    current_user: User = Depends(get_current_superuser)
+):
+    """
+    Get LLM cache hit counts and hit rate for this process
+    """
+    return cache_stats()
+
+@router.delete("/llm-cache/{prompt_version}", response_model=LLMCacheInvalidationResponse)
+async def invalidate_llm_cache(
+    prompt_version: str,
+    current_user: User = Depends(get_current_superuser)
+):
+    """
+    Drop all cached LLM results produced by a prompt template version,
+    including stored analyses of deduplicated resumes
+    """
+    result = await invalidate_prompt_version(prompt_version)
+    resume_analyses_deleted = await invalidate_resume_analyses(prompt_version)
+    return {"prompt_version": prompt_version, **result, "resume_analyses_deleted": resume_analyses_deleted}
+
+@router.get("/llm-tasks/stats", response_model=List[LLMTaskStats])
+async def get_llm_task_stats(
+    current_user: User = Depends(get_current_superuser)
+):
+    """
+    Get the model routing, latency and token usage of each AI task for this process
+    """
+    return task_stats()
+
+@router.get("/metrics", response_model=MetricsSnapshotResponse)
+async def get_metrics(
+    current_user: User = Depends(get_current_superuser)
+):
+    """
+    Get every counter, gauge and latency summary recorded by this process
+    """
+    return metrics.snapshot()
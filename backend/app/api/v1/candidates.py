@@ -1,17 +1,27 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response, Body, Request
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response, Body, Request, Query
 from fastapi.responses import StreamingResponse
-from app.models.api import CandidateResponse
+from app.models.api import (
+    BulkUploadResponse,
+    CandidateListItemResponse,
+    CandidateResponse,
+    IngestionJobResponse,
+    RankedCandidateResponse,
+)
+from app.core.pagination import next_cursor
 from app.models.database import User
 from app.services.candidates import (
     process_call_results,
-    upload_resume,
+    upload_resumes_bulk,
     get_candidates,
     get_candidate,
     delete_candidate,
     get_resume_file,
+    promote_candidate,
+    rank_candidates,
     voice_screen_candidate
 )
+from app.services.ingestion import enqueue_ingestion
 from app.api.deps import get_current_user
 import os
 import logging
@@ -20,28 +30,91 @@ from io import BytesIO
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-@router.post("/{job_id}/upload", response_model=CandidateResponse)
+@router.post("/{job_id}/upload", status_code=202, response_model=IngestionJobResponse)
 async def create_upload_file(
     job_id: str,
     file: UploadFile,
     current_user: User = Depends(get_current_user)
 ):
     """
-    Upload a resume file (PDF or ZIP containing PDFs)
+    Upload a resume file (PDF or ZIP containing PDFs). The file is stored and
+    queued for background processing; poll /ingestion-jobs/{id} for per-file
+    progress and the created candidates.
+    """
+    return await enqueue_ingestion(job_id, file, current_user)
+
+@router.post("/{job_id}/upload/bulk", response_model=BulkUploadResponse)
+async def create_bulk_upload(
+    job_id: str,
+    file: UploadFile,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload a ZIP of resumes (or a single PDF), process the files concurrently
+    and return the outcome of every file
     """
-    return await upload_resume(job_id, file, current_user)
+    return await upload_resumes_bulk(job_id, file, current_user)
 
-@router.get("/{job_id}/candidates", response_model=List[CandidateResponse])
+@router.get(
+    "/{job_id}/candidates",
+    response_model=List[CandidateListItemResponse],
+    response_model_exclude_unset=True
+)
 async def list_candidates(
     job_id: str,
+    response: Response,
     skip: int = 0,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    min_resume_score: Optional[float] = Query(None, ge=0, le=100),
+    max_resume_score: Optional[float] = Query(None, ge=0, le=100),
+    min_screening_score: Optional[float] = Query(None, ge=0, le=100),
+    max_screening_score: Optional[float] = Query(None, ge=0, le=100),
+    max_notice_days: Optional[int] = Query(None, ge=0),
+    screening_status: Optional[str] = None,
+    view: str = "full",
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ):
     """
-    List all candidates for a job
+    List all candidates for a job, oldest first unless sorted by `sort`
+    (created_at, resume_score or screening_score, "-" prefixed for
+    descending), optionally filtered by score ranges, notice period and
+    screening status (not_screened, in_progress, screened). A full page
+    carries an X-Next-Cursor header; pass it back as `cursor` for the next page.
+
+    `view=summary` returns only the columns of the candidates table, and
+    `fields` (comma separated) only the fields listed, plus id and the sort field.
     """
-    return await get_candidates(job_id, skip, limit)
+    candidates = await get_candidates(
+        job_id, skip, limit, cursor,
+        sort=sort,
+        min_resume_score=min_resume_score,
+        max_resume_score=max_resume_score,
+        min_screening_score=min_screening_score,
+        max_screening_score=max_screening_score,
+        max_notice_days=max_notice_days,
+        screening_status=screening_status,
+        view=view,
+        fields=fields
+    )
+    cursor = next_cursor(candidates, limit, sort.lstrip("-"))
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return candidates
+
+@router.get("/{job_id}/candidates/ranked", response_model=List[RankedCandidateResponse])
+async def list_ranked_candidates(
+    job_id: str,
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List a job's candidates ranked by how well their resume text matches the
+    job description and requirements (local BM25, no AI call)
+    """
+    return await rank_candidates(job_id, limit)
 
 @router.get("/{job_id}/candidates/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate_details(
@@ -57,6 +130,18 @@ async def get_candidate_details(
         raise HTTPException(status_code=404, detail="Candidate not found")
     return candidate
 
+@router.post("/{job_id}/candidates/{candidate_id}/promote", response_model=CandidateResponse)
+async def promote_candidate_to_full_analysis(
+    job_id: str,
+    candidate_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Run the full resume analysis for a candidate the screening cascade only
+    coarse-scored
+    """
+    return await promote_candidate(job_id, candidate_id)
+
 @router.get("/{job_id}/candidates/{candidate_id}/resume")
 async def download_resume(
     job_id: str,
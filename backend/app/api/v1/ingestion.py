@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.models.api import IngestionJobResponse
+from app.models.database import User
+from app.services.ingestion import get_ingestion_job
+from app.api.deps import get_current_user
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/{ingestion_job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job_status(
+    ingestion_job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the status and per-file progress of a resume ingestion job
+    """
+    ingestion_job = await get_ingestion_job(ingestion_job_id)
+    if not ingestion_job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return ingestion_job
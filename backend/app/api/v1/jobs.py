@@ -1,15 +1,26 @@
-from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException, Depends, Body
+from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Body, Query, Response
+from app.core.pagination import InvalidCursor, next_cursor
 from app.models.database import create_job, serialize_job
 from app.services import jobs
 from app.services.auth import get_current_active_user
-from app.core.mongodb import get_database
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def parse_screening_threshold(value: Any) -> Optional[float]:
+    """Validate the optional per-job coarse score threshold of the screening cascade"""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 100:
+        raise HTTPException(
+            status_code=422,
+            detail="screening_threshold must be a number between 0 and 100"
+        )
+    return float(value)
+
 @router.post("/")
 async def create_new_job(
     job_data: Dict[str, Any] = Body(...),
@@ -52,7 +63,8 @@ async def create_new_job(
                 "title": job_data["title"].strip(),
                 "description": job_data["description"].strip(),
                 "responsibilities": job_data["responsibilities"].strip(),
-                "requirements": job_data["requirements"].strip()
+                "requirements": job_data["requirements"].strip(),
+                "screening_threshold": parse_screening_threshold(job_data.get("screening_threshold"))
             }
             logger.info(f"Cleaned job data: {cleaned_data}")
             
@@ -84,41 +96,29 @@ async def create_new_job(
         )
 
 @router.get("/")
-async def get_jobs(skip: int = 0, limit: int = 10) -> List[dict]:
-    return await jobs.get_jobs(skip=skip, limit=limit)
+async def get_jobs(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(10, ge=1, le=1000),
+    cursor: Optional[str] = None
+) -> List[dict]:
+    """
+    List jobs, newest first. A full page carries an X-Next-Cursor header;
+    pass it back as `cursor` for the next page.
+    """
+    try:
+        page = await jobs.get_jobs(skip=skip, limit=limit, cursor=cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cursor = next_cursor(page, limit)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+    return page
 
 @router.get("/stats")
 async def get_job_stats() -> dict:
-    """Get overall job statistics"""
-    db = await get_database()
-    
-    # Get total jobs
-    total_jobs = await db.jobs.count_documents({})
-    
-    # Get list of existing job IDs
-    job_ids = [job["_id"] async for job in db.jobs.find({}, {"_id": 1})]
-    
-    # Get total candidates from existing jobs only
-    total_candidates = await db.candidates.count_documents({"job_id": {"$in": job_ids}})
-    
-    # Get total resume screened candidates from existing jobs only
-    resume_screened = await db.candidates.count_documents({
-        "job_id": {"$in": job_ids},
-        "resume_score": {"$ne": None}
-    })
-    
-    # Get total phone screened candidates from existing jobs only
-    phone_screened = await db.candidates.count_documents({
-        "job_id": {"$in": job_ids},
-        "screening_score": {"$ne": None}
-    })
-    
-    return {
-        "total_jobs": total_jobs,
-        "total_candidates": total_candidates,
-        "resume_screened": resume_screened,
-        "phone_screened": phone_screened
-    }
+    """Get overall job statistics, from one precomputed document"""
+    return await jobs.get_job_stats()
 
 @router.get("/{job_id}")
 async def get_job(job_id: str) -> dict:
@@ -138,7 +138,8 @@ async def update_job(
         title=job_data.get("title"),
         description=job_data.get("description"),
         responsibilities=job_data.get("responsibilities"),
-        requirements=job_data.get("requirements")
+        requirements=job_data.get("requirements"),
+        screening_threshold=parse_screening_threshold(job_data.get("screening_threshold"))
     )
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
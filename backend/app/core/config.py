@@ -4,7 +4,7 @@ import logging
 import json
 from pathlib import Path
 from pydantic_settings import BaseSettings
-from pydantic import computed_field, field_validator
+from pydantic import BaseModel, computed_field, field_validator
 from urllib.parse import quote_plus
 
 # Configure logging
@@ -16,6 +16,13 @@ logging.basicConfig(
     ]
 )
 
+class AITaskRoute(BaseModel):
+    """Model and completion parameters for one kind of AI call; None uses the defaults"""
+    model: Optional[str] = None  # Defaults to AI_DEFAULT_MODEL
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    timeout: Optional[float] = None  # Defaults to AI_REQUEST_TIMEOUT
+
 class Settings(BaseSettings):
     model_config = {
         "case_sensitive": True,
@@ -46,10 +53,85 @@ class Settings(BaseSettings):
     # File upload settings
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
     ALLOWED_EXTENSIONS: set[str] = {"pdf", "zip"}
+    RESUME_UPLOAD_CONCURRENCY: int = 4  # Resumes processed in parallel per bulk upload
+    UPLOAD_SPOOL_MAX_MEMORY: int = 1024 * 1024  # Uploads larger than 1MB spill to disk
+    MAX_ZIP_MEMBERS: int = 1000
+    MAX_ZIP_UNCOMPRESSED_SIZE: int = 500 * 1024 * 1024  # 500MB
+
+    # PDF extraction settings
+    PDF_PARSE_WORKERS: int = 2  # Processes in the PDF parsing pool (0 parses in a thread)
+    PDF_PARSE_TIMEOUT: float = 30.0  # Seconds before a PDF parse is killed
+    PDF_MAX_PAGES: int = 50  # Pages of text extracted per resume
+    PDF_PARSE_MEMORY_LIMIT: int = 512 * 1024 * 1024  # Address space per parser process
+    RESUME_COMPACTION_ENABLED: bool = True  # Clean up extracted text before it is sent to the LLM
+    RESUME_TOKEN_BUDGET: int = 3000  # Estimated tokens of resume text per prompt, 0 for no limit
+    RESUME_CHUNKING_ENABLED: bool = True  # Analyze resumes over the budget in chunks, concurrently
+    RESUME_CHUNK_TOKENS: int = 2000  # Estimated tokens of resume text per chunk
+    RESUME_MAX_CHUNKS: int = 8  # Longer resumes are cut to this many chunks
+    RESUME_CHUNK_MERGE: str = "max"  # How a skill's proficiencies across chunks combine: "max" or "mean"
+
+    # Candidate ranking settings
+    LEXICAL_INDEX_ENABLED: bool = True  # Store resume term counts for local BM25 ranking against the job
+    LEXICAL_INDEX_MAX_JOBS: int = 64  # Jobs whose BM25 index each process keeps in memory, least recently ranked dropped first
+
+    # Resume deduplication settings
+    RESUME_DEDUP_ENABLED: bool = True
+    RESUME_DEDUP_SCOPE: str = "global"  # "global" reuses analyses across jobs, "job" per job
+
+    # Resume ingestion queue settings
+    INGESTION_LEASE_SECONDS: int = 300  # How long a worker owns a claimed ingestion job
+    INGESTION_MAX_ATTEMPTS: int = 3
+    INGESTION_INLINE_WORKER: bool = True  # Run one ingestion worker, one job at a time, inside the API process
+    INGESTION_RETRY_BACKOFF_SECONDS: float = 30.0  # Delay before a failed job is retried, doubled per attempt
+    INGESTION_WORKER_CONCURRENCY: int = 2  # Ingestion jobs run in parallel per worker process
+    INGESTION_POLL_INTERVAL: float = 5.0  # Seconds between queue polls when idle
+    INGESTION_SHUTDOWN_TIMEOUT: float = 30.0  # Seconds to finish in-flight jobs on shutdown
+
+    # Job statistics settings
+    JOB_STATS_RECONCILE_INTERVAL: float = 0.0  # Seconds between recounts of the job counters in the API, 0 disables
 
     # AI API settings
     AI_API_KEY: str
     AI_BASE_URL: str
+    AI_DEFAULT_MODEL: str = "meta-llama/Meta-Llama-3.1-8B-Instruct"
+    # Per-task routing, e.g. a small fast model for contact extraction and a
+    # stronger one for scoring. Tasks missing here use AI_DEFAULT_MODEL.
+    AI_TASK_ROUTES: Dict[str, AITaskRoute] = {
+        "contact_extraction": AITaskRoute(max_tokens=256, temperature=0.0),
+        "skill_scoring": AITaskRoute(max_tokens=1024, temperature=0.0),
+        "resume_combined": AITaskRoute(max_tokens=1280, temperature=0.0),
+        "call_summary": AITaskRoute(max_tokens=256, temperature=0.0),
+        # First pass of the screening cascade: a small model and a short answer
+        "coarse_screening": AITaskRoute(model="meta-llama/Llama-3.2-3B-Instruct", max_tokens=8, temperature=0.0),
+    }
+    AI_MAX_CONNECTIONS: int = 20  # Pooled HTTP connections to the AI provider
+    AI_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    AI_CONNECT_TIMEOUT: float = 5.0
+    AI_REQUEST_TIMEOUT: float = 60.0  # Default per-call timeout in seconds
+    AI_MAX_IN_FLIGHT: int = 8  # Upper bound of the adaptive concurrency limit per process
+    AI_MIN_IN_FLIGHT: int = 1  # Floor the limit backs off to on 429 / 5xx
+    AI_REQUESTS_PER_SECOND: float = 10.0  # Token bucket rate, 0 disables rate limiting
+    AI_BURST: int = 10
+    AI_MAX_RETRIES: int = 4  # Retries of 429, 5xx and connection errors
+    AI_RETRY_BASE_DELAY: float = 0.5  # Seconds, doubled per attempt with full jitter
+    AI_RETRY_MAX_DELAY: float = 30.0
+    AI_HEDGE_ENABLED: bool = False  # Send a second request when the first is slower than usual
+    AI_HEDGE_PERCENTILE: float = 95.0  # Hedge after this percentile of recent request latency
+    AI_HEDGE_MIN_DELAY: float = 1.0  # Never hedge earlier than this many seconds
+    AI_HEDGE_MIN_SAMPLES: int = 20  # Latency samples needed before hedging starts
+    RESUME_ANALYSIS_BUDGET: float = 120.0  # Seconds of AI calls allowed per resume, retries included
+    AI_PROMPT_JOB_CONTEXT: bool = False  # Include the job description in resume prompts and score against it
+    CONTACT_FAST_PATH_ENABLED: bool = True  # Extract contact details with patterns before asking the LLM
+    CONTACT_REQUIRED_FIELDS: List[str] = ["name", "email", "phone"]  # Fields that must be found locally to skip the LLM; location is kept when found
+    SCREENING_CASCADE_ENABLED: bool = False  # Coarse-score resumes first; only those above the job's threshold get the full analysis
+    SCREENING_CASCADE_THRESHOLD: float = 40.0  # Coarse score (0-100) needed for the full analysis, unless the job sets screening_threshold
+    SCREENING_CASCADE_TOKEN_BUDGET: int = 600  # Estimated tokens of resume text in the coarse prompt
+
+    # LLM response cache settings
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MEMORY_SIZE: int = 1024  # Entries kept in the in-process LRU
+    LLM_CACHE_MEMORY_TTL_SECONDS: float = 60.0  # Lifetime of in-process entries: how long other processes serve an invalidated prompt version
+    LLM_CACHE_TTL_SECONDS: int = 30 * 24 * 3600  # Lifetime of entries in the llm_cache collection
     
     # Voice Agent Integration settings
     TWILIO_ACCOUNT_SID: str = "your_twilio_account_sid"
@@ -0,0 +1,130 @@
+"""
+Declarative registry of the MongoDB indexes the application relies on.
+
+Each index is declared once below, with the queries it serves. They are
+reconciled idempotently when the API or an ingestion worker starts, and by
+`python scripts/ensure_indexes.py`, which also reports indexes that are
+declared but missing, present but not declared, or declared but unused
+since the server started (from $indexStats).
+
+Add an entry here, rather than a create_index() call in a service, whenever
+a new query pattern would otherwise scan a collection.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from pymongo.errors import OperationFailure
+
+from app.core.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: Tuple[Tuple[str, int], ...]
+    purpose: str  # The queries the index serves
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        """MongoDB's default name for the index keys, e.g. job_id_1_created_at_1"""
+        return "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+
+INDEXES: List[IndexSpec] = [
+    IndexSpec("users", (("email", 1),), "Login and registration look users up by email", {"unique": True}),
+    IndexSpec("jobs", (("created_at", -1), ("_id", -1)), "Job listing pages, newest first"),
+    IndexSpec(
+        "candidates", (("job_id", 1), ("created_at", 1), ("_id", 1)),
+        "Candidate listing pages of a job and candidate counts per job"
+    ),
+    IndexSpec(
+        "candidates", (("job_id", 1), ("resume_score", 1), ("_id", 1)),
+        "Candidate listings sorted or filtered by resume score, resume screened counts"
+    ),
+    IndexSpec(
+        "candidates", (("job_id", 1), ("screening_score", 1), ("_id", 1)),
+        "Candidate listings sorted or filtered by screening score, phone screened counts"
+    ),
+    IndexSpec("candidates", (("resume_file_id", 1),), "Shared resume file check when a candidate is deleted"),
+    IndexSpec(
+        "candidates", (("ingestion_key", 1),),
+        "At most one candidate per ingestion queue item, however often it is retried",
+        {"unique": True, "partialFilterExpression": {"ingestion_key": {"$type": "string"}}}
+    ),
+    IndexSpec("call_sessions", (("call_id", 1),), "Call lookup on every call webhook"),
+    IndexSpec(
+        "voice_configs", (("type", 1), ("job_id", 1)),
+        "Global voice config ({type}) and per-job voice config ({job_id, type}) on every screening"
+    ),
+    IndexSpec(
+        "ingestion_jobs", (("status", 1), ("lease_expires_at", 1), ("created_at", 1)),
+        "Workers claiming the oldest pending or expired ingestion job"
+    ),
+    IndexSpec("ingestion_jobs", (("job_id", 1), ("created_at", -1)), "Ingestion jobs of a job, newest first"),
+    IndexSpec("llm_cache", (("expires_at", 1),), "Expiry of cached LLM responses", {"expireAfterSeconds": 0}),
+    IndexSpec("llm_cache", (("prompt_version", 1),), "Invalidation of a prompt version's cached responses"),
+    IndexSpec("resume_terms", (("job_id", 1),), "Loading a job's lexical ranking index"),
+    IndexSpec("resume_terms", (("sha256", 1),), "Reusing the terms of a re-uploaded resume"),
+]
+
+
+async def ensure_indexes(db=None, indexes: Optional[List[IndexSpec]] = None) -> Dict[str, List[str]]:
+    """
+    Create the declared indexes that do not exist yet. Indexes that already
+    exist are left alone; one that conflicts with an existing index (same
+    name or keys, different options) is logged and reported as failed rather
+    than stopping startup.
+
+    Returns:
+        {"created": [...], "failed": [...]} as "collection.index_name"
+    """
+    db = db if db is not None else await get_database()
+    existing: Dict[str, Dict[str, Any]] = {}
+    report: Dict[str, List[str]] = {"created": [], "failed": []}
+
+    for spec in indexes or INDEXES:
+        if spec.collection not in existing:
+            existing[spec.collection] = await db[spec.collection].index_information()
+        if spec.name in existing[spec.collection]:
+            continue
+        try:
+            await db[spec.collection].create_index(list(spec.keys), name=spec.name, **spec.options)
+            report["created"].append(f"{spec.collection}.{spec.name}")
+            logger.info(f"Created index {spec.collection}.{spec.name}")
+        except OperationFailure as e:
+            report["failed"].append(f"{spec.collection}.{spec.name}")
+            logger.error(f"Error creating index {spec.collection}.{spec.name}: {str(e)}")
+    return report
+
+
+async def index_report(db=None, indexes: Optional[List[IndexSpec]] = None) -> Dict[str, List[str]]:
+    """
+    Compare the database with the registry.
+
+    Returns:
+        {"missing": declared but absent, "undeclared": present but not
+        declared, "unused": declared and present but not used since the
+        server started}, as "collection.index_name"
+    """
+    db = db if db is not None else await get_database()
+    declared: Dict[str, set] = {}
+    for spec in indexes or INDEXES:
+        declared.setdefault(spec.collection, set()).add(spec.name)
+
+    report: Dict[str, List[str]] = {"missing": [], "undeclared": [], "unused": []}
+    for collection in sorted(set(declared) | set(await db.list_collection_names())):
+        if collection.startswith("system.") or collection.startswith("fs."):
+            continue
+        present = set(await db[collection].index_information()) - {"_id_"}
+        wanted = declared.get(collection, set())
+        report["missing"] += [f"{collection}.{name}" for name in sorted(wanted - present)]
+        report["undeclared"] += [f"{collection}.{name}" for name in sorted(present - wanted)]
+        if present & wanted:
+            async for stats in db[collection].aggregate([{"$indexStats": {}}]):
+                if stats["name"] in wanted and not stats["accesses"]["ops"]:
+                    report["unused"].append(f"{collection}.{stats['name']}")
+    return report
@@ -0,0 +1,105 @@
+from collections import deque
+from typing import Dict, Optional
+import math
+import threading
+
+
+class Counter:
+    """A monotonically increasing counter"""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Gauge:
+    """A value that can go up and down"""
+
+    def __init__(self):
+        self._value = 0.0
+
+    def set(self, value: float):
+        self._value = value
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class LatencyTracker:
+    """Keeps the most recent observations (in milliseconds) and reports percentiles"""
+
+    def __init__(self, window: int = 1000):
+        self._samples = deque(maxlen=window)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float):
+        with self._lock:
+            self._samples.append(value_ms)
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile over the current window, q in [0, 100]"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, math.ceil(q / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {
+            "count": self._count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class MetricsRegistry:
+    """Process-local registry of named counters, gauges and latency trackers"""
+
+    def __init__(self):
+        self._counters: Dict[str, Counter] = {}
+        self._gauges: Dict[str, Gauge] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str) -> Counter:
+        with self._lock:
+            return self._counters.setdefault(name, Counter())
+
+    def gauge(self, name: str) -> Gauge:
+        with self._lock:
+            return self._gauges.setdefault(name, Gauge())
+
+    def latency(self, name: str) -> LatencyTracker:
+        with self._lock:
+            return self._latencies.setdefault(name, LatencyTracker())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            latencies = dict(self._latencies)
+        return {
+            "counters": {name: counter.value for name, counter in sorted(counters.items())},
+            "gauges": {name: gauge.value for name, gauge in sorted(gauges.items())},
+            "latencies": {name: tracker.summary() for name, tracker in sorted(latencies.items())},
+        }
+
+
+metrics = MetricsRegistry()
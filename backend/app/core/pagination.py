@@ -0,0 +1,67 @@
+"""
+Keyset (cursor) pagination for listings ordered by a field and _id.
+
+A page after a cursor is read with a range query on (sort field, _id)
+instead of skip(), so with an index on (filter fields, sort field, _id)
+every page costs the same however deep it is, and documents inserted while
+a client pages through a listing do not shift the pages it has not read.
+
+Cursors are opaque to clients: URL-safe base64 of the sort field, its value
+and the id of the last item of a page, as serialized in the API response.
+Sort values are numbers, ISO timestamps or null (MongoDB sorts nulls first).
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import json
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not issued by this API"""
+
+
+def encode_cursor(item: Dict[str, Any], sort_field: str = "created_at") -> str:
+    """Cursor pointing after a serialized item"""
+    payload = json.dumps([sort_field, item[sort_field], item["id"]])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, ObjectId]:
+    """(sort field, sort value, _id) of a cursor"""
+    try:
+        sort_field, value, item_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif value is not None and not isinstance(value, (int, float)):
+            raise TypeError(f"Unexpected sort value {value!r}")
+        return sort_field, value, ObjectId(item_id)
+    except (ValueError, TypeError, InvalidId) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def keyset_filter(cursor: str, sort_field: str = "created_at", direction: int = -1) -> Dict[str, Any]:
+    """Query matching the documents after the cursor in (sort_field, _id) `direction` order"""
+    cursor_field, value, item_id = decode_cursor(cursor)
+    if cursor_field != sort_field:
+        raise InvalidCursor(f"Cursor was issued for a listing sorted by {cursor_field}")
+
+    op = "$gt" if direction > 0 else "$lt"
+    tie = {sort_field: value, "_id": {op: item_id}}
+    if value is None:
+        # Ascending, every non-null value is still ahead; descending, only nulls are
+        return {"$or": [tie, {sort_field: {"$ne": None}}] if direction > 0 else [tie]}
+    after = [{sort_field: {op: value}}, tie]
+    if direction < 0:
+        # Range operators never match null, which comes last in descending order
+        after.append({sort_field: None})
+    return {"$or": after}
+
+
+def next_cursor(items: List[Dict[str, Any]], limit: int, sort_field: str = "created_at") -> Optional[str]:
+    """Cursor of the page after `items`, None when the page was not full (the last one)"""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(items[-1], sort_field)
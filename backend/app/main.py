@@ -4,10 +4,17 @@ from app.core.config import settings
 from app.core.mongodb import connect_to_mongo, close_mongo_connection, ensure_mongo_connection
 from app.api.v1.api import api_router
 from app.api.v1 import jobs, candidates, auth
+from app.core.indexes import ensure_indexes
 from app.services.jobs import migrate_job_fields
-from app.services.candidates import migrate_candidates_to_gridfs
+from app.services.candidates import migrate_candidates_to_gridfs, migrate_notice_period_days
+from app.services.ingestion import add_enqueue_listener, remove_enqueue_listener
+from app.services.job_stats import run_job_stats_reconciler
+from app.services.resume_parser import shutdown_parser_pool
+from app.services.llm import close_llm_client
+from app.workers.ingest import IngestionWorker
 import logging
 import contextlib
+import asyncio
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +40,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ✅ Use FastAPI lifespan to handle startup & shutdown
@@ -45,12 +53,39 @@ async def lifespan(app: FastAPI):
     try:
         await migrate_job_fields()
         await migrate_candidates_to_gridfs()
+        await migrate_notice_period_days()
+        await ensure_indexes()
     except Exception as e:
         logger.error(f"Error during startup: {str(e)}", exc_info=True)
         raise
 
+    # ✅ Process queued ingestion jobs, including those left by a previous run,
+    # one at a time with the same leases and retries as a standalone worker
+    ingestion_worker = ingestion_task = None
+    if settings.INGESTION_INLINE_WORKER:
+        ingestion_worker = IngestionWorker(concurrency=1)
+        add_enqueue_listener(ingestion_worker.wake)
+        ingestion_task = asyncio.create_task(ingestion_worker.run())
+
+    # ✅ Recount the job stats now and periodically, repairing missed increments
+    # (off by default: every run aggregates all candidates, see scripts/reconcile_job_stats.py)
+    reconciler_task = None
+    if settings.JOB_STATS_RECONCILE_INTERVAL > 0:
+        reconciler_task = asyncio.create_task(run_job_stats_reconciler())
+
     yield
 
+    if reconciler_task:
+        reconciler_task.cancel()
+    if ingestion_worker:
+        # Unfinished jobs go back to the queue after INGESTION_SHUTDOWN_TIMEOUT
+        remove_enqueue_listener(ingestion_worker.wake)
+        ingestion_worker.stop()
+        await ingestion_task
+
+    shutdown_parser_pool()
+    await close_llm_client()
+
     # ✅ Prevent closing MongoDB in Vercel
     logger.info("🔄 Skipping MongoDB shutdown to avoid event loop issues.")
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from pydantic import BaseModel, ConfigDict
 
 class UserResponse(BaseModel):
@@ -20,9 +20,12 @@ class CandidateResponse(BaseModel):
     email: str
     phone: Optional[str] = None
     location: Optional[str] = None
+    linkedin_url: Optional[str] = None
     resume_file_id: str
     skills: Dict[str, float]
-    resume_score: float
+    resume_score: Optional[float] = None  # None until fully analyzed, see screening_tier
+    screening_tier: str = "full"  # "coarse" when only the cascade's first pass ran
+    coarse_score: Optional[float] = None
     screening_score: Optional[float] = None
     screening_summary: Optional[str] = None
     created_by_id: Optional[str] = None
@@ -31,5 +34,102 @@ class CandidateResponse(BaseModel):
     current_compensation: Optional[str] = None
     expected_compensation: Optional[str] = None
     notice_period: Optional[str] = None
+    notice_period_days: Optional[int] = None
 
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
+
+class CandidateListItemResponse(BaseModel):
+    """A candidate of a listing, with the fields of the requested view or `fields` only"""
+    id: str
+    job_id: Optional[str] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    resume_file_id: Optional[str] = None
+    skills: Optional[Dict[str, float]] = None
+    resume_score: Optional[float] = None
+    screening_tier: Optional[str] = None
+    coarse_score: Optional[float] = None
+    screening_score: Optional[float] = None
+    screening_summary: Optional[str] = None
+    created_by_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    screening_in_progress: Optional[bool] = None
+    current_compensation: Optional[str] = None
+    expected_compensation: Optional[str] = None
+    notice_period: Optional[str] = None
+    notice_period_days: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class RankedCandidateResponse(CandidateResponse):
+    lexical_score: float
+
+class ResumeUploadResult(BaseModel):
+    filename: str
+    status: str
+    candidate_id: Optional[str] = None
+    duration_ms: float
+    error: Optional[str] = None
+
+class BulkUploadResponse(BaseModel):
+    job_id: str
+    total: int
+    succeeded: int
+    failed: int
+    duration_ms: float
+    results: List[ResumeUploadResult]
+
+class IngestionItemResponse(BaseModel):
+    filename: str
+    status: str
+    candidate_id: Optional[str] = None
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+
+class IngestionJobResponse(BaseModel):
+    id: str
+    job_id: str
+    filename: str
+    status: str
+    total: int
+    processed: int
+    succeeded: int
+    failed: int
+    items: List[IngestionItemResponse]
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+
+class LLMCacheStatsResponse(BaseModel):
+    memory_hits: int
+    db_hits: int
+    misses: int
+    hit_rate: float
+    memory_entries: int
+
+class LLMCacheInvalidationResponse(BaseModel):
+    prompt_version: str
+    memory_deleted: int
+    deleted: int
+    resume_analyses_deleted: int
+
+class MetricsSnapshotResponse(BaseModel):
+    counters: Dict[str, int]
+    gauges: Dict[str, float]
+    latencies: Dict[str, Dict[str, Optional[float]]]
+
+class LLMTaskStats(BaseModel):
+    task: str
+    model: str
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    requests: int
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    prompt_tokens: int
+    completion_tokens: int
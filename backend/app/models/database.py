@@ -162,6 +162,7 @@ def serialize_job(job: dict) -> dict:
         "total_candidates": int(job.get("total_candidates", 0)),
         "resume_screened": int(job.get("resume_screened", 0)),
         "phone_screened": int(job.get("phone_screened", 0)),
+        "screening_threshold": job.get("screening_threshold"),
         "created_by_id": str(job["created_by_id"]) if isinstance(job["created_by_id"], ObjectId) else str(job["created_by_id"]),
         "created_at": job["created_at"].isoformat() if isinstance(job["created_at"], datetime) else job["created_at"],
         "updated_at": job["updated_at"].isoformat() if isinstance(job["updated_at"], datetime) else job["updated_at"]
@@ -180,14 +181,18 @@ def serialize_candidate(candidate: dict) -> dict:
             "email": candidate["email"],
             "phone": candidate["phone"],
             "location": candidate["location"],
+            "linkedin_url": candidate.get("linkedin_url"),
             "resume_file_id": resume_identifier,  # Use whichever we found
             "skills": candidate["skills"],
             "resume_score": candidate["resume_score"],
+            "screening_tier": candidate.get("screening_tier", "full"),
+            "coarse_score": candidate.get("coarse_score"),
             "screening_score": candidate["screening_score"],
             "screening_summary": candidate["screening_summary"],
             "screening_in_progress": candidate.get("screening_in_progress", False),
             "call_transcript": candidate.get("call_transcript"),
             "notice_period": candidate.get("notice_period"),
+            "notice_period_days": candidate.get("notice_period_days"),
             "current_compensation": candidate.get("current_compensation"),
             "expected_compensation": candidate.get("expected_compensation"),
             "created_by_id": str(candidate["created_by_id"]) if candidate.get("created_by_id") else None,
@@ -199,6 +204,25 @@ def serialize_candidate(candidate: dict) -> dict:
         logger.error(f"Candidate data: {candidate}")
         raise
 
+def serialize_ingestion_job(ingestion_job: dict) -> dict:
+    """Convert MongoDB ingestion job document to JSON-serializable format"""
+    completed_at = ingestion_job.get("completed_at")
+    return {
+        "id": str(ingestion_job["_id"]),
+        "job_id": str(ingestion_job["job_id"]),
+        "filename": ingestion_job["filename"],
+        "status": ingestion_job["status"],
+        "total": ingestion_job["total"],
+        "processed": ingestion_job["processed"],
+        "succeeded": ingestion_job["succeeded"],
+        "failed": ingestion_job["failed"],
+        "items": ingestion_job["items"],
+        "error": ingestion_job.get("error"),
+        "created_at": ingestion_job["created_at"].isoformat(),
+        "updated_at": ingestion_job["updated_at"].isoformat(),
+        "completed_at": completed_at.isoformat() if completed_at else None
+    }
+
 async def get_candidate_by_id(candidate_id: str) -> Optional[dict]:
     """
     Get a candidate by ID without requiring the job_id
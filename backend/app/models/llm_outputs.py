@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field, RootModel
+from typing import Annotated, Optional, Dict
+
+# Schemas of the JSON the LLM is asked to return (see app.services.ai).
+# Responses are validated against these before use; a response that does not
+# validate gets one corrective retry (see app.services.structured_output).
+
+Proficiency = Annotated[float, Field(ge=0, le=1)]
+
+
+class SkillScores(RootModel[Dict[str, Proficiency]]):
+    """Skill name to proficiency from 0.0 to 1.0"""
+
+
+class OverallScore(RootModel[Proficiency]):
+    """A bare overall score from 0.0 to 1.0"""
+
+
+class ContactInfo(BaseModel):
+    # name and email must be present, but may be null when not found
+    name: Optional[str]
+    email: Optional[str]
+    phone: Optional[str] = None
+    location: Optional[str] = None
+
+
+class ResumeAnalysis(BaseModel):
+    skills: Dict[str, Proficiency]
+    score: Proficiency
+
+
+class CombinedResumeAnalysis(ResumeAnalysis):
+    contact: ContactInfo
+
+
+class CallTranscriptAnalysis(BaseModel):
+    notice_period: str = "Unknown"
+    current_compensation: str = "Unknown"
+    expected_compensation: str = "Unknown"
+    screening_score: float = Field(ge=0, le=100)
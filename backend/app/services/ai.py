@@ -1,142 +1,244 @@
-import PyPDF2
-from typing import Dict, Any
-import re
-from openai import OpenAI
-from pathlib import Path
-import json
+from typing import Dict, Any, List, Optional, Tuple
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.contact_extraction import (
+    CONTACT_FIELDS,
+    extract_contact_details,
+    merge_contact_details,
+    missing_contact_fields,
+)
+from app.services.llm import task_model
+from app.services.llm_cache import get_cached_response, set_cached_response
+from app.services.resume_parser import ParsedResume
+from app.services.text_compaction import chunk_text, fit_to_budget, outline_sections
+from app.services.structured_output import StructuredOutputError, complete_json
+from app.models.llm_outputs import (
+    CallTranscriptAnalysis,
+    CombinedResumeAnalysis,
+    ContactInfo,
+    OverallScore,
+    ResumeAnalysis,
+    SkillScores,
+)
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client with environment variables
-openai = OpenAI(
-    api_key=settings.AI_API_KEY,
-    base_url=settings.AI_BASE_URL,
+# AI tasks, each routed to a model and parameters by settings.AI_TASK_ROUTES
+CONTACT_TASK = "contact_extraction"
+SCORING_TASK = "skill_scoring"
+COMBINED_TASK = "resume_combined"
+CALL_SUMMARY_TASK = "call_summary"
+COARSE_SCREENING_TASK = "coarse_screening"
+
+# Prompt template versions, part of the LLM cache key.
+# Bump a version whenever its prompt or parsing changes.
+CONTACT_PROMPT_VERSION = "contact-v3"
+RESUME_ANALYSIS_PROMPT_VERSION = "resume-analysis-v3"
+COMBINED_PROMPT_VERSION = "resume-combined-v3"
+CALL_TRANSCRIPT_PROMPT_VERSION = "call-transcript-v3"
+COARSE_SCREENING_PROMPT_VERSION = "coarse-screening-v1"
+CHUNKED_ANALYSIS_PROMPT_VERSION = "resume-chunked-v1"
+
+# The (task, prompt version) pairs a full resume analysis may use: the
+# combined call and its fallbacks (see extract_and_analyze_resume)
+RESUME_ANALYSIS_PROMPTS = (
+    (COMBINED_TASK, COMBINED_PROMPT_VERSION),
+    (CONTACT_TASK, CONTACT_PROMPT_VERSION),
+    (SCORING_TASK, RESUME_ANALYSIS_PROMPT_VERSION),
+    (SCORING_TASK, CHUNKED_ANALYSIS_PROMPT_VERSION),
 )
 
+# Prompts are laid out as a static system message followed by the variable
+# input (optional job context first, then the resume), so every request of a
+# kind shares the same prefix and the provider's prompt caching applies across
+# candidates. Keep anything that varies per request out of these constants.
 
-async def analyze_resume(file_path: str) -> Dict[str, Any]:
-    """
-    Analyze a resume using the Llama model.
-    """
-    # Extract text from PDF
-    text = extract_text_from_pdf(file_path)
-    
-    # Analyze resume using Llama
-    analysis = await analyze_text_with_llama(text)
-    
-    return {
-        "skills": analysis["skills"],
-        "score": analysis["score"]
-    }
+SKILLS_SYSTEM_PROMPT = """You are an AI resume analyzer. Extract technical skills from the resume text given by the user and rate each skill's proficiency level from 0.0 to 1.0 based on the context and experience described. Only include skills that are clearly demonstrated in the text.
 
-async def extract_text_from_pdf(file_path: str) -> str:
-    """
-    Extract text content from a PDF file.
-    """
-    text = ""
-    try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-    except Exception as e:
-        print(f"Error extracting text from PDF: {str(e)}")
-        return ""
-    return text
+Provide your response in the following format:
+{"python": 0.8, "javascript": 0.7}
+Only include the JSON object, nothing else."""
 
-async def analyze_text_with_llama(text: str) -> Dict[str, Any]:
-    """
-    Analyze resume text using the Llama model.
-    """
-    # Prepare the prompt for skills extraction
-    skills_prompt = f"""
-    You are an AI resume analyzer. Extract technical skills from the following resume text and rate each skill's proficiency level from 0.0 to 1.0 based on the context and experience described. Only include skills that are clearly demonstrated in the text.
+SCORE_SYSTEM_PROMPT = """You are an AI resume analyzer. Based on the resume text given by the user, provide a single overall score from 0.0 to 1.0 that represents the candidate's qualifications. Consider factors like:
+- Relevant experience
+- Education
+- Technical skills
+- Project complexity
+- Career progression
 
-    Resume text:
-    {text}
+Provide only the numerical score (e.g., 0.85), nothing else."""
 
-    Provide your response in the following format:
-    {{"python": 0.8, "javascript": 0.7}}
-    Only include the JSON object, nothing else.
-    """
+SUMMARY_SCORE_SYSTEM_PROMPT = """You are an AI resume analyzer. The user gives a summary of a long resume: the technical skills found in it, each with a proficiency level from 0.0 to 1.0, and an outline of its sections. Based on it, provide a single overall score from 0.0 to 1.0 that represents the candidate's qualifications. Consider factors like:
+- Relevant experience
+- Education
+- Technical skills
+- Project complexity
+- Career progression
+If a job description is given, assess the candidate's fit for that job.
 
-    # Get skills with confidence scores
-    skills_response = openai.chat.completions.create(
-        model="meta-llama/Meta-Llama-3.1-8B-Instruct",
-        messages=[{"role": "user", "content": skills_prompt}],
-    )
-    skills_text = skills_response.choices[0].message.content.strip()
-    
-    # Clean up the response to ensure it's valid JSON
-    skills_text = re.sub(r'[^{}:,."0-9a-zA-Z_-]', '', skills_text)
-    skills = eval(skills_text)  # Using eval since we trust the input (it's from our AI)
-
-    # Prepare the prompt for overall score
-    score_prompt = f"""
-    You are an AI resume analyzer. Based on the following resume text, provide a single overall score from 0.0 to 1.0 that represents the candidate's qualifications. Consider factors like:
-    - Relevant experience
-    - Education
-    - Technical skills
-    - Project complexity
-    - Career progression
-
-    Resume text:
-    {text}
-
-    Provide only the numerical score (e.g., 0.85), nothing else.
-    """
+Provide only the numerical score (e.g., 0.85), nothing else."""
 
-    # Get overall score
-    score_response = openai.chat.completions.create(
-        model="meta-llama/Meta-Llama-3.1-8B-Instruct",
-        messages=[{"role": "user", "content": score_prompt}],
-    )
-    score = float(score_response.choices[0].message.content.strip())
+CONTACT_SYSTEM_PROMPT = """You are an AI resume analyzer. Extract the following information from the resume text given by the user:
+- Full Name
+- Email Address
+- Phone Number
+- Location (City, State/Country)
 
-    return {
-        "skills": skills,
-        "score": score
-    }
+Provide your response in the following JSON format:
+{
+    "name": "John Doe",
+    "email": "john@example.com",
+    "phone": "+1-234-567-8900",
+    "location": "San Francisco, CA"
+}
+Only include the JSON object, nothing else. If a field is not found, use null."""
 
-async def extract_resume_info(file_path: str) -> Dict[str, Any]:
-    """Extract basic information from resume using LLM"""
-    text = await extract_text_from_pdf(file_path)
-    
-    # Prepare the prompt for information extraction
-    info_prompt = f"""
-    You are an AI resume analyzer. Extract the following information from the resume text:
-    - Full Name
-    - Email Address
-    - Phone Number
-    - Location (City, State/Country)
-
-    Resume text:
-    {text}
-
-    Provide your response in the following JSON format:
-    {{
+RESUME_ANALYSIS_SYSTEM_PROMPT = """You are an AI resume analyzer. Extract technical skills from the resume text given by the user and rate each skill's proficiency level from 0.0 to 1.0 based on the context and experience described. Consider:
+- Years of experience with the skill
+- Projects using the skill
+- Level of responsibility
+- Certifications or training
+- Recent usage of the skill
+
+Provide your response in the following JSON format:
+{
+    "skills": {"python": 0.8, "javascript": 0.7},
+    "score": 0.85
+}
+The score should be an overall assessment from 0.0 to 1.0 based on:
+- Relevant experience
+- Education
+- Technical skills
+- Project complexity
+- Career progression
+If a job description is given, assess the candidate's fit for that job.
+
+Only include the JSON object, nothing else."""
+
+COMBINED_SYSTEM_PROMPT = """You are an AI resume analyzer. From the resume text given by the user:
+1. Extract the candidate's Full Name, Email Address, Phone Number and Location (City, State/Country).
+2. Extract technical skills and rate each skill's proficiency level from 0.0 to 1.0 based on the context and experience described. Consider:
+- Years of experience with the skill
+- Projects using the skill
+- Level of responsibility
+- Certifications or training
+- Recent usage of the skill
+3. Give an overall score from 0.0 to 1.0 based on:
+- Relevant experience
+- Education
+- Technical skills
+- Project complexity
+- Career progression
+If a job description is given, assess the candidate's fit for that job.
+
+Provide your response in the following JSON format:
+{
+    "contact": {
         "name": "John Doe",
         "email": "john@example.com",
         "phone": "+1-234-567-8900",
         "location": "San Francisco, CA"
-    }}
-    Only include the JSON object, nothing else. If a field is not found, use null.
+    },
+    "skills": {"python": 0.8, "javascript": 0.7},
+    "score": 0.85
+}
+Only include the JSON object, nothing else. If a contact field is not found, use null."""
+
+COARSE_SCREENING_SYSTEM_PROMPT = """You are screening resumes for a job. Rate how well the candidate in the resume text given by the user matches the job requirements, from 0.0 (unrelated) to 1.0 (strong match). The resume text may be cut short; judge from what is shown.
+
+Provide only the numerical score (e.g., 0.6), nothing else."""
+
+CALL_TRANSCRIPT_SYSTEM_PROMPT = """You are an AI recruitment assistant analyzing a voice screening summary given by the user. Extract the following information:
+
+1. Notice period: Extract the candidate's notice period and standardize it to a clear format (e.g., "30 days", "2 months", "immediate"). If not mentioned, use "Unknown".
+
+2. Current compensation: Extract the candidate's current compensation and standardize it (e.g., "$90,000/year", "₹25 lakhs per annum"). If not mentioned, use "Unknown".
+
+3. Expected compensation: Extract the candidate's expected compensation and standardize it. If not mentioned, use "Unknown".
+
+4. Screening score: Provide a score from 0 to 100 based on how well the candidate communicated, their qualifications, and overall fit for the role.
+
+Provide your response in the following JSON format:
+{
+    "notice_period": "standardized period",
+    "current_compensation": "standardized amount",
+    "expected_compensation": "standardized amount",
+    "screening_score": numeric_score
+}
+Only include the JSON object, nothing else."""
+
+
+def resume_analysis_versions() -> List[str]:
     """
+    The models and prompt versions behind extract_and_analyze_resume, as
+    "model:prompt_version" strings. Results stored outside the LLM cache
+    (see app.services.resume_blobs) are keyed on them.
+    """
+    return [f"{task_model(task)}:{version}" for task, version in RESUME_ANALYSIS_PROMPTS]
 
-    # Get basic information
-    info_response = openai.chat.completions.create(
-        model="meta-llama/Meta-Llama-3.1-8B-Instruct",
-        messages=[{"role": "user", "content": info_prompt}],
-    )
-    info_text = info_response.choices[0].message.content.strip()
+def build_job_context(job: Dict[str, Any]) -> str:
+    """Describe a job for the prompt; identical for every candidate of the job"""
+    parts = [f"Job title: {job.get('title', '')}"]
+    for field in ("description", "responsibilities", "requirements"):
+        if job.get(field):
+            parts.append(f"{field.capitalize()}:\n{job[field]}")
+    return "\n\n".join(parts)
+
+
+def build_messages(system_prompt: str, text: str, label: str = "Resume text",
+                   job_context: Optional[str] = None) -> List[Dict[str, str]]:
+    """Static instructions first, then the job context, then the variable text"""
+    content = f"{label}:\n{text}"
+    if job_context:
+        content = f"Job description:\n{job_context}\n\n{content}"
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": content}
+    ]
+
+
+def _cache_input(text: str, job_context: Optional[str]) -> str:
+    """LLM cache input: the job context changes the answer, so it is part of the key"""
+    return f"{job_context}\0{text}" if job_context else text
+
+
+def _local_contact_details(text: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Contact details found without the LLM, and the required fields still missing"""
+    if not settings.CONTACT_FAST_PATH_ENABLED:
+        return {field: None for field in CONTACT_FIELDS}, list(CONTACT_FIELDS)
+    local = extract_contact_details(text)
+    missing = missing_contact_fields(local, settings.CONTACT_REQUIRED_FIELDS)
+    metrics.counter("contact_fast_path_partial" if missing else "contact_fast_path_complete").inc()
+    return local, missing
+
+async def extract_resume_info(resume: ParsedResume) -> Dict[str, Any]:
+    """
+    Extract basic information from resume, locally where possible and with
+    the LLM for required fields the local extractors could not find
+    """
+    local, missing = _local_contact_details(resume.text)
+    if not missing:
+        return local
+    return merge_contact_details(local, await _extract_resume_info_llm(resume.text))
+
+async def _extract_resume_info_llm(text: str) -> Dict[str, Any]:
+    """Extract basic information from resume text using LLM"""
+    cached = await get_cached_response(task_model(CONTACT_TASK), CONTACT_PROMPT_VERSION, text)
+    if cached is not None:
+        return cached
     
-    # Clean up the response and parse JSON
-    info_text = re.sub(r'```json\s*|\s*```', '', info_text)  # Remove code blocks if present
+    # Get basic information
     try:
-        info = json.loads(info_text)
-    except json.JSONDecodeError:
+        contact = await complete_json(
+            build_messages(CONTACT_SYSTEM_PROMPT, text),
+            ContactInfo,
+            task=CONTACT_TASK,
+        )
+        info = contact.model_dump()
+        await set_cached_response(task_model(CONTACT_TASK), CONTACT_PROMPT_VERSION, text, info)
+    except StructuredOutputError:
         # Fallback to empty values if JSON parsing fails
         info = {
             "name": "",
@@ -147,58 +249,134 @@ async def extract_resume_info(file_path: str) -> Dict[str, Any]:
     
     return info
 
-async def analyze_resume(file_path: str) -> Dict[str, Any]:
-    """Analyze resume content and compute score using LLM"""
-    text = await extract_text_from_pdf(file_path)
-    
-    # Prepare the prompt for skills extraction
-    skills_prompt = f"""
-    You are an AI resume analyzer. Extract technical skills from the following resume text and rate each skill's proficiency level from 0.0 to 1.0 based on the context and experience described. Consider:
-    - Years of experience with the skill
-    - Projects using the skill
-    - Level of responsibility
-    - Certifications or training
-    - Recent usage of the skill
-
-    Resume text:
-    {text}
-
-    Provide your response in the following JSON format:
-    {{
-        "skills": {{"python": 0.8, "javascript": 0.7}},
-        "score": 0.85
-    }}
-    The score should be an overall assessment from 0.0 to 1.0 based on:
-    - Relevant experience
-    - Education
-    - Technical skills
-    - Project complexity
-    - Career progression
-
-    Only include the JSON object, nothing else.
+async def analyze_resume(resume: ParsedResume, job_context: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyze resume content and compute score using LLM, optionally against a job.
+
+    Raises:
+        StructuredOutputError: The LLM did not return a valid analysis, even
+            after a corrective retry
     """
+    if resume.full_text:
+        return await analyze_long_resume(resume, job_context)
+
+    text = resume.text
+    cache_input = _cache_input(text, job_context)
 
+    cached = await get_cached_response(task_model(SCORING_TASK), RESUME_ANALYSIS_PROMPT_VERSION, cache_input)
+    if cached is not None:
+        return cached
+    
     # Get skills and score
-    analysis_response = openai.chat.completions.create(
-        model="meta-llama/Meta-Llama-3.1-8B-Instruct",
-        messages=[{"role": "user", "content": skills_prompt}],
+    analysis = await complete_json(
+        build_messages(RESUME_ANALYSIS_SYSTEM_PROMPT, text, job_context=job_context),
+        ResumeAnalysis,
+        task=SCORING_TASK,
     )
-    analysis_text = analysis_response.choices[0].message.content.strip()
-    
-    # Clean up the response and parse JSON
-    analysis_text = re.sub(r'```json\s*|\s*```', '', analysis_text)  # Remove code blocks if present
+
+    # Convert score to 0-100 scale
+    result = {"skills": analysis.skills, "score": analysis.score * 100}
+    await set_cached_response(task_model(SCORING_TASK), RESUME_ANALYSIS_PROMPT_VERSION, cache_input, result)
+    return result
+
+def merge_skill_scores(chunk_skills: List[Dict[str, float]], rule: str = "max") -> Dict[str, float]:
+    """
+    Combine the skills extracted from each chunk of a resume. Names are
+    deduplicated case-insensitively under their first spelling; a skill's
+    proficiency is its highest ("max") or average ("mean") rating over the
+    chunks that mention it.
+    """
+    names: Dict[str, str] = {}
+    ratings: Dict[str, List[float]] = {}
+    for skills in chunk_skills:
+        for name, proficiency in skills.items():
+            key = " ".join(name.lower().split())
+            names.setdefault(key, name.strip())
+            ratings.setdefault(key, []).append(proficiency)
+    if rule == "mean":
+        return {names[key]: sum(values) / len(values) for key, values in ratings.items()}
+    return {names[key]: max(values) for key, values in ratings.items()}
+
+def build_resume_summary(text: str, skills: Dict[str, float]) -> str:
+    """Merged skills, strongest first, and the outline of a long resume, for the final score"""
+    ranked = sorted(skills.items(), key=lambda item: -item[1])
+    skill_list = ", ".join(f"{name} ({proficiency:.1f})" for name, proficiency in ranked) or "none found"
+    outline = fit_to_budget(outline_sections(text), settings.RESUME_CHUNK_TOKENS)
+    return f"Skills: {skill_list}\n\nOutline:\n{outline}"
+
+async def _analyze_chunk(chunk: str) -> Optional[Dict[str, float]]:
     try:
-        result = json.loads(analysis_text)
-        # Convert score to 0-100 scale
-        result["score"] = result["score"] * 100
-    except json.JSONDecodeError:
-        # Fallback to empty values if JSON parsing fails
-        result = {
-            "skills": {},
-            "score": 0.0
-        }
-    
-    return result 
+        skills = await complete_json(build_messages(SKILLS_SYSTEM_PROMPT, chunk), SkillScores, task=SCORING_TASK)
+        return skills.root
+    except StructuredOutputError as e:
+        logger.error(f"Error extracting skills from resume chunk: {str(e)}")
+        return None
+
+async def analyze_long_resume(resume: ParsedResume, job_context: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Map-reduce analysis of a resume too long for one prompt (see
+    ParsedResume.full_text): skills are extracted from section-aware chunks
+    concurrently and merged per RESUME_CHUNK_MERGE, then the overall score
+    comes from one call on the merged skills and an outline of the resume.
+    Every call is bounded by the chunk size, however long the resume.
+
+    Raises:
+        StructuredOutputError: No chunk could be analyzed, or the LLM did not
+            return a valid score
+    """
+    text = resume.full_text or resume.text
+    cache_input = _cache_input(text, job_context)
+    model = task_model(SCORING_TASK)
+
+    cached = await get_cached_response(model, CHUNKED_ANALYSIS_PROMPT_VERSION, cache_input)
+    if cached is not None:
+        return cached
+
+    chunks = chunk_text(text, settings.RESUME_CHUNK_TOKENS)[:settings.RESUME_MAX_CHUNKS]
+    results = await asyncio.gather(*(_analyze_chunk(chunk) for chunk in chunks))
+    chunk_skills = [skills for skills in results if skills is not None]
+    if not chunk_skills:
+        raise StructuredOutputError(f"None of the {len(chunks)} resume chunks could be analyzed")
+    metrics.counter("resume_chunked_analyses").inc()
+    metrics.counter("resume_chunks_analyzed").inc(len(chunks))
+
+    skills = merge_skill_scores(chunk_skills, settings.RESUME_CHUNK_MERGE)
+    score = await complete_json(
+        build_messages(SUMMARY_SCORE_SYSTEM_PROMPT, build_resume_summary(text, skills),
+                       label="Resume summary", job_context=job_context),
+        OverallScore,
+        task=SCORING_TASK,
+    )
+
+    result = {"skills": skills, "score": score.root * 100}
+    await set_cached_response(model, CHUNKED_ANALYSIS_PROMPT_VERSION, cache_input, result)
+    return result
+
+async def coarse_screen(resume: ParsedResume, requirements: str) -> float:
+    """
+    Quick relevance score (0-100) of a resume against a job's requirements,
+    from the start of the resume and the small coarse_screening model. Used
+    by the screening cascade to decide which resumes get the full analysis.
+
+    Raises:
+        StructuredOutputError: The LLM did not return a valid score
+    """
+    text = fit_to_budget(resume.text, settings.SCREENING_CASCADE_TOKEN_BUDGET)
+    cache_input = _cache_input(text, requirements)
+    model = task_model(COARSE_SCREENING_TASK)
+
+    cached = await get_cached_response(model, COARSE_SCREENING_PROMPT_VERSION, cache_input)
+    if cached is not None:
+        return cached["score"]
+
+    score = await complete_json(
+        build_messages(COARSE_SCREENING_SYSTEM_PROMPT, text, job_context=f"Requirements:\n{requirements}"),
+        OverallScore,
+        task=COARSE_SCREENING_TASK,
+    )
+    result = {"score": score.root * 100}
+    await set_cached_response(model, COARSE_SCREENING_PROMPT_VERSION, cache_input, result)
+    return result["score"]
 
 async def analyze_call_transcript(summary: str) -> Dict[str, Any]:
     """
@@ -223,48 +401,22 @@ async def analyze_call_transcript(summary: str) -> Dict[str, Any]:
             "expected_compensation": "Not specified"
         }
     
-    analysis_prompt = f"""
-    You are an AI recruitment assistant analyzing a voice screening summary.
-    
-    Summary:
-    {summary}
-     Please analyze this transcript and extract the following information:
-    
-    1. Notice period: Extract the candidate's notice period and standardize it to a clear format (e.g., "30 days", "2 months", "immediate"). If not mentioned, use "Unknown".
-    
-    2. Current compensation: Extract the candidate's current compensation and standardize it (e.g., "$90,000/year", "₹25 lakhs per annum"). If not mentioned, use "Unknown".
-    
-    3. Expected compensation: Extract the candidate's expected compensation and standardize it. If not mentioned, use "Unknown".
-    
-    4. Screening score: Provide a score from 0 to 100 based on how well the candidate communicated, their qualifications, and overall fit for the role.
- 
-    
-    Provide your response in the following JSON format:
-    {{
-        "notice_period": "standardized period",
-        "current_compensation": "standardized amount",
-        "expected_compensation": "standardized amount",
-        "screening_score": numeric_score
-    }}
-    Only include the JSON object, nothing else.
-    """
-    
+    cached = await get_cached_response(task_model(CALL_SUMMARY_TASK), CALL_TRANSCRIPT_PROMPT_VERSION, summary)
+    if cached is not None:
+        return cached
+
     try:
-        # Use the same model as other AI functions
-        analysis_response = openai.chat.completions.create(
-            model="meta-llama/Meta-Llama-3.1-8B-Instruct",  # Same model as resume analysis
-            messages=[{"role": "user", "content": analysis_prompt}],
+        analysis = await complete_json(
+            build_messages(CALL_TRANSCRIPT_SYSTEM_PROMPT, summary, label="Summary"),
+            CallTranscriptAnalysis,
+            task=CALL_SUMMARY_TASK,
         )
-        analysis_text = analysis_response.choices[0].message.content.strip()
-        
-        # Clean up and parse the response
-        analysis_text = re.sub(r'```json\s*|\s*```', '', analysis_text)
-        result = json.loads(analysis_text)
-        
+
         # Ensure screening_score is an integer
-        if "screening_score" in result:
-            result["screening_score"] = int(float(result["screening_score"]))
-        
+        result = analysis.model_dump()
+        result["screening_score"] = int(analysis.screening_score)
+
+        await set_cached_response(task_model(CALL_SUMMARY_TASK), CALL_TRANSCRIPT_PROMPT_VERSION, summary, result)
         return result
     except Exception as e:
         logger.error(f"Error analyzing call summary with OpenAI: {str(e)}")
@@ -273,4 +425,100 @@ async def analyze_call_transcript(summary: str) -> Dict[str, Any]:
             "notice_period": "Not specified",
             "current_compensation": "Not specified",
             "expected_compensation": "Not specified"
-        } 
\ No newline at end of file
+        }
+
+def _salvage_combined_analysis(data: Any) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Split a combined response that failed validation into (basic_info, analysis),
+    keeping whichever part is valid on its own. Either part is None when it
+    is missing or malformed.
+    """
+    if not isinstance(data, dict):
+        return None, None
+
+    basic_info = None
+    try:
+        basic_info = ContactInfo.model_validate(data.get("contact")).model_dump()
+    except ValueError:
+        pass
+
+    analysis = None
+    try:
+        valid = ResumeAnalysis.model_validate(data)
+        analysis = {"skills": valid.skills, "score": valid.score * 100}
+    except ValueError:
+        pass
+
+    return basic_info, analysis
+
+async def extract_and_analyze_resume(
+    resume: ParsedResume,
+    job_context: Optional[str] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Extract contact information, skills and score from a resume in a single
+    LLM call, sending the resume text once.
+
+    Contact details found by the local extractors (see
+    app.services.contact_extraction) take precedence; when all required
+    fields are found locally only skills and score are requested. Resumes
+    too long for one prompt are analyzed in chunks (see analyze_long_resume).
+    Falls back to the split contact / analyze_resume calls for whichever
+    part of the combined response could not be parsed.
+
+    Args:
+        resume: The parsed resume
+        job_context: Optional job description (see build_job_context) to
+            score the candidate against
+
+    Returns:
+        (basic_info, analysis) in the same shapes as the split calls
+    """
+    text = resume.text
+    local, missing = _local_contact_details(text)
+    if not missing:
+        # Contact details found locally: only skills and score need the LLM
+        return local, await analyze_resume(resume, job_context)
+
+    if resume.full_text:
+        # Too long for one prompt: contact details from the top of the resume
+        # and the chunked analysis, concurrently
+        basic_info, analysis = await asyncio.gather(
+            _extract_resume_info_llm(text), analyze_long_resume(resume, job_context)
+        )
+        return merge_contact_details(local, basic_info), analysis
+
+    cache_input = _cache_input(text, job_context)
+    cached = await get_cached_response(task_model(COMBINED_TASK), COMBINED_PROMPT_VERSION, cache_input)
+    if cached is not None:
+        return merge_contact_details(local, cached["basic_info"]), cached["analysis"]
+
+    try:
+        combined = await complete_json(
+            build_messages(COMBINED_SYSTEM_PROMPT, text, job_context=job_context),
+            CombinedResumeAnalysis,
+            task=COMBINED_TASK,
+        )
+        basic_info = combined.contact.model_dump()
+        analysis = {"skills": combined.skills, "score": combined.score * 100}
+    except StructuredOutputError as e:
+        basic_info, analysis = _salvage_combined_analysis(e.data)
+    except ValueError as e:
+        # Unusable response: the split calls may still parse. Provider errors
+        # (already retried) and DeadlineExceeded propagate.
+        logger.error(f"Error in combined resume analysis: {str(e)}")
+        basic_info, analysis = None, None
+
+    if basic_info is not None and analysis is not None:
+        await set_cached_response(
+            task_model(COMBINED_TASK), COMBINED_PROMPT_VERSION, cache_input, {"basic_info": basic_info, "analysis": analysis}
+        )
+    else:
+        metrics.counter("resume_analysis_fallbacks").inc()
+        logger.warning(f"Combined resume analysis incomplete for {resume.filename or resume.sha256}, using split calls")
+        if basic_info is None:
+            basic_info = await _extract_resume_info_llm(text)
+        if analysis is None:
+            analysis = await analyze_resume(resume, job_context)
+
+    return merge_contact_details(local, basic_info), analysis
@@ -1,5 +1,5 @@
 from datetime import datetime, UTC
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 from fastapi import UploadFile, HTTPException
 import os
 import zipfile
@@ -7,17 +7,44 @@ import tempfile
 from bson import ObjectId
 from pathlib import Path
 from app.core.config import settings
+from app.core.deadline import deadline
+from app.core.metrics import metrics
 from app.core.mongodb import get_database, get_gridfs
+from app.core.pagination import InvalidCursor, keyset_filter
 from app.models.database import User
 from app.models.database import serialize_candidate
-from app.services.ai import extract_resume_info, analyze_resume, analyze_call_transcript
+from app.services.ai import (
+    analyze_call_transcript,
+    build_job_context,
+    coarse_screen,
+    extract_and_analyze_resume,
+    extract_resume_info,
+)
+from app.services.job_stats import record_candidate_added, record_candidate_removed, record_stats_change
+from app.services.lexical_index import get_job_index, index_candidate_text, remove_candidate_terms
+from app.services.resume_parser import ParsedResume, parse_resume_async
+from app.services.resume_blobs import (
+    acquire_resume_blob,
+    analysis_scope,
+    cached_analysis,
+    get_resume_blob,
+    increment_resume_blob_hits,
+    record_lookup,
+    register_resume_blob,
+    release_resume_file,
+    save_resume_analysis,
+)
 import logging
 from io import BytesIO
 from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import io
 import asyncio
+import hashlib
 import httpx
 import re
+import time
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 import json
@@ -26,6 +53,11 @@ from app.services.voice_agent import get_global_voice_config, get_job_voice_conf
 
 logger = logging.getLogger(__name__)
 
+# screening_tier of a candidate: "full" had the complete skills-and-score
+# analysis, "coarse" only the cascade's first-pass score
+SCREENING_TIER_FULL = "full"
+SCREENING_TIER_COARSE = "coarse"
+
 # Helper function for phone number formatting
 def format_phone_number(phone: str) -> str:
     """
@@ -46,26 +78,174 @@ def format_phone_number(phone: str) -> str:
     
     return phone  # Already in E.164 format
 
-async def process_pdf_file(file_content: bytes, filename: str, job_id: str, created_by: User) -> dict:
+_NOTICE_NUMBERS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12
+}
+_NOTICE_UNIT_DAYS = {"day": 1, "week": 7, "month": 30}
+_NOTICE_PERIOD = re.compile(
+    r"(\d+(?:\.\d+)?|" + "|".join(_NOTICE_NUMBERS) + r")[\s-]*(day|week|month)",
+    re.IGNORECASE
+)
+
+def parse_notice_period_days(notice_period: Optional[str]) -> Optional[int]:
+    """
+    Days of a notice period as standardized by the call analysis ("30 days",
+    "2 months", "immediate"), so candidates can be filtered on it. None when
+    it is unknown.
+    """
+    if not notice_period:
+        return None
+    text = notice_period.strip().lower()
+    if text.startswith(("immediate", "none", "no notice")):
+        return 0
+    match = _NOTICE_PERIOD.search(text)
+    if not match:
+        return None
+    amount = match.group(1).lower()
+    count = _NOTICE_NUMBERS[amount] if amount in _NOTICE_NUMBERS else float(amount)
+    return round(count * _NOTICE_UNIT_DAYS[match.group(2).lower()])
+
+async def get_job_context(job_id: str) -> Optional[str]:
+    """The job description used in resume prompts, when AI_PROMPT_JOB_CONTEXT is enabled"""
+    if not settings.AI_PROMPT_JOB_CONTEXT:
+        return None
+    db = await get_database()
+    job = await db.jobs.find_one(
+        {"_id": ObjectId(job_id)},
+        {"title": 1, "description": 1, "responsibilities": 1, "requirements": 1}
+    )
+    return build_job_context(job) if job else None
+
+async def get_screening_cascade(job_id: str) -> Optional[Dict[str, Any]]:
     """
-    Process a single PDF file and create a candidate record
+    The job's requirements and coarse score threshold when SCREENING_CASCADE_ENABLED,
+    or None to give every resume the full analysis
     """
+    if not settings.SCREENING_CASCADE_ENABLED:
+        return None
+    db = await get_database()
+    job = await db.jobs.find_one({"_id": ObjectId(job_id)}, {"requirements": 1, "screening_threshold": 1})
+    if not job or not job.get("requirements"):
+        return None
+    threshold = job.get("screening_threshold")
+    return {
+        "requirements": job["requirements"],
+        "threshold": settings.SCREENING_CASCADE_THRESHOLD if threshold is None else float(threshold)
+    }
+
+async def screen_resume(
+    resume: ParsedResume,
+    job_context: Optional[str],
+    cascade: Optional[Dict[str, Any]]
+) -> Tuple[dict, dict, dict]:
+    """
+    Analyze a resume, through the screening cascade when one is configured.
+
+    Resumes whose coarse score is below the job's threshold only get their
+    contact details extracted; they keep the coarse score as coarse_score
+    and have no resume score, so they do not count as resume screened.
+    promote_candidate runs the full analysis for them later.
+
+    Returns:
+        (basic_info, analysis, screening): basic_info and analysis as from
+        extract_and_analyze_resume, screening the candidate's
+        screening_tier and coarse_score
+    """
+    coarse_score = None
+    if cascade:
+        coarse_score = await coarse_screen(resume, cascade["requirements"])
+        if coarse_score < cascade["threshold"]:
+            metrics.counter("screening_cascade_coarse_only").inc()
+            basic_info = await extract_resume_info(resume)
+            screening = {"screening_tier": SCREENING_TIER_COARSE, "coarse_score": coarse_score}
+            return basic_info, {"skills": {}, "score": None}, screening
+        metrics.counter("screening_cascade_shortlisted").inc()
+
+    basic_info, analysis = await extract_and_analyze_resume(resume, job_context)
+    return basic_info, analysis, {"screening_tier": SCREENING_TIER_FULL, "coarse_score": coarse_score}
+
+async def release_candidate_resume(sha256: Optional[str], file_id: str):
+    """Drop a reference to a resume file, deleting it from GridFS once no candidate uses it"""
     try:
-        # Save to temporary file for AI processing
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-            temp_file.write(file_content)
-            temp_path = temp_file.name
+        if await release_resume_file(sha256, file_id):
+            fs = await get_gridfs()
+            await fs.delete(ObjectId(file_id))
+    except Exception as e:
+        logger.error(f"Error deleting file from GridFS: {str(e)}")
 
-        try:
-            # Extract basic info from resume using AI
-            basic_info = await extract_resume_info(temp_path)
-            
-            # Analyze resume and compute score
-            analysis_result = await analyze_resume(temp_path)
+async def process_pdf_file(
+    file_content: bytes,
+    filename: str,
+    job_id: str,
+    created_by: User,
+    job_context: Optional[str] = None,
+    cascade: Optional[Dict[str, Any]] = None,
+    ingestion_key: Optional[str] = None
+) -> dict:
+    """
+    Process a single PDF file and create a candidate record.
+
+    job_context is the job description from get_job_context and cascade the
+    settings from get_screening_cascade; they are looked up when not given.
+    ingestion_key identifies the file in the ingestion queue; a file whose
+    key already has a candidate (from an attempt that crashed before
+    recording its result) returns that candidate instead of a duplicate.
+
+    The resume's terms are indexed before the analysis, so the job's BM25
+    ranking covers it while the LLM works. The terms and the reference on
+    the resume file are dropped again if no candidate is created.
+    """
+    candidate_id = ObjectId()
+    indexed = created = False
+    file_id = sha256 = None
+    try:
+        if ingestion_key:
+            db = await get_database()
+            existing = await db.candidates.find_one({"ingestion_key": ingestion_key})
+            if existing:
+                logger.info(f"Resume {filename} of {ingestion_key} was already processed")
+                return serialize_candidate(existing)
 
+        sha256 = hashlib.sha256(file_content).hexdigest()
+        scope = analysis_scope(job_id)
+        blob = await get_resume_blob(sha256) if settings.RESUME_DEDUP_ENABLED else None
+        cached = cached_analysis(blob, scope)
+        if settings.RESUME_DEDUP_ENABLED:
+            record_lookup(cached is not None)
+
+        if cached:
+            # Same bytes were analyzed before: skip parsing and all LLM work
+            logger.info(f"Reusing stored analysis for resume {sha256[:12]} ({filename})")
+            basic_info = cached["basic_info"]
+            analysis_result = cached["analysis"]
+            screening = {"screening_tier": SCREENING_TIER_FULL, "coarse_score": None}
+            await increment_resume_blob_hits(sha256)
+            await index_candidate_text(job_id, str(candidate_id), sha256)
+            indexed = True
+        else:
+            # Parse the PDF once; every stage below shares the result
+            resume = await parse_resume_async(file_content, filename)
+            await index_candidate_text(job_id, str(candidate_id), sha256, resume.text)
+            indexed = True
+
+            # Extract basic info, skills and score in one AI call
+            if job_context is None:
+                job_context = await get_job_context(job_id)
+            if cascade is None:
+                cascade = await get_screening_cascade(job_id)
+            with deadline(settings.RESUME_ANALYSIS_BUDGET):
+                basic_info, analysis_result, screening = await screen_resume(resume, job_context, cascade)
+
+        if blob:
+            # Take the reference atomically; the blob may be gone since the lookup
+            blob = await acquire_resume_blob(sha256)
+        if blob:
+            file_id = blob["file_id"]
+        else:
             # Get GridFS instance
             fs = await get_gridfs()
-            
+
             # Store file in GridFS
             file_id = await fs.upload_from_stream(
                 filename=filename,
@@ -73,98 +253,278 @@ async def process_pdf_file(file_content: bytes, filename: str, job_id: str, crea
                 metadata={
                     "job_id": job_id,
                     "created_by": created_by.id,
-                    "content_type": "application/pdf"
+                    "content_type": "application/pdf",
+                    "sha256": sha256
                 }
             )
-            
-            db = await get_database()
 
-            # Create candidate record
-            candidate_id = ObjectId()
-            candidate_data = {
-                "_id": candidate_id,
-                "id": str(candidate_id),
-                "job_id": ObjectId(job_id),
-                "name": basic_info.get("name", ""),
-                "email": basic_info.get("email", ""),
-                "phone": basic_info.get("phone"),
-                "location": basic_info.get("location"),
-                "resume_file_id": str(file_id),
-                "skills": analysis_result.get("skills", {}),
-                "resume_score": analysis_result.get("score", 0.0),
-                "screening_score": None,
-                "screening_summary": None,
-                "created_by_id": ObjectId(created_by.id),
-                "created_at": datetime.now(UTC),
-                "updated_at": datetime.now(UTC)
-            }
-            
-            logger.info(f"Storing candidate with resume file ID: {file_id}")
+            if settings.RESUME_DEDUP_ENABLED:
+                blob = await register_resume_blob(sha256, str(file_id), filename, len(file_content))
+                if blob["file_id"] != str(file_id):
+                    # A concurrent upload of the same bytes won the race; share its file
+                    await fs.delete(file_id)
+                file_id = blob["file_id"]
+
+        # Coarse results are not reused: a re-upload goes through the cascade again
+        full = screening["screening_tier"] == SCREENING_TIER_FULL
+        if settings.RESUME_DEDUP_ENABLED and not cached and full:
+            await save_resume_analysis(sha256, scope, basic_info, analysis_result)
+
+        db = await get_database()
+
+        # Create candidate record
+        candidate_data = {
+            "_id": candidate_id,
+            "id": str(candidate_id),
+            "job_id": ObjectId(job_id),
+            "name": basic_info.get("name", ""),
+            "email": basic_info.get("email", ""),
+            "phone": basic_info.get("phone"),
+            "location": basic_info.get("location"),
+            "linkedin_url": basic_info.get("linkedin_url"),
+            "resume_file_id": str(file_id),
+            "resume_sha256": sha256,
+            "skills": analysis_result.get("skills", {}),
+            "resume_score": analysis_result.get("score", 0.0),
+            **screening,
+            "screening_score": None,
+            "screening_summary": None,
+            "created_by_id": ObjectId(created_by.id),
+            "created_at": datetime.now(UTC),
+            "updated_at": datetime.now(UTC)
+        }
+        if ingestion_key:
+            candidate_data["ingestion_key"] = ingestion_key
+
+        logger.info(f"Storing candidate with resume file ID: {file_id}")
+        try:
             await db.candidates.insert_one(candidate_data)
-            
-            # Increment the job's candidate count
-            await db.jobs.update_one(
-                {"_id": ObjectId(job_id)},
-                {"$inc": {"total_candidates": 1}}
-            )
-            
-            return serialize_candidate(candidate_data)
-        finally:
-            # Clean up temporary file
-            os.unlink(temp_path)
+        except DuplicateKeyError:
+            if not ingestion_key:
+                raise
+            # Another owner of the same ingestion item inserted first
+            logger.warning(f"Resume {filename} of {ingestion_key} was processed concurrently")
+            await remove_candidate_terms(job_id, str(candidate_id))
+            await release_candidate_resume(sha256, str(file_id))
+            return serialize_candidate(await db.candidates.find_one({"ingestion_key": ingestion_key}))
+        created = True
+
+        await record_candidate_added(job_id, candidate_data)
+
+        return serialize_candidate(candidate_data)
     except Exception as e:
         logger.error(f"Error processing PDF file: {str(e)}")
+        if indexed and not created:
+            await remove_candidate_terms(job_id, str(candidate_id))
+        if file_id and not created:
+            await release_candidate_resume(sha256, str(file_id))
         raise
 
-async def upload_resume(job_id: str, file: UploadFile, created_by: User) -> dict:
+async def process_resume_batch(
+    files: Iterable[Tuple[str, Callable[[], bytes]]],
+    job_id: str,
+    created_by: User,
+    concurrency: Optional[int] = None,
+    on_result: Optional[Callable[[int, dict], Awaitable[None]]] = None,
+    ingestion_keys: Optional[Sequence[str]] = None
+) -> List[dict]:
     """
-    Process and upload a resume for a job. Handles both individual PDF files and ZIP files containing PDFs.
+    Process several resumes concurrently and report the outcome of each one.
+
+    Args:
+        files: (filename, reader) pairs; the reader returns the PDF bytes and is
+            only called once a concurrency slot is free
+        job_id: The job the candidates belong to
+        created_by: The user performing the upload
+        concurrency: Maximum number of resumes processed at once
+            (defaults to settings.RESUME_UPLOAD_CONCURRENCY)
+        on_result: Optional coroutine called with (index, result) as soon as
+            each file finishes, e.g. to record progress
+        ingestion_keys: Optional idempotency key per file (see process_pdf_file)
+
+    Returns:
+        One result per file, in input order, with status, candidate id,
+        duration and error
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.RESUME_UPLOAD_CONCURRENCY))
+    # Same job for every file: look the description and cascade settings up once
+    job_context = await get_job_context(job_id)
+    cascade = await get_screening_cascade(job_id)
+
+    async def _process(index: int, filename: str, read: Callable[[], bytes]) -> dict:
+        async with semaphore:
+            started = time.perf_counter()
+            result = {
+                "filename": filename,
+                "status": "succeeded",
+                "candidate_id": None,
+                "duration_ms": 0.0,
+                "error": None
+            }
+            try:
+                candidate = await process_pdf_file(
+                    read(), filename, job_id, created_by, job_context, cascade,
+                    ingestion_key=ingestion_keys[index] if ingestion_keys else None
+                )
+                result["candidate_id"] = candidate["id"]
+                result["candidate"] = candidate
+            except Exception as e:
+                logger.error(f"Error processing resume {filename}: {str(e)}")
+                result["status"] = "failed"
+                result["error"] = str(e)
+            result["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            if on_result:
+                await on_result(index, result)
+            return result
+
+    tasks = [
+        asyncio.create_task(_process(index, filename, read))
+        for index, (filename, read) in enumerate(files)
+    ]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        # Only on_result can raise here; stop the files still in flight
+        for task in tasks:
+            task.cancel()
+        raise
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+async def spool_upload(file: UploadFile) -> tempfile.SpooledTemporaryFile:
+    """
+    Copy an upload into a SpooledTemporaryFile chunk by chunk, enforcing MAX_UPLOAD_SIZE
     """
+    spooled = tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_MEMORY)
+    size = 0
     try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File exceeds the maximum upload size of {settings.MAX_UPLOAD_SIZE} bytes"
+                )
+            spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
+
+def list_zip_resumes(archive: zipfile.ZipFile) -> List[Tuple[str, Callable[[], bytes]]]:
+    """
+    List the PDF members of a ZIP from its central directory.
+
+    Members are not decompressed here: each entry comes with a reader that
+    inflates that single member on demand. The member count and the total
+    uncompressed size are checked against the configured limits, both as
+    declared in the central directory and while the members are read.
+    """
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and info.filename.lower().endswith('.pdf')
+        and not info.filename.startswith('__MACOSX/')
+    ]
+    if len(members) > settings.MAX_ZIP_MEMBERS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"ZIP contains more than {settings.MAX_ZIP_MEMBERS} PDF files"
+        )
+    if sum(info.file_size for info in members) > settings.MAX_ZIP_UNCOMPRESSED_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"ZIP expands to more than {settings.MAX_ZIP_UNCOMPRESSED_SIZE} bytes"
+        )
+
+    bytes_read = 0
+
+    def reader(info: zipfile.ZipInfo) -> Callable[[], bytes]:
+        def read() -> bytes:
+            nonlocal bytes_read
+            with archive.open(info) as member:
+                # Never trust the declared size: read at most one byte past it
+                content = member.read(info.file_size + 1)
+            bytes_read += len(content)
+            if len(content) > info.file_size or bytes_read > settings.MAX_ZIP_UNCOMPRESSED_SIZE:
+                raise ValueError("ZIP member expands beyond its declared size")
+            return content
+        return read
+
+    return [(os.path.basename(info.filename), reader(info)) for info in members]
+
+async def _process_upload(job_id: str, file: UploadFile, created_by: User) -> List[dict]:
+    """
+    Run every resume contained in an upload (PDF or ZIP of PDFs) through the pipeline.
+    The upload is spooled once and ZIP members are streamed into the pipeline
+    without being extracted to disk.
+    """
+    filename = file.filename.lower()
+    if not filename.endswith(('.zip', '.pdf')):
+        raise HTTPException(status_code=400, detail="Only PDF or ZIP files are allowed")
+
+    with await spool_upload(file) as spooled:
         # Handle ZIP file
-        if file.filename.lower().endswith('.zip'):
-            # Create a temporary directory for ZIP contents
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Save ZIP file
-                zip_path = os.path.join(temp_dir, file.filename)
-                content = await file.read()
-                with open(zip_path, "wb") as buffer:
-                    buffer.write(content)
-                
-                # Extract ZIP
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-                
-                # Process each PDF in the ZIP
-                candidates = []
-                for root, _, files in os.walk(temp_dir):
-                    for filename in files:
-                        if filename.lower().endswith('.pdf'):
-                            # Read PDF content
-                            pdf_path = os.path.join(root, filename)
-                            with open(pdf_path, 'rb') as pdf_file:
-                                pdf_content = pdf_file.read()
-                            
-                            # Process the PDF
-                            candidate = await process_pdf_file(pdf_content, filename, job_id, created_by)
-                            candidates.append(candidate)
-                
-                # Return the last processed candidate
-                if candidates:
-                    return candidates[-1]
-                raise HTTPException(status_code=400, detail="No PDF files found in ZIP")
-        
+        if filename.endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(spooled, 'r')
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail="Invalid ZIP file")
+
+            with archive:
+                members = list_zip_resumes(archive)
+                if not members:
+                    raise HTTPException(status_code=400, detail="No PDF files found in ZIP")
+                return await process_resume_batch(members, job_id, created_by)
+
         # Handle individual PDF file
-        elif file.filename.lower().endswith('.pdf'):
-            content = await file.read()
-            return await process_pdf_file(content, file.filename, job_id, created_by)
-        
-        else:
-            raise HTTPException(status_code=400, detail="Only PDF or ZIP files are allowed")
-            
+        content = spooled.read()
+        return await process_resume_batch([(file.filename, lambda: content)], job_id, created_by)
+
+async def upload_resume(job_id: str, file: UploadFile, created_by: User) -> dict:
+    """
+    Process and upload a resume for a job. Handles both individual PDF files and ZIP files containing PDFs.
+    For ZIP files the last successfully processed candidate is returned; use
+    upload_resumes_bulk to get the outcome of every file.
+    """
+    try:
+        results = await _process_upload(job_id, file, created_by)
+        succeeded = [result for result in results if result["status"] == "succeeded"]
+        if not succeeded:
+            raise HTTPException(status_code=500, detail=results[-1]["error"])
+        return succeeded[-1]["candidate"]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def upload_resumes_bulk(job_id: str, file: UploadFile, created_by: User) -> dict:
+    """
+    Process a PDF or ZIP upload concurrently and return a per-file report
+    """
+    try:
+        started = time.perf_counter()
+        results = await _process_upload(job_id, file, created_by)
+        for result in results:
+            result.pop("candidate", None)
+
+        succeeded = sum(1 for result in results if result["status"] == "succeeded")
+        logger.info(f"Bulk upload for job {job_id}: {succeeded}/{len(results)} resumes processed")
+        return {
+            "job_id": job_id,
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "results": results
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in bulk upload: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 async def get_resume_file(candidate_id: str) -> tuple[bytes, str]:
     """
     Retrieve a candidate's resume file from GridFS
@@ -199,10 +559,149 @@ async def get_resume_file(candidate_id: str) -> tuple[bytes, str]:
         logger.error(f"Error retrieving resume file: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def get_candidates(job_id: str, skip: int = 0, limit: int = 10) -> List[dict]:
+# Fields the candidate listing can be sorted by, each with a (job_id, field, _id)
+# index in app.core.indexes so the top of a sorted listing is read from the index
+CANDIDATE_SORT_FIELDS = ("created_at", "resume_score", "screening_score")
+CANDIDATE_SCREENING_STATUSES = ("not_screened", "in_progress", "screened")
+
+# Response fields of the candidate listing views. "full" is what
+# serialize_candidate returns; "summary" is what the candidates table shows,
+# without the screening summary and with only the top skills. Neither reads
+# call_transcript, the largest field of a screened candidate, from MongoDB.
+CANDIDATE_FULL_FIELDS = (
+    "id", "job_id", "name", "email", "phone", "location", "linkedin_url", "resume_file_id", "skills",
+    "resume_score", "screening_tier", "coarse_score", "screening_score", "screening_summary", "created_by_id",
+    "created_at", "updated_at", "screening_in_progress", "current_compensation", "expected_compensation",
+    "notice_period", "notice_period_days",
+)
+CANDIDATE_SUMMARY_FIELDS = (
+    "id", "job_id", "name", "email", "phone", "location", "skills", "resume_score", "screening_tier",
+    "screening_score", "screening_in_progress", "current_compensation", "expected_compensation",
+    "notice_period", "notice_period_days", "created_at",
+)
+CANDIDATE_LIST_VIEWS = ("summary", "full")
+SUMMARY_TOP_SKILLS = 3
+
+# Document fields a response field is read from, when not the field itself
+_FIELD_SOURCES = {"id": ("_id",), "resume_file_id": ("resume_file_id", "resume_path")}
+
+# Conversions of response fields that are not copied as they are
+_FIELD_SERIALIZERS: Dict[str, Callable[[dict], Any]] = {
+    "id": lambda candidate: str(candidate["_id"]),
+    "job_id": lambda candidate: str(candidate["job_id"]),
+    "resume_file_id": lambda candidate: candidate.get("resume_file_id", candidate.get("resume_path", "")),
+    "screening_tier": lambda candidate: candidate.get("screening_tier", SCREENING_TIER_FULL),
+    "screening_in_progress": lambda candidate: candidate.get("screening_in_progress", False),
+    "created_by_id": lambda candidate: str(candidate["created_by_id"]) if candidate.get("created_by_id") else None,
+    "created_at": lambda candidate: candidate["created_at"].isoformat(),
+    "updated_at": lambda candidate: candidate["updated_at"].isoformat(),
+}
+
+def candidate_list_fields(view: str = "full", fields: Optional[str] = None, sort_field: str = "created_at") -> Tuple[str, ...]:
+    """
+    Response fields of a candidate listing: the comma separated `fields` if
+    given, otherwise those of `view`. The id and the sort field are always
+    included, the next page cursor is made of them.
+    """
+    if view not in CANDIDATE_LIST_VIEWS:
+        raise HTTPException(status_code=400, detail=f"view must be one of {', '.join(CANDIDATE_LIST_VIEWS)}")
+    if not fields:
+        return CANDIDATE_SUMMARY_FIELDS if view == "summary" else CANDIDATE_FULL_FIELDS
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in CANDIDATE_FULL_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown candidate fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(["id", *requested, sort_field]))
+
+def candidate_projection(fields: Iterable[str]) -> Dict[str, int]:
+    """MongoDB projection of the document fields the response `fields` are read from"""
+    projection = {"_id": 1}
+    for field in fields:
+        for source in _FIELD_SOURCES.get(field, (field,)):
+            projection[source] = 1
+    return projection
+
+def serialize_candidate_fields(candidate: dict, fields: Iterable[str], top_skills: Optional[int] = None) -> dict:
+    """
+    serialize_candidate restricted to `fields`, for a document read with
+    candidate_projection(fields). With `top_skills`, only that many of the
+    best scored skills are kept.
+    """
+    serialized = {
+        field: _FIELD_SERIALIZERS[field](candidate) if field in _FIELD_SERIALIZERS else candidate.get(field)
+        for field in fields
+    }
+    if top_skills is not None and serialized.get("skills"):
+        best = sorted(serialized["skills"].items(), key=lambda item: item[1], reverse=True)[:top_skills]
+        serialized["skills"] = dict(best)
+    return serialized
+
+def build_candidate_query(
+    job_id: str,
+    min_resume_score: Optional[float] = None,
+    max_resume_score: Optional[float] = None,
+    min_screening_score: Optional[float] = None,
+    max_screening_score: Optional[float] = None,
+    max_notice_days: Optional[int] = None,
+    screening_status: Optional[str] = None
+) -> Dict[str, Any]:
+    """MongoDB filter for a job's candidates matching the listing filters"""
+    query: Dict[str, Any] = {"job_id": ObjectId(job_id)}
+    conditions = (
+        ("resume_score", "$gte", min_resume_score),
+        ("resume_score", "$lte", max_resume_score),
+        ("screening_score", "$gte", min_screening_score),
+        ("screening_score", "$lte", max_screening_score),
+        ("notice_period_days", "$lte", max_notice_days),
+    )
+    for field, op, value in conditions:
+        if value is not None:
+            query.setdefault(field, {})[op] = value
+
+    if screening_status == "screened":
+        query.setdefault("screening_score", {})["$ne"] = None
+    elif screening_status == "in_progress":
+        query["screening_in_progress"] = True
+    elif screening_status == "not_screened":
+        query.setdefault("screening_score", {})["$eq"] = None
+        query["screening_in_progress"] = {"$ne": True}
+    elif screening_status is not None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"screening_status must be one of {', '.join(CANDIDATE_SCREENING_STATUSES)}"
+        )
+    return query
+
+async def get_candidates(
+    job_id: str,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    view: str = "full",
+    fields: Optional[str] = None,
+    **filters: Any
+) -> List[dict]:
     """
-    Get all candidates for a job
+    Get the candidates of a job, after the pagination cursor if one is given
+    (see app.core.pagination).
+
+    Args:
+        sort: A field of CANDIDATE_SORT_FIELDS, ascending, or descending with
+            a "-" prefix (e.g. "-resume_score" for the top candidates)
+        view: "full" or "summary" (see CANDIDATE_SUMMARY_FIELDS)
+        fields: Comma separated response fields, instead of those of a view
+        filters: The range and screening state filters of build_candidate_query
     """
+    sort_field = sort.lstrip("-")
+    direction = -1 if sort.startswith("-") else 1
+    if sort_field not in CANDIDATE_SORT_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sort must be one of {', '.join(CANDIDATE_SORT_FIELDS)}, optionally prefixed with -"
+        )
+    response_fields = candidate_list_fields(view, fields, sort_field)
     try:
         logger.info(f"Fetching candidates for job_id: {job_id}")
         
@@ -211,10 +710,16 @@ async def get_candidates(job_id: str, skip: int = 0, limit: int = 10) -> List[di
         
         db = await get_database()
         
-        # Get cursor and apply pagination
-        cursor = db.candidates.find({"job_id": ObjectId(job_id)})
-        cursor = cursor.skip(skip).limit(limit)
-        candidates = await cursor.to_list(length=limit)
+        # Get cursor and apply pagination; (sort field, _id) keeps pages
+        # stable while uploads are running
+        query = build_candidate_query(job_id, **filters)
+        if cursor:
+            query.update(keyset_filter(cursor, sort_field, direction))
+        # Only the fields of the response are read, never the call transcript
+        results = db.candidates.find(query, candidate_projection(response_fields))
+        results = results.sort([(sort_field, direction), ("_id", direction)])
+        results = results.skip(skip).limit(limit)
+        candidates = await results.to_list(length=limit)
         
         logger.info(f"Found {len(candidates)} candidates")
         
@@ -222,7 +727,11 @@ async def get_candidates(job_id: str, skip: int = 0, limit: int = 10) -> List[di
         serialized_candidates = []
         for candidate in candidates:
             try:
-                serialized = serialize_candidate(candidate)
+                if response_fields == CANDIDATE_FULL_FIELDS:
+                    serialized = serialize_candidate(candidate)
+                else:
+                    top_skills = SUMMARY_TOP_SKILLS if not fields else None
+                    serialized = serialize_candidate_fields(candidate, response_fields, top_skills)
                 serialized_candidates.append(serialized)
                 logger.info(f"Successfully serialized candidate: {candidate['_id']}")
             except Exception as e:
@@ -230,10 +739,50 @@ async def get_candidates(job_id: str, skip: int = 0, limit: int = 10) -> List[di
                 raise
         
         return serialized_candidates
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching candidates: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching candidates: {str(e)}")
 
+async def rank_candidates(job_id: str, limit: int = 50) -> List[dict]:
+    """
+    The job's candidates ranked by BM25 relevance of their resume text to the
+    job title, description and requirements, best first, with a
+    lexical_score. No LLM is involved, so this is cheap enough to decide
+    which candidates to analyze or screen first.
+    """
+    try:
+        started = time.perf_counter()
+        db = await get_database()
+        job = await db.jobs.find_one(
+            {"_id": ObjectId(job_id)},
+            {"title": 1, "description": 1, "requirements": 1}
+        )
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        query = "\n".join(job.get(field) or "" for field in ("title", "description", "requirements"))
+        index = await get_job_index(job_id)
+        ranked = index.rank(query, limit)
+
+        cursor = db.candidates.find({"_id": {"$in": [ObjectId(candidate_id) for candidate_id, _ in ranked]}})
+        candidates = {str(candidate["_id"]): candidate for candidate in await cursor.to_list(length=len(ranked))}
+        results = [
+            {**serialize_candidate(candidates[candidate_id]), "lexical_score": round(score, 4)}
+            for candidate_id, score in ranked
+            if candidate_id in candidates
+        ]
+        metrics.latency("lexical_rank_ms").observe((time.perf_counter() - started) * 1000)
+        return results
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error ranking candidates: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error ranking candidates: {str(e)}")
+
 async def get_candidate(job_id: str, candidate_id: str) -> Optional[dict]:
     """
     Get a specific candidate
@@ -251,6 +800,59 @@ async def get_candidate(job_id: str, candidate_id: str) -> Optional[dict]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching candidate: {str(e)}")
 
+async def promote_candidate(job_id: str, candidate_id: str) -> dict:
+    """
+    Run the full analysis for a candidate that only has the cascade's coarse
+    score. Candidates that were already fully analyzed are returned as is.
+    """
+    try:
+        db = await get_database()
+        candidate = await db.candidates.find_one({
+            "_id": ObjectId(candidate_id),
+            "job_id": ObjectId(job_id)
+        })
+        if not candidate:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+        if candidate.get("screening_tier", SCREENING_TIER_FULL) == SCREENING_TIER_FULL:
+            return serialize_candidate(candidate)
+
+        content, filename = await get_resume_file(candidate_id)
+        resume = await parse_resume_async(content, filename)
+        job_context = await get_job_context(job_id)
+        with deadline(settings.RESUME_ANALYSIS_BUDGET):
+            basic_info, analysis = await extract_and_analyze_resume(resume, job_context)
+
+        sha256 = candidate.get("resume_sha256") or hashlib.sha256(content).hexdigest()
+        if settings.RESUME_DEDUP_ENABLED:
+            await save_resume_analysis(sha256, analysis_scope(job_id), basic_info, analysis)
+        await index_candidate_text(job_id, candidate_id, sha256, resume.text)
+
+        # Only the promotion that changes the tier counts the candidate as resume screened
+        updated = await db.candidates.find_one_and_update(
+            {"_id": candidate["_id"], "screening_tier": SCREENING_TIER_COARSE},
+            {
+                "$set": {
+                    "skills": analysis.get("skills", {}),
+                    "resume_score": analysis.get("score", 0.0),
+                    "screening_tier": SCREENING_TIER_FULL,
+                    "updated_at": datetime.now(UTC)
+                }
+            },
+            return_document=True
+        )
+        if not updated:
+            # Promoted concurrently
+            return serialize_candidate(await db.candidates.find_one({"_id": candidate["_id"]}))
+        await record_stats_change(job_id, resume_screened=int(candidate.get("resume_score") is None))
+        metrics.counter("screening_cascade_promotions").inc()
+        logger.info(f"Promoted candidate {candidate_id} to full analysis")
+        return serialize_candidate(updated)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error promoting candidate: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 async def update_candidate_info(
     candidate_id: str,
     update_fields: Optional[dict] = None,
@@ -302,6 +904,8 @@ async def update_candidate_info(
                 update_data["skills"] = skills
             if resume_score is not None:
                 update_data["resume_score"] = resume_score
+        if "notice_period" in update_data:
+            update_data["notice_period_days"] = parse_notice_period_days(update_data["notice_period"])
 
         result = await db.candidates.find_one_and_update(
             {"_id": ObjectId(candidate_id)},
@@ -327,25 +931,17 @@ async def delete_candidate(candidate_id: str):
         if not candidate:
             raise HTTPException(status_code=404, detail="Candidate not found")
         
-        # Delete resume file from GridFS if it exists
-        file_id = candidate.get("resume_file_id")
-        if file_id:
-            try:
-                fs = await get_gridfs()
-                await fs.delete(ObjectId(file_id))
-            except Exception as e:
-                logger.error(f"Error deleting file from GridFS: {str(e)}")
-        
         # Delete candidate record
         result = await db.candidates.delete_one({"_id": ObjectId(candidate_id)})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Candidate not found")
+
+        # Delete resume file from GridFS once no other candidate shares it
+        if candidate.get("resume_file_id"):
+            await release_candidate_resume(candidate.get("resume_sha256"), candidate["resume_file_id"])
+        await remove_candidate_terms(str(candidate["job_id"]), candidate_id)
         
-        # Decrement the job's candidate count
-        await db.jobs.update_one(
-            {"_id": candidate["job_id"]},
-            {"$inc": {"total_candidates": -1}}
-        )
+        await record_candidate_removed(candidate["job_id"], candidate)
             
     except HTTPException:
         raise
@@ -404,6 +1000,27 @@ async def migrate_candidates_to_gridfs():
         logger.error(f"Error during candidate migration: {str(e)}", exc_info=True)
         raise
 
+async def migrate_notice_period_days():
+    """Derive notice_period_days for candidates screened before it was stored"""
+    try:
+        db = await get_database()
+        cursor = db.candidates.find(
+            {"notice_period": {"$type": "string"}, "notice_period_days": {"$exists": False}},
+            {"notice_period": 1}
+        )
+        migrated = 0
+        async for candidate in cursor:
+            await db.candidates.update_one(
+                {"_id": candidate["_id"]},
+                {"$set": {"notice_period_days": parse_notice_period_days(candidate["notice_period"])}}
+            )
+            migrated += 1
+        if migrated:
+            logger.info(f"Derived notice_period_days for {migrated} candidates")
+    except Exception as e:
+        logger.error(f"Error during notice period migration: {str(e)}", exc_info=True)
+        raise
+
 # Update the serialize_candidate function to handle both old and new fields
 def serialize_candidate(candidate: dict) -> dict:
     """Convert MongoDB candidate document to JSON-serializable format"""
@@ -418,9 +1035,12 @@ def serialize_candidate(candidate: dict) -> dict:
             "email": candidate["email"],
             "phone": candidate["phone"],
             "location": candidate["location"],
+            "linkedin_url": candidate.get("linkedin_url"),
             "resume_file_id": resume_identifier,  # Use whichever we found
             "skills": candidate["skills"],
             "resume_score": candidate["resume_score"],
+            "screening_tier": candidate.get("screening_tier", SCREENING_TIER_FULL),
+            "coarse_score": candidate.get("coarse_score"),
             "screening_score": candidate["screening_score"],
             "screening_summary": candidate["screening_summary"],
             "created_by_id": str(candidate["created_by_id"]) if candidate.get("created_by_id") else None,
@@ -430,6 +1050,7 @@ def serialize_candidate(candidate: dict) -> dict:
             "current_compensation": candidate.get("current_compensation", None),
             "expected_compensation": candidate.get("expected_compensation", None),
             "notice_period": candidate.get("notice_period", None),
+            "notice_period_days": candidate.get("notice_period_days"),
             }
     except Exception as e:
         logger.error(f"Error serializing candidate {candidate.get('_id', 'unknown')}: {str(e)}")
@@ -461,8 +1082,11 @@ async def create_candidate(job_id: str, file: UploadFile) -> dict:
 
         try:
             # Analyze resume
-            resume_info = await extract_resume_info(io.BytesIO(content))
-            analysis_result = await analyze_resume(io.BytesIO(content))
+            sha256 = hashlib.sha256(content).hexdigest()
+            resume = await parse_resume_async(content, file.filename)
+            job_context = await get_job_context(job_id)
+            with deadline(settings.RESUME_ANALYSIS_BUDGET):
+                resume_info, analysis_result = await extract_and_analyze_resume(resume, job_context)
 
             # Create candidate document
             candidate = {
@@ -471,7 +1095,9 @@ async def create_candidate(job_id: str, file: UploadFile) -> dict:
                 "email": resume_info.get("email", ""),
                 "phone": resume_info.get("phone"),
                 "location": resume_info.get("location"),
+                "linkedin_url": resume_info.get("linkedin_url"),
                 "resume_file_id": str(file_id),  # Convert ObjectId to string
+                "resume_sha256": sha256,
                 "skills": analysis_result.get("skills", {}),
                 "resume_score": analysis_result.get("score", 0),
                 "screening_score": None,
@@ -482,20 +1108,9 @@ async def create_candidate(job_id: str, file: UploadFile) -> dict:
 
             result = await db.candidates.insert_one(candidate)
             candidate["_id"] = result.inserted_id
+            await index_candidate_text(job_id, str(result.inserted_id), sha256, resume.text)
 
-            # Update job's statistics
-            await db.jobs.update_one(
-                {"_id": ObjectId(job_id)},
-                {
-                    "$inc": {
-                        "total_candidates": 1,
-                        "resume_screened": 1
-                    },
-                    "$set": {
-                        "updated_at": datetime.now(UTC)
-                    }
-                }
-            )
+            await record_candidate_added(job_id, candidate)
 
             # Return created candidate
             return serialize_candidate(candidate)
@@ -856,8 +1471,11 @@ async def process_call_results(call_data: dict) -> dict:
                     analysis_results = await analyze_call_transcript(screening_summary)
                 except Exception as e:
                     logger.error(f"Error extracting details: {e}")
-                            # Update the candidate with the call results
-        await db.candidates.update_one(
+        # Update the candidate with the call results, reading its
+        # previous score in the same atomic step: only a candidate's first
+        # completed screening counts as phone screened, however often the
+        # webhook is delivered
+        previous = await db.candidates.find_one_and_update(
             {"_id": ObjectId(candidate_id)},
             {
                 "$set": {
@@ -866,26 +1484,20 @@ async def process_call_results(call_data: dict) -> dict:
                         "screening_score": analysis_results.get("screening_score", 0),
                         "screening_summary": screening_summary,  # Use Ultravox's summary
                         "notice_period": analysis_results.get("notice_period", "Not specified"),
+                        "notice_period_days": parse_notice_period_days(analysis_results.get("notice_period")),
                         "current_compensation": analysis_results.get("current_compensation", "Not specified"),
                         "expected_compensation": analysis_results.get("expected_compensation", "Not specified"),
                         "updated_at": datetime.now(UTC)
                 }
-            }
+            },
+            projection={"screening_score": 1},
+            return_document=ReturnDocument.BEFORE
         )
         
         # Update job statistics
         job_id = call_session.get("job_id")
-        await db.jobs.update_one(
-            {"_id": ObjectId(job_id)},
-            {
-                "$inc": {
-                    "phone_screened": 1
-                },
-                "$set": {
-                    "updated_at": datetime.now(UTC)
-                }
-            }
-        )
+        if previous and previous.get("screening_score") is None:
+            await record_stats_change(job_id, phone_screened=1)
         
         # Update call session status
         await db.call_sessions.update_one(
@@ -0,0 +1,154 @@
+"""
+Local extraction of candidate contact details.
+
+Emails, phone numbers and LinkedIn profile URLs follow fixed patterns, and
+the name and location are nearly always in the first lines of a resume, so
+most resumes need no LLM call for contact information. Each extractor only
+returns a value it is confident about; anything else is left as None for
+the LLM to fill.
+"""
+from typing import Dict, Iterable, List, Optional
+import re
+
+from app.utils.phone_utils import format_phone_number
+
+CONTACT_FIELDS = ("name", "email", "phone", "location")
+
+# Name and location are only looked for in the resume header
+HEADER_LINES = 8
+NAME_LINES = 3
+# Phone numbers are also looked for in labelled lines further down
+PHONE_LABEL = re.compile(r"\b(?:phone|mobile|mob|cell|tel|telephone|contact)\b", re.IGNORECASE)
+
+_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE = re.compile(r"(?<![\w/])\+?\(?\d[\d\s().-]{7,}\d(?![\w/])")
+_YEAR_RANGE = re.compile(r"^(?:19|20)\d{2}\s*[-–]\s*(?:19|20)\d{2}$")
+_LINKEDIN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/([A-Za-z0-9_%-]+)", re.IGNORECASE)
+_NAME_WORD = re.compile(r"^[A-Z][a-zA-Z'’-]*\.?$")
+_LOCATION = re.compile(r"^[A-Z][A-Za-z .'’-]{1,30},\s*[A-Z][A-Za-z .'’-]{1,30}$")
+_LOCATION_LABEL = re.compile(r"^(?:location|address|based in)\s*[:\-]\s*(.+)$", re.IGNORECASE)
+_SEPARATORS = re.compile(r"\s*(?:\||•|·|\t| {2,}| [–—-] )\s*")
+
+NOT_NAMES = {"resume", "curriculum vitae", "cv", "profile", "contact", "summary"}
+# Words of job titles and headings, which are capitalized like names
+TITLE_WORDS = {
+    "engineer", "scientist", "developer", "manager", "analyst", "designer", "consultant", "architect",
+    "specialist", "director", "administrator", "officer", "intern", "associate", "executive",
+    "coordinator", "assistant", "technician", "programmer", "accountant", "researcher", "professor",
+    "teacher", "senior", "junior", "software", "curriculum", "vitae", "experience", "education", "skills",
+}
+
+
+def _header(text: str, lines: int) -> List[str]:
+    return [line.strip() for line in text.split("\n") if line.strip()][:lines]
+
+
+def _segments(lines: Iterable[str]) -> Iterable[str]:
+    for line in lines:
+        for segment in _SEPARATORS.split(line):
+            if segment:
+                yield segment.strip()
+
+
+def extract_email(text: str) -> Optional[str]:
+    match = _EMAIL.search(text)
+    return match.group(0).rstrip(".").lower() if match else None
+
+
+def extract_phone(text: str) -> Optional[str]:
+    """
+    The first phone number in the header or in a line labelled as a phone,
+    in E.164 format. Numbers elsewhere (dates, IDs) are ignored. A national
+    number with a trunk "0" prefix (e.g. "020 7946 0958") has no country
+    code to build E.164 from, so None is returned for the LLM to decide; a
+    "00" international prefix is read as "+".
+    """
+    lines = [line for line in text.split("\n") if line.strip()]
+    candidates = lines[:HEADER_LINES] + [line for line in lines[HEADER_LINES:] if PHONE_LABEL.search(line)]
+    for line in candidates:
+        for match in _PHONE.finditer(line):
+            raw = match.group(0).strip()
+            if _YEAR_RANGE.match(raw):
+                continue
+            digits = re.sub(r"\D", "", raw)
+            if not 10 <= len(digits) <= 15:
+                continue
+            if re.match(r"^\(?0(?!0)", raw):
+                return None
+            if raw.startswith("00"):
+                raw = "+" + raw[2:]
+            phone = format_phone_number(raw)
+            if phone:
+                return phone
+    return None
+
+
+def extract_linkedin_url(text: str) -> Optional[str]:
+    match = _LINKEDIN.search(text)
+    return f"https://www.linkedin.com/in/{match.group(1)}" if match else None
+
+
+def extract_name(text: str) -> Optional[str]:
+    """
+    A 2-4 word capitalized line (or line segment) at the top of the resume
+    that is not a job title or heading
+    """
+    for segment in _segments(_header(text, NAME_LINES)):
+        if segment.lower() in NOT_NAMES or any(char.isdigit() for char in segment) or "@" in segment:
+            continue
+        words = segment.split()
+        if not 2 <= len(words) <= 4:
+            continue
+        if any(word.lower().strip(".,") in TITLE_WORDS for word in words):
+            continue
+        if segment.isupper():
+            words = [word.capitalize() for word in words]
+        if all(_NAME_WORD.match(word) for word in words):
+            return " ".join(words)
+    return None
+
+
+def extract_location(text: str) -> Optional[str]:
+    """A "City, Region" segment or a labelled location in the header"""
+    for segment in _segments(_header(text, HEADER_LINES)):
+        labelled = _LOCATION_LABEL.match(segment)
+        if labelled:
+            return labelled.group(1).strip()
+        if "@" in segment or any(char.isdigit() for char in segment):
+            continue
+        if _LOCATION.match(segment):
+            return segment
+    return None
+
+
+def extract_contact_details(text: str) -> Dict[str, Optional[str]]:
+    """
+    Extract contact details without an LLM.
+
+    Returns:
+        name, email, phone, location and linkedin_url; None where nothing
+        was found confidently
+    """
+    return {
+        "name": extract_name(text),
+        "email": extract_email(text),
+        "phone": extract_phone(text),
+        "location": extract_location(text),
+        "linkedin_url": extract_linkedin_url(text),
+    }
+
+
+def missing_contact_fields(contact: Dict[str, Optional[str]], required: Iterable[str]) -> List[str]:
+    return [field for field in required if not contact.get(field)]
+
+
+def merge_contact_details(local: Dict[str, Optional[str]], llm: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    """Locally extracted values win; the LLM only fills the gaps"""
+    merged = dict(local)
+    for field in CONTACT_FIELDS:
+        if not merged.get(field):
+            value = llm.get(field)
+            if field == "phone" and value:
+                value = format_phone_number(value) or value
+            merged[field] = value
+    return merged
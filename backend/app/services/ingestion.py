@@ -0,0 +1,367 @@
+from datetime import datetime, timedelta, UTC
+from typing import Callable, Optional
+import logging
+import os
+import socket
+import tempfile
+import zipfile
+
+from bson import ObjectId
+from fastapi import UploadFile, HTTPException
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.core.mongodb import get_database, get_gridfs
+from app.models.database import User, serialize_ingestion_job
+from app.services.candidates import spool_upload, list_zip_resumes, process_resume_batch
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process when it claims ingestion jobs
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Called when an ingestion job is queued, e.g. to wake the API's inline worker
+_enqueue_listeners: list[Callable[[], None]] = []
+
+
+def add_enqueue_listener(listener: Callable[[], None]) -> None:
+    _enqueue_listeners.append(listener)
+
+
+def remove_enqueue_listener(listener: Callable[[], None]) -> None:
+    if listener in _enqueue_listeners:
+        _enqueue_listeners.remove(listener)
+
+
+class IngestionLeaseLost(Exception):
+    """Raised when a worker no longer owns the ingestion job it is processing"""
+
+
+async def enqueue_ingestion(job_id: str, file: UploadFile, created_by: User) -> dict:
+    """
+    Store an uploaded PDF or ZIP in GridFS and queue it for background processing.
+    The ZIP central directory is read up front so that every resume gets a
+    progress entry and invalid archives are rejected immediately.
+    """
+    filename = file.filename.lower()
+    if not filename.endswith(('.zip', '.pdf')):
+        raise HTTPException(status_code=400, detail="Only PDF or ZIP files are allowed")
+
+    try:
+        with await spool_upload(file) as spooled:
+            if filename.endswith('.zip'):
+                kind = "zip"
+                try:
+                    with zipfile.ZipFile(spooled, 'r') as archive:
+                        names = [name for name, _ in list_zip_resumes(archive)]
+                except zipfile.BadZipFile:
+                    raise HTTPException(status_code=400, detail="Invalid ZIP file")
+                if not names:
+                    raise HTTPException(status_code=400, detail="No PDF files found in ZIP")
+            else:
+                kind = "pdf"
+                names = [file.filename]
+
+            # Store the upload itself; workers read it back from GridFS
+            spooled.seek(0)
+            fs = await get_gridfs()
+            file_id = await fs.upload_from_stream(
+                filename=file.filename,
+                source=spooled,
+                metadata={
+                    "job_id": job_id,
+                    "created_by": created_by.id,
+                    "content_type": "application/zip" if kind == "zip" else "application/pdf",
+                    "purpose": "ingestion"
+                }
+            )
+
+        now = datetime.now(UTC)
+        ingestion_job = {
+            "_id": ObjectId(),
+            "job_id": ObjectId(job_id),
+            "created_by_id": ObjectId(created_by.id),
+            "filename": file.filename,
+            "file_id": str(file_id),
+            "kind": kind,
+            "status": "pending",
+            "items": [
+                {
+                    "filename": name,
+                    "status": "pending",
+                    "candidate_id": None,
+                    "duration_ms": None,
+                    "error": None
+                }
+                for name in names
+            ],
+            "total": len(names),
+            "processed": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "attempts": 0,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "available_at": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "completed_at": None
+        }
+
+        db = await get_database()
+        await db.ingestion_jobs.insert_one(ingestion_job)
+        logger.info(f"Queued ingestion job {ingestion_job['_id']} with {len(names)} resumes for job {job_id}")
+
+        for listener in _enqueue_listeners:
+            listener()
+
+        return serialize_ingestion_job(ingestion_job)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error queueing ingestion job: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_ingestion_job(ingestion_job_id: str) -> Optional[dict]:
+    """Get an ingestion job with its per-file progress"""
+    if not ObjectId.is_valid(ingestion_job_id):
+        return None
+    db = await get_database()
+    ingestion_job = await db.ingestion_jobs.find_one({"_id": ObjectId(ingestion_job_id)})
+    if ingestion_job:
+        return serialize_ingestion_job(ingestion_job)
+    return None
+
+
+async def claim_ingestion_job(worker_id: str) -> Optional[dict]:
+    """
+    Atomically lease the oldest pending ingestion job (or one whose lease expired).
+    Any number of workers, in any process or host, can call this concurrently:
+    find_one_and_update guarantees each job is handed to a single owner.
+    Jobs that failed are only claimed again once their retry delay has passed.
+    """
+    db = await get_database()
+    now = datetime.now(UTC)
+    return await db.ingestion_jobs.find_one_and_update(
+        {
+            "$or": [
+                {"status": "pending", "available_at": {"$not": {"$gt": now}}},
+                {"status": "processing", "lease_expires_at": {"$lt": now}}
+            ],
+            "attempts": {"$lt": settings.INGESTION_MAX_ATTEMPTS}
+        },
+        {
+            "$set": {
+                "status": "processing",
+                "lease_owner": worker_id,
+                "lease_expires_at": now + timedelta(seconds=settings.INGESTION_LEASE_SECONDS),
+                "updated_at": now
+            },
+            "$inc": {"attempts": 1}
+        },
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def renew_ingestion_lease(ingestion_job_id: ObjectId, worker_id: str) -> bool:
+    """Extend the lease on an ingestion job. Returns False if the worker no longer owns it."""
+    db = await get_database()
+    now = datetime.now(UTC)
+    result = await db.ingestion_jobs.update_one(
+        {"_id": ingestion_job_id, "lease_owner": worker_id, "status": "processing"},
+        {
+            "$set": {
+                "lease_expires_at": now + timedelta(seconds=settings.INGESTION_LEASE_SECONDS),
+                "updated_at": now
+            }
+        }
+    )
+    return result.matched_count > 0
+
+
+async def release_ingestion_job(ingestion_job_id: ObjectId, worker_id: str) -> None:
+    """
+    Hand an unfinished ingestion job back to the queue, e.g. on worker shutdown.
+    The attempt is not counted against INGESTION_MAX_ATTEMPTS.
+    """
+    db = await get_database()
+    await db.ingestion_jobs.update_one(
+        {"_id": ingestion_job_id, "lease_owner": worker_id, "status": "processing"},
+        {
+            "$set": {
+                "status": "pending",
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "updated_at": datetime.now(UTC)
+            },
+            "$inc": {"attempts": -1}
+        }
+    )
+
+
+async def recover_stale_ingestion_jobs() -> int:
+    """
+    Fail ingestion jobs whose owner crashed after the last allowed attempt.
+    Jobs with attempts left are simply re-claimed by claim_ingestion_job once
+    their lease expires. Returns the number of jobs marked as failed.
+    """
+    db = await get_database()
+    now = datetime.now(UTC)
+    result = await db.ingestion_jobs.update_many(
+        {
+            "status": "processing",
+            "lease_expires_at": {"$lt": now},
+            "attempts": {"$gte": settings.INGESTION_MAX_ATTEMPTS}
+        },
+        {
+            "$set": {
+                "status": "failed",
+                "error": "Worker lease expired after the maximum number of attempts",
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "updated_at": now
+            }
+        }
+    )
+    if result.modified_count:
+        logger.warning(f"Marked {result.modified_count} stale ingestion jobs as failed")
+    return result.modified_count
+
+
+def _retry_at(ingestion_job: dict, now: datetime) -> datetime:
+    """When a job is claimable again: INGESTION_RETRY_BACKOFF_SECONDS, doubled per attempt"""
+    backoff = settings.INGESTION_RETRY_BACKOFF_SECONDS * 2 ** (ingestion_job["attempts"] - 1)
+    return now + timedelta(seconds=backoff)
+
+
+async def run_ingestion_job(ingestion_job: dict, worker_id: str) -> None:
+    """
+    Process the pending files of a leased ingestion job, recording progress per file.
+    Files already finished by a previous (crashed) owner are skipped, and a
+    file whose candidate was created but not recorded is not created twice
+    (see process_pdf_file). Failed files are queued again, with the job's
+    backoff, until the job runs out of attempts.
+    """
+    db = await get_database()
+    fs = await get_gridfs()
+    ingestion_job_id = ingestion_job["_id"]
+    pending = [index for index, item in enumerate(ingestion_job["items"]) if item["status"] == "pending"]
+    keys = [f"{ingestion_job_id}:{index}" for index in pending]
+    created_by = User(_id=ingestion_job["created_by_id"])
+    failed = []
+
+    async def record_result(batch_index: int, result: dict):
+        index = pending[batch_index]
+        if result["status"] == "failed":
+            failed.append(index)
+        now = datetime.now(UTC)
+        update = await db.ingestion_jobs.update_one(
+            {"_id": ingestion_job_id, "lease_owner": worker_id},
+            {
+                "$set": {
+                    f"items.{index}.status": result["status"],
+                    f"items.{index}.candidate_id": result["candidate_id"],
+                    f"items.{index}.duration_ms": result["duration_ms"],
+                    f"items.{index}.error": result["error"],
+                    # Every recorded file extends the lease
+                    "lease_expires_at": now + timedelta(seconds=settings.INGESTION_LEASE_SECONDS),
+                    "updated_at": now
+                },
+                "$inc": {"processed": 1, result["status"]: 1}
+            }
+        )
+        if update.matched_count == 0:
+            raise IngestionLeaseLost(f"Lease on ingestion job {ingestion_job_id} lost by {worker_id}")
+
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_MEMORY) as spooled:
+            await fs.download_to_stream(ObjectId(ingestion_job["file_id"]), spooled)
+            spooled.seek(0)
+
+            if ingestion_job["kind"] == "zip":
+                with zipfile.ZipFile(spooled, 'r') as archive:
+                    members = list_zip_resumes(archive)
+                    await process_resume_batch(
+                        [members[index] for index in pending],
+                        str(ingestion_job["job_id"]),
+                        created_by,
+                        on_result=record_result,
+                        ingestion_keys=keys
+                    )
+            elif pending:
+                content = spooled.read()
+                await process_resume_batch(
+                    [(ingestion_job["filename"], lambda: content)],
+                    str(ingestion_job["job_id"]),
+                    created_by,
+                    on_result=record_result,
+                    ingestion_keys=keys
+                )
+    except IngestionLeaseLost as e:
+        logger.warning(str(e))
+        return
+    except Exception as e:
+        logger.error(f"Error running ingestion job {ingestion_job_id}: {str(e)}", exc_info=True)
+        exhausted = ingestion_job["attempts"] >= settings.INGESTION_MAX_ATTEMPTS
+        now = datetime.now(UTC)
+        await db.ingestion_jobs.update_one(
+            {"_id": ingestion_job_id, "lease_owner": worker_id},
+            {
+                "$set": {
+                    "status": "failed" if exhausted else "pending",
+                    "error": str(e),
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "available_at": None if exhausted else _retry_at(ingestion_job, now),
+                    "updated_at": now
+                }
+            }
+        )
+        return
+
+    now = datetime.now(UTC)
+    if failed and ingestion_job["attempts"] < settings.INGESTION_MAX_ATTEMPTS:
+        # Put the failed files back; the next attempt only processes those
+        await db.ingestion_jobs.update_one(
+            {"_id": ingestion_job_id, "lease_owner": worker_id},
+            {
+                "$set": {
+                    **{f"items.{index}.status": "pending" for index in failed},
+                    "status": "pending",
+                    "error": f"{len(failed)} of {len(pending)} files failed, retrying",
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "available_at": _retry_at(ingestion_job, now),
+                    "updated_at": now
+                },
+                "$inc": {"processed": -len(failed), "failed": -len(failed)}
+            }
+        )
+        logger.info(f"Retrying {len(failed)} failed files of ingestion job {ingestion_job_id}")
+        return
+
+    await db.ingestion_jobs.update_one(
+        {"_id": ingestion_job_id, "lease_owner": worker_id},
+        {
+            "$set": {
+                "status": "completed",
+                # Files that still failed carry their own error
+                "error": None,
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "updated_at": now,
+                "completed_at": now
+            }
+        }
+    )
+    logger.info(f"Completed ingestion job {ingestion_job_id}")
+
+    # The individual resumes now live in GridFS; the uploaded archive is no longer needed
+    try:
+        await fs.delete(ObjectId(ingestion_job["file_id"]))
+    except Exception as e:
+        logger.error(f"Error deleting ingestion upload {ingestion_job['file_id']}: {str(e)}")
+
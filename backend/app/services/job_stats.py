@@ -0,0 +1,192 @@
+"""
+Materialized job statistics.
+
+Each job document carries its candidate counters (total_candidates,
+resume_screened, phone_screened), and a single rollup document in
+job_stats holds the same counters summed over all jobs, plus total_jobs.
+Both are changed incrementally, together, when a candidate is added or
+deleted, when a screening call completes and when a job is created or
+deleted, so the dashboard reads one document however many jobs and
+candidates there are.
+
+The increments are not transactional, and some code paths update scores
+directly, so reconcile_job_stats recounts everything from the candidates
+collection. It aggregates the whole collection, so it runs from
+`python scripts/reconcile_job_stats.py` (e.g. from cron), in the API only
+when JOB_STATS_RECONCILE_INTERVAL is set, on demand for one job, and once
+to build a missing rollup.
+"""
+from datetime import datetime, UTC
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_ID = "global"
+COUNTERS = ("total_candidates", "resume_screened", "phone_screened")
+
+
+def candidate_counts(candidate: Dict[str, Any]) -> Dict[str, int]:
+    """The counters a candidate document contributes to"""
+    return {
+        "total_candidates": 1,
+        "resume_screened": int(candidate.get("resume_score") is not None),
+        "phone_screened": int(candidate.get("screening_score") is not None),
+    }
+
+
+async def record_stats_change(job_id, **deltas: int) -> None:
+    """
+    Add `deltas` (keyword arguments named after COUNTERS) to the job's
+    counters and to the rollup. The rollup is only changed when the job
+    still exists, so candidates of deleted jobs are never counted.
+    """
+    deltas = {counter: delta for counter, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    try:
+        db = await get_database()
+        result = await db.jobs.update_one({"_id": ObjectId(job_id)}, {"$inc": deltas})
+        if result.matched_count:
+            await db.job_stats.update_one(
+                {"_id": ROLLUP_ID},
+                {"$inc": deltas, "$set": {"updated_at": datetime.now(UTC)}},
+                upsert=True
+            )
+    except Exception as e:
+        # The reconciler repairs counters that missed an update
+        logger.error(f"Error updating job stats for job {job_id}: {str(e)}")
+
+
+async def record_candidate_added(job_id, candidate: Dict[str, Any]) -> None:
+    await record_stats_change(job_id, **candidate_counts(candidate))
+
+
+async def record_candidate_removed(job_id, candidate: Dict[str, Any]) -> None:
+    await record_stats_change(
+        job_id, **{counter: -count for counter, count in candidate_counts(candidate).items()}
+    )
+
+
+async def record_job_created() -> None:
+    await _inc_rollup({"total_jobs": 1})
+
+
+async def record_job_deleted(job: Dict[str, Any]) -> None:
+    """Remove a deleted job, given its document as it was, from the rollup"""
+    deltas = {counter: -int(job.get(counter) or 0) for counter in COUNTERS}
+    await _inc_rollup({"total_jobs": -1, **deltas})
+
+
+async def _inc_rollup(deltas: Dict[str, int]) -> None:
+    try:
+        db = await get_database()
+        await db.job_stats.update_one(
+            {"_id": ROLLUP_ID},
+            {"$inc": deltas, "$set": {"updated_at": datetime.now(UTC)}},
+            upsert=True
+        )
+    except Exception as e:
+        logger.error(f"Error updating job stats rollup: {str(e)}")
+
+
+async def get_rollup() -> Dict[str, int]:
+    """total_jobs and the counters of all jobs, reconciled first if there is no rollup yet"""
+    db = await get_database()
+    rollup = await db.job_stats.find_one({"_id": ROLLUP_ID})
+    if rollup is None:
+        rollup = await reconcile_job_stats()
+    return {counter: int(rollup.get(counter) or 0) for counter in ("total_jobs", *COUNTERS)}
+
+
+def _count_pipeline(match: Dict[str, Any]) -> list:
+    """Counters per job_id of the candidates matching `match`"""
+    # $gt null is false for both null and missing scores
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": "$job_id",
+            "total_candidates": {"$sum": 1},
+            "resume_screened": {"$sum": {"$cond": [{"$gt": ["$resume_score", None]}, 1, 0]}},
+            "phone_screened": {"$sum": {"$cond": [{"$gt": ["$screening_score", None]}, 1, 0]}},
+        }},
+    ]
+
+
+async def reconcile_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Recount one job's counters from its candidates and move the rollup by
+    the drift. Returns the updated job document, None if it does not exist.
+    """
+    db = await get_database()
+    job = await db.jobs.find_one({"_id": ObjectId(job_id)}, {counter: 1 for counter in COUNTERS})
+    if not job:
+        return None
+
+    counted = await db.candidates.aggregate(_count_pipeline({"job_id": ObjectId(job_id)})).to_list(length=1)
+    counts = {counter: counted[0][counter] if counted else 0 for counter in COUNTERS}
+    drift = {counter: counts[counter] - int(job.get(counter) or 0) for counter in COUNTERS}
+
+    updated = await db.jobs.find_one_and_update(
+        {"_id": ObjectId(job_id)},
+        {"$set": {**counts, "updated_at": datetime.now(UTC)}},
+        return_document=True
+    )
+    if any(drift.values()):
+        logger.info(f"Corrected job stats drift for job {job_id}: {drift}")
+        await _inc_rollup({counter: delta for counter, delta in drift.items() if delta})
+    return updated
+
+
+async def reconcile_job_stats() -> Dict[str, Any]:
+    """
+    Recount every job's counters and rebuild the rollup. Jobs whose counters
+    were right are not written. Increments made while this runs can be lost
+    from the rollup until the next run.
+
+    Returns:
+        The new rollup document
+    """
+    started = datetime.now(UTC)
+    db = await get_database()
+    counted = {
+        row["_id"]: row async for row in db.candidates.aggregate(_count_pipeline({}))
+    }
+
+    totals = {counter: 0 for counter in COUNTERS}
+    total_jobs = 0
+    updates = []
+    async for job in db.jobs.find({}, {counter: 1 for counter in COUNTERS}):
+        total_jobs += 1
+        counts = {counter: counted.get(job["_id"], {}).get(counter, 0) for counter in COUNTERS}
+        for counter in COUNTERS:
+            totals[counter] += counts[counter]
+        if any(int(job.get(counter) or 0) != counts[counter] for counter in COUNTERS):
+            updates.append(UpdateOne({"_id": job["_id"]}, {"$set": counts}))
+
+    if updates:
+        await db.jobs.bulk_write(updates, ordered=False)
+        logger.info(f"Corrected the stats of {len(updates)} jobs")
+    metrics.counter("job_stats_corrected_jobs").inc(len(updates))
+
+    rollup = {"total_jobs": total_jobs, **totals, "updated_at": started, "reconciled_at": started}
+    await db.job_stats.update_one({"_id": ROLLUP_ID}, {"$set": rollup}, upsert=True)
+    return {"_id": ROLLUP_ID, **rollup}
+
+
+async def run_job_stats_reconciler() -> None:
+    """Reconcile job stats now and then every JOB_STATS_RECONCILE_INTERVAL seconds, until cancelled"""
+    while True:
+        try:
+            await reconcile_job_stats()
+        except Exception as e:
+            logger.error(f"Error reconciling job stats: {str(e)}", exc_info=True)
+        await asyncio.sleep(settings.JOB_STATS_RECONCILE_INTERVAL)
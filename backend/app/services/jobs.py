@@ -2,7 +2,15 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from bson import ObjectId
 from app.core.mongodb import get_database
+from app.core.pagination import keyset_filter
 from app.models.database import create_job, serialize_job
+from app.services.job_stats import (
+    get_rollup,
+    reconcile_job,
+    record_job_created,
+    record_job_deleted,
+    record_stats_change,
+)
 import logging
 import asyncio
 
@@ -13,7 +21,8 @@ async def create_job(
     description: str,
     responsibilities: str,
     requirements: str,
-    created_by: dict
+    created_by: dict,
+    screening_threshold: Optional[float] = None
 ) -> dict:
     """Create a new job posting"""
     try:
@@ -29,6 +38,7 @@ async def create_job(
                 "description": description,
                 "responsibilities": responsibilities,
                 "requirements": requirements,
+                "screening_threshold": screening_threshold,
                 "total_candidates": 0,
                 "resume_screened": 0,
                 "phone_screened": 0,
@@ -46,6 +56,7 @@ async def create_job(
             result = await db.jobs.insert_one(job)
             logger.info(f"Inserted job into database. Result: {result.inserted_id}")
             job["_id"] = result.inserted_id
+            await record_job_created()
         except Exception as e:
             logger.error(f"Error inserting job into database: {str(e)}", exc_info=True)
             raise
@@ -82,12 +93,19 @@ async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Error getting job: {str(e)}", exc_info=True)
         raise
 
-async def get_jobs(skip: int = 0, limit: int = 10) -> List[Dict[str, Any]]:
-    """Get all jobs with pagination"""
+async def get_jobs(skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get all jobs, newest first, with pagination after the cursor if one is
+    given (see app.core.pagination)
+
+    Raises:
+        InvalidCursor: The cursor was not issued by this API
+    """
+    query = keyset_filter(cursor, "created_at", -1) if cursor else {}
     try:
         db = await get_database()
-        cursor = db.jobs.find().sort("created_at", -1).skip(skip).limit(limit)
-        jobs = await cursor.to_list(length=limit)
+        results = db.jobs.find(query).sort([("created_at", -1), ("_id", -1)]).skip(skip).limit(limit)
+        jobs = await results.to_list(length=limit)
         return [serialize_job(job) for job in jobs]
     except Exception as e:
         logger.error(f"Error getting jobs: {str(e)}", exc_info=True)
@@ -98,7 +116,8 @@ async def update_job(
     title: Optional[str] = None,
     description: Optional[str] = None,
     responsibilities: Optional[str] = None,
-    requirements: Optional[str] = None
+    requirements: Optional[str] = None,
+    screening_threshold: Optional[float] = None
 ) -> Optional[dict]:
     try:
         db = await get_database()
@@ -113,6 +132,8 @@ async def update_job(
             update_data["responsibilities"] = responsibilities
         if requirements:
             update_data["requirements"] = requirements
+        if screening_threshold is not None:
+            update_data["screening_threshold"] = screening_threshold
 
         result = await db.jobs.find_one_and_update(
             {"_id": ObjectId(job_id)},
@@ -129,8 +150,11 @@ async def update_job(
 async def delete_job(job_id: str) -> bool:
     try:
         db = await get_database()
-        result = await db.jobs.delete_one({"_id": ObjectId(job_id)})
-        return result.deleted_count > 0
+        job = await db.jobs.find_one_and_delete({"_id": ObjectId(job_id)})
+        if not job:
+            return False
+        await record_job_deleted(job)
+        return True
     except Exception as e:
         logger.error(f"Error deleting job: {str(e)}", exc_info=True)
         raise
@@ -142,27 +166,19 @@ async def increment_job_stats(
     phone_screened: int = 0
 ) -> Optional[dict]:
     """
-    Increment job statistics with the new counts
+    Increment job statistics with the new counts, and the stats of all jobs with them
     """
     try:
         db = await get_database()
         logger.info(f"Incrementing stats for job {job_id}: total={total_candidates}, resume={resume_screened}, phone={phone_screened}")
 
-        update_data = {
-            "updated_at": datetime.utcnow()
-        }
-        if total_candidates:
-            update_data["total_candidates"] = total_candidates
-        if resume_screened:
-            update_data["resume_screened"] = resume_screened
-        if phone_screened:
-            update_data["phone_screened"] = phone_screened
-
-        result = await db.jobs.find_one_and_update(
-            {"_id": ObjectId(job_id)},
-            {"$inc": update_data},
-            return_document=True
+        await record_stats_change(
+            job_id,
+            total_candidates=total_candidates,
+            resume_screened=resume_screened,
+            phone_screened=phone_screened
         )
+        result = await db.jobs.find_one({"_id": ObjectId(job_id)})
         if result:
             logger.info(f"Successfully updated job stats: {result}")
             return serialize_job(result)
@@ -173,41 +189,12 @@ async def increment_job_stats(
 
 async def sync_job_candidates_count(job_id: str) -> Optional[dict]:
     """
-    Sync the job's candidate counts with the actual numbers in the database
+    Sync the job's candidate counts with the actual numbers in the database,
+    correcting the stats of all jobs by the difference
     """
     try:
-        db = await get_database()
         logger.info(f"Starting sync for job {job_id}")
-
-        # Count actual candidates
-        total_candidates = await db.candidates.count_documents({"job_id": ObjectId(job_id)})
-        logger.info(f"Total candidates: {total_candidates}")
-
-        # Count resume screened candidates (those with a resume score)
-        resume_screened = await db.candidates.count_documents({
-            "job_id": ObjectId(job_id),
-            "resume_score": {"$ne": None}
-        })
-        logger.info(f"Resume screened candidates: {resume_screened}")
-
-        # Count phone screened candidates (those with a screening score)
-        phone_screened = await db.candidates.count_documents({
-            "job_id": ObjectId(job_id),
-            "screening_score": {"$ne": None}
-        })
-        logger.info(f"Phone screened candidates: {phone_screened}")
-
-        # Update job with actual counts
-        result = await db.jobs.find_one_and_update(
-            {"_id": ObjectId(job_id)},
-            {"$set": {
-                "total_candidates": total_candidates,
-                "resume_screened": resume_screened,
-                "phone_screened": phone_screened,
-                "updated_at": datetime.utcnow()
-            }},
-            return_document=True
-        )
+        result = await reconcile_job(job_id)
 
         if result:
             logger.info(f"Successfully updated job with new counts: {result}")
@@ -246,31 +233,9 @@ async def migrate_job_fields():
         raise
 
 async def get_job_stats() -> Dict[str, int]:
-    """Get job statistics"""
+    """Get job statistics, read from the stats rollup (see app.services.job_stats)"""
     try:
-        db = await get_database()
-        pipeline = [
-            {
-                "$group": {
-                    "_id": None,
-                    "total_jobs": {"$sum": 1},
-                    "total_candidates": {"$sum": "$total_candidates"},
-                    "resume_screened": {"$sum": "$resume_screened"},
-                    "phone_screened": {"$sum": "$phone_screened"}
-                }
-            }
-        ]
-        result = await db.jobs.aggregate(pipeline).to_list(length=1)
-        if not result:
-            return {
-                "total_jobs": 0,
-                "total_candidates": 0,
-                "resume_screened": 0,
-                "phone_screened": 0
-            }
-        stats = result[0]
-        del stats["_id"]
-        return stats
+        return await get_rollup()
     except Exception as e:
         logger.error(f"Error getting job stats: {str(e)}", exc_info=True)
-        raise 
\ No newline at end of file
+        raise
@@ -0,0 +1,234 @@
+"""
+Local BM25 ranking of a job's candidates against the job description.
+
+The term counts of each resume are stored in the `resume_terms` collection
+when the candidate is created. Each process keeps a per-job index of them as
+a SciPy sparse matrix (candidates x terms) and scores queries with vectorized
+BM25, so ranking thousands of candidates takes milliseconds and no LLM call.
+An index is loaded on first use and brought up to date with the candidates
+added or removed since (by this or any other process) before each query.
+Writes bump the job's lexical_version, so a query whose job is unchanged
+since the last sync reads one field instead of the job's resume_terms ids.
+Only the LEXICAL_INDEX_MAX_JOBS most recently queried jobs are kept.
+"""
+from collections import Counter, OrderedDict
+from datetime import datetime, UTC
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+import re
+
+import numpy as np
+from bson import ObjectId
+from scipy import sparse
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+# Keeps skill names such as c++, c#, node.js and .net as single terms
+_TERM = re.compile(r"[a-z0-9+#]*[a-z0-9](?:[.+#][a-z0-9]+)*[+#]*")
+
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+during each for from had has have having he her here his how i if in into is it its just me more
+most my no nor not of off on once only or other our out over own same she should so some such than
+that the their them then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your
+""".split())
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word terms of a text, without stop words and single characters"""
+    return [
+        term for term in _TERM.findall(text.lower())
+        if term not in STOP_WORDS and (len(term) > 1 or term in {"c", "r"})
+    ]
+
+
+def term_counts(text: str) -> Dict[str, int]:
+    return dict(Counter(tokenize(text)))
+
+
+class JobIndex:
+    """In-memory BM25 index of the resumes of one job"""
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.candidate_ids: List[str] = []
+        self._rows: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._matrix: Optional[sparse.csc_matrix] = None
+        self._lengths: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.candidate_ids)
+
+    def add(self, candidate_id: str, terms: List[str], counts: List[int]):
+        columns = np.fromiter(
+            (self.vocabulary.setdefault(term, len(self.vocabulary)) for term in terms),
+            dtype=np.int32,
+            count=len(terms)
+        )
+        self.candidate_ids.append(candidate_id)
+        self._rows.append((columns, np.asarray(counts, dtype=np.float32)))
+        self._matrix = None
+
+    def _build(self):
+        """(Re)build the sparse matrix after candidates were added"""
+        row_sizes = [len(columns) for columns, _ in self._rows]
+        rows = np.repeat(np.arange(len(self._rows), dtype=np.int32), row_sizes)
+        columns = np.concatenate([columns for columns, _ in self._rows]) if self._rows else np.zeros(0, np.int32)
+        counts = np.concatenate([counts for _, counts in self._rows]) if self._rows else np.zeros(0, np.float32)
+        self._matrix = sparse.csc_matrix(
+            (counts, (rows, columns)),
+            shape=(len(self._rows), len(self.vocabulary))
+        )
+        self._lengths = np.bincount(rows, weights=counts, minlength=len(self._rows))
+
+    def rank(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Candidates by descending BM25 score against the query text. Candidates
+        sharing no term with the query are left out.
+        """
+        if not self.candidate_ids:
+            return []
+        if self._matrix is None:
+            self._build()
+
+        query_terms = Counter(term for term in tokenize(query) if term in self.vocabulary)
+        if not query_terms:
+            return []
+        columns = np.array([self.vocabulary[term] for term in query_terms], dtype=np.int32)
+        query_weights = np.array(list(query_terms.values()), dtype=np.float32)
+
+        total = len(self.candidate_ids)
+        document_frequency = np.diff(self._matrix.indptr)[columns]
+        idf = np.log1p((total - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        matches = self._matrix[:, columns].tocoo()
+        lengths = self._lengths[matches.row]
+        norm = K1 * (1 - B + B * lengths / max(self._lengths.mean(), 1.0))
+        weights = (idf * query_weights)[matches.col] * matches.data * (K1 + 1) / (matches.data + norm)
+        scores = np.bincount(matches.row, weights=weights, minlength=total)
+
+        matched = np.flatnonzero(scores > 0)
+        if limit is not None and limit < len(matched):
+            matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+        order = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(self.candidate_ids[row], float(scores[row])) for row in order]
+
+
+class _CachedIndex:
+    """A job's index, the lexical_version it was synced at and the lock serializing its syncs"""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.index: Optional[JobIndex] = None
+        self.version: Optional[int] = None
+
+
+# LRU of job_id -> _CachedIndex, as in app.services.llm_cache.LRUCache
+_indexes: "OrderedDict[str, _CachedIndex]" = OrderedDict()
+
+
+def _cached_index(job_id: str) -> _CachedIndex:
+    """The job's cache entry, dropping the least recently used jobs past LEXICAL_INDEX_MAX_JOBS"""
+    entry = _indexes.get(job_id)
+    if entry is None:
+        entry = _indexes[job_id] = _CachedIndex()
+        while len(_indexes) > max(settings.LEXICAL_INDEX_MAX_JOBS, 1):
+            _indexes.popitem(last=False)
+            metrics.counter("lexical_index_evictions").inc()
+    _indexes.move_to_end(job_id)
+    return entry
+
+
+async def _bump_version(db, job_id: str):
+    """Tell every process's cached index of the job that resume_terms changed"""
+    await db.jobs.update_one({"_id": ObjectId(job_id)}, {"$inc": {"lexical_version": 1}})
+
+
+async def index_candidate_text(job_id: str, candidate_id: str, sha256: str, text: Optional[str] = None):
+    """
+    Store the term counts of a candidate's resume. Without text (a resume
+    whose analysis was reused), the counts are copied from an earlier upload
+    of the same file, if there was one.
+    """
+    if not settings.LEXICAL_INDEX_ENABLED:
+        return
+    try:
+        db = await get_database()
+        if text is not None:
+            counts = term_counts(text)
+            terms, values = list(counts), list(counts.values())
+        else:
+            previous = await db.resume_terms.find_one({"sha256": sha256}, {"terms": 1, "counts": 1})
+            if not previous:
+                return
+            terms, values = previous["terms"], previous["counts"]
+
+        # Terms such as node.js are not valid MongoDB keys, hence two arrays
+        await db.resume_terms.replace_one(
+            {"_id": ObjectId(candidate_id)},
+            {
+                "_id": ObjectId(candidate_id),
+                "job_id": ObjectId(job_id),
+                "sha256": sha256,
+                "terms": terms,
+                "counts": values,
+                "created_at": datetime.now(UTC)
+            },
+            upsert=True
+        )
+        await _bump_version(db, job_id)
+    except Exception as e:
+        # Ranking is an aid; never fail an upload over it
+        logger.error(f"Error indexing resume terms of candidate {candidate_id}: {str(e)}")
+
+
+async def remove_candidate_terms(job_id: str, candidate_id: str):
+    try:
+        db = await get_database()
+        result = await db.resume_terms.delete_one({"_id": ObjectId(candidate_id)})
+        if result.deleted_count:
+            await _bump_version(db, job_id)
+    except Exception as e:
+        logger.error(f"Error removing resume terms of candidate {candidate_id}: {str(e)}")
+
+
+async def get_job_index(job_id: str) -> JobIndex:
+    """The job's index, synced with the resume_terms collection when its lexical_version changed"""
+    entry = _cached_index(job_id)
+    async with entry.lock:
+        db = await get_database()
+        # Read before the sync: a write racing it bumps the version past this one
+        job = await db.jobs.find_one({"_id": ObjectId(job_id)}, {"lexical_version": 1})
+        version = (job or {}).get("lexical_version", 0)
+        if entry.index is not None and entry.version == version:
+            return entry.index
+
+        index = entry.index or JobIndex()
+        stored = {str(doc["_id"]) async for doc in db.resume_terms.find({"job_id": ObjectId(job_id)}, {"_id": 1})}
+        known = set(index.candidate_ids)
+        if known - stored:
+            # Candidates were deleted: rebuild rather than shrink the matrix
+            index, known = JobIndex(), set()
+            metrics.counter("lexical_index_rebuilds").inc()
+
+        missing = [ObjectId(candidate_id) for candidate_id in stored - known]
+        if missing:
+            cursor = db.resume_terms.find({"_id": {"$in": missing}}, {"terms": 1, "counts": 1})
+            async for doc in cursor:
+                index.add(str(doc["_id"]), doc["terms"], doc["counts"])
+        entry.index, entry.version = index, version
+        return index
+
+
+def clear_lexical_indexes():
+    _indexes.clear()
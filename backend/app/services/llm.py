@@ -0,0 +1,296 @@
+from typing import Any, Dict, List, Optional, Set, Union
+import asyncio
+import logging
+import time
+
+import httpx
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI
+
+from app.core.config import AITaskRoute, settings
+from app.core.deadline import DeadlineExceeded, check_deadline, remaining
+from app.core.metrics import metrics
+from app.services.rate_limiter import LLMRateLimiter, backoff_delay, parse_duration
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[AsyncOpenAI] = None
+_limiter: Optional[LLMRateLimiter] = None
+# Releases of slots granted to abandoned waits, kept referenced until they run
+_pending_releases: Set[asyncio.Task] = set()
+
+
+def get_llm_client() -> AsyncOpenAI:
+    """
+    Shared async OpenAI-compatible client. All AI calls go through one pooled
+    HTTP client so connections to the provider are reused across requests.
+    """
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=settings.AI_API_KEY,
+            base_url=settings.AI_BASE_URL,
+            # Retries are handled by chat_completion so they go through the rate limiter
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.AI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.AI_MAX_KEEPALIVE_CONNECTIONS
+                ),
+                timeout=httpx.Timeout(settings.AI_REQUEST_TIMEOUT, connect=settings.AI_CONNECT_TIMEOUT)
+            )
+        )
+    return _client
+
+
+def get_rate_limiter() -> LLMRateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = LLMRateLimiter()
+    return _limiter
+
+
+async def close_llm_client():
+    """Close the pooled HTTP connections"""
+    global _client, _limiter
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _limiter = None
+
+
+def get_task_route(task: Optional[str]) -> AITaskRoute:
+    """Routing entry for an AI task (see settings.AI_TASK_ROUTES)"""
+    route = settings.AI_TASK_ROUTES.get(task) if task else None
+    return route or AITaskRoute()
+
+
+def task_model(task: Optional[str]) -> str:
+    """Model that serves `task`; part of LLM cache keys"""
+    return get_task_route(task).model or settings.AI_DEFAULT_MODEL
+
+
+def _record_task_usage(task: str, response, elapsed_ms: float):
+    """Per-task latency and token usage, to base routing decisions on"""
+    metrics.counter(f"llm_task_{task}_requests").inc()
+    metrics.latency(f"llm_task_{task}_ms").observe(elapsed_ms)
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        metrics.counter(f"llm_task_{task}_prompt_tokens").inc(usage.prompt_tokens or 0)
+        metrics.counter(f"llm_task_{task}_completion_tokens").inc(usage.completion_tokens or 0)
+
+
+def task_stats() -> List[Dict[str, Any]]:
+    """Routing and usage of every configured task since the process started"""
+    stats = []
+    for task in list(settings.AI_TASK_ROUTES) + ["default"]:
+        requests = metrics.counter(f"llm_task_{task}_requests").value
+        if task == "default" and not requests:
+            continue
+        latency = metrics.latency(f"llm_task_{task}_ms")
+        # Calls without a task are recorded as "default"
+        route_name = None if task == "default" else task
+        route = get_task_route(route_name)
+        stats.append({
+            "task": task,
+            "model": task_model(route_name),
+            "max_tokens": route.max_tokens,
+            "temperature": route.temperature,
+            "requests": requests,
+            "latency_p50_ms": latency.percentile(50),
+            "latency_p95_ms": latency.percentile(95),
+            "prompt_tokens": metrics.counter(f"llm_task_{task}_prompt_tokens").value,
+            "completion_tokens": metrics.counter(f"llm_task_{task}_completion_tokens").value,
+        })
+    return stats
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    # Includes timeouts
+    return isinstance(error, APIConnectionError)
+
+
+def _call_timeout(timeout: Optional[float]) -> float:
+    """Per-call timeout, shortened to fit the current deadline"""
+    check_deadline()
+    timeout = timeout or settings.AI_REQUEST_TIMEOUT
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
+
+
+def _hedge_delay() -> Optional[float]:
+    """Seconds to wait before hedging, from the observed request latency percentile"""
+    if not settings.AI_HEDGE_ENABLED:
+        return None
+    tracker = metrics.latency("llm_request_ms")
+    if tracker.count < settings.AI_HEDGE_MIN_SAMPLES:
+        return None
+    return max(settings.AI_HEDGE_MIN_DELAY, tracker.percentile(settings.AI_HEDGE_PERCENTILE) / 1000)
+
+
+def _release_abandoned(limiter: LLMRateLimiter, acquire: asyncio.Future):
+    """Give back a slot that was granted to a wait which had already given up"""
+    if not acquire.cancelled() and acquire.exception() is None:
+        task = asyncio.ensure_future(limiter.release(acquire.result(), succeeded=False))
+        _pending_releases.add(task)
+        task.add_done_callback(_pending_releases.discard)
+
+
+async def _acquire(limiter: LLMRateLimiter, timeout: Optional[float]) -> int:
+    """
+    Wait at most timeout seconds for the rate limiter. The acquire runs
+    shielded, so a slot it obtains just as the wait times out or the attempt
+    is cancelled is released instead of leaking.
+    """
+    acquire = asyncio.ensure_future(limiter.acquire())
+    try:
+        return await asyncio.wait_for(asyncio.shield(acquire), timeout=timeout)
+    except BaseException:
+        acquire.cancel()
+        acquire.add_done_callback(lambda future: _release_abandoned(limiter, future))
+        raise
+
+
+async def _attempt(limiter: LLMRateLimiter, model: str, messages: List[Dict[str, str]],
+                   timeout: Optional[float], kwargs: Dict[str, Any]):
+    """
+    One rate-limited completion request. Its latency is recorded in
+    llm_request_ms unless it is cancelled, so hedges that lost do not skew
+    the hedge delay.
+    """
+    client = get_llm_client()
+    left = remaining()
+    try:
+        epoch = await _acquire(limiter, None if left is None else max(0.0, left))
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("Request deadline exceeded while waiting for the AI rate limiter")
+
+    started = time.perf_counter()
+    error: Optional[Exception] = None
+    response = None
+    try:
+        raw = await client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=messages,
+            timeout=_call_timeout(timeout),
+            **kwargs
+        )
+        limiter.observe_headers(raw.headers)
+        response = raw.parse()
+        metrics.latency("llm_request_ms").observe((time.perf_counter() - started) * 1000)
+        return response
+    except (APIStatusError, APIConnectionError) as e:
+        error = e
+        metrics.latency("llm_request_ms").observe((time.perf_counter() - started) * 1000)
+        raise
+    finally:
+        await limiter.release(
+            epoch,
+            overloaded=error is not None and _is_retryable(error),
+            succeeded=response is not None
+        )
+
+
+async def _hedged_attempt(limiter: LLMRateLimiter, model: str, messages: List[Dict[str, str]],
+                          timeout: Optional[float], kwargs: Dict[str, Any]):
+    """
+    Run an attempt; if it is still pending after the hedge delay, send an
+    identical second request and return whichever succeeds first. The
+    other one is cancelled.
+    """
+    delay = _hedge_delay()
+    primary = asyncio.create_task(_attempt(limiter, model, messages, timeout, kwargs))
+    if delay is None:
+        return await primary
+
+    pending = {primary}
+    hedge = None
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if not done:
+            metrics.counter("llm_hedged_requests").inc()
+            hedge = asyncio.create_task(_attempt(limiter, model, messages, timeout, kwargs))
+            pending.add(hedge)
+
+        error: Optional[BaseException] = None
+        while True:
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        metrics.counter("llm_hedge_wins").inc()
+                    return task.result()
+                error = error or task.exception()
+            if not pending:
+                raise error
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def chat_completion(
+    prompt: Union[str, List[Dict[str, str]]],
+    model: Optional[str] = None,
+    timeout: Optional[float] = None,
+    task: Optional[str] = None,
+    **kwargs: Any
+) -> str:
+    """
+    Run a chat completion and return the stripped message content.
+
+    Requests pass through the shared rate limiter; 429, 5xx and connection
+    errors are retried up to AI_MAX_RETRIES times with jittered backoff.
+    Timeouts and retries never outlast the current deadline (see
+    app.core.deadline), and with AI_HEDGE_ENABLED a slow request is hedged
+    with a second identical one.
+
+    Args:
+        prompt: A user prompt, or a full list of chat messages
+        model: Model name at the AI provider (defaults to the task's model)
+        timeout: Per-call timeout in seconds (defaults to the task's timeout,
+            then settings.AI_REQUEST_TIMEOUT)
+        task: Name of the AI task, selecting the model and parameters from
+            settings.AI_TASK_ROUTES and the metrics the call is recorded under
+        **kwargs: Extra completion parameters (temperature, max_tokens, ...),
+            overriding the task's
+    """
+    messages = [{"role": "user", "content": prompt}] if isinstance(prompt, str) else prompt
+    limiter = get_rate_limiter()
+    route = get_task_route(task)
+    model = model or task_model(task)
+    timeout = timeout or route.timeout
+    for name in ("max_tokens", "temperature"):
+        if getattr(route, name) is not None:
+            kwargs.setdefault(name, getattr(route, name))
+    started = time.perf_counter()
+
+    for attempt in range(settings.AI_MAX_RETRIES + 1):
+        check_deadline()
+        try:
+            response = await _hedged_attempt(limiter, model, messages, timeout, kwargs)
+            _record_task_usage(task or "default", response, (time.perf_counter() - started) * 1000)
+            return (response.choices[0].message.content or "").strip()
+        except (APIStatusError, APIConnectionError) as e:
+            error = e
+
+        retry_after = None
+        if isinstance(error, APIStatusError):
+            if error.status_code == 429:
+                metrics.counter("llm_rate_limited").inc()
+            elif error.status_code >= 500:
+                metrics.counter("llm_server_errors").inc()
+            limiter.observe_headers(error.response.headers)
+            retry_after = parse_duration(error.response.headers.get("retry-after"))
+        if not _is_retryable(error) or attempt == settings.AI_MAX_RETRIES:
+            raise error
+
+        delay = backoff_delay(attempt, retry_after)
+        left = remaining()
+        if left is not None and delay >= left:
+            raise error
+        metrics.counter("llm_retries").inc()
+        logger.warning(f"AI request failed ({str(error)}), retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
@@ -0,0 +1,163 @@
+"""
+Two-tier cache of parsed LLM results.
+
+Entries are keyed by (model, prompt template version, SHA-256 of the input
+text). Lookups go to an in-process LRU first, then to the `llm_cache`
+collection, whose TTL index expires entries after LLM_CACHE_TTL_SECONDS.
+Bumping a prompt version in app/services/ai.py makes old entries
+unreachable; invalidate_prompt_version() removes them right away from the
+collection and this process's LRU. Other processes (API replicas, ingestion
+workers) keep serving their in-memory copies for at most
+LLM_CACHE_MEMORY_TTL_SECONDS.
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Optional, Tuple
+import copy
+import hashlib
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Bounded in-process map of cache key -> (prompt_version, value). Entries
+    expire `ttl` seconds after they were set (0 keeps them until evicted).
+    """
+
+    def __init__(self, max_size: int, ttl: float = 0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] is not None and entry[2] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry[1])
+
+    def set(self, key: str, prompt_version: str, value: Any):
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._entries[key] = (prompt_version, copy.deepcopy(value), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, prompt_version: str) -> int:
+        with self._lock:
+            keys = [key for key, (version, _, _) in self._entries.items() if version == prompt_version]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+memory_cache = LRUCache(settings.LLM_CACHE_MEMORY_SIZE, settings.LLM_CACHE_MEMORY_TTL_SECONDS)
+
+
+def cache_key(model: str, prompt_version: str, input_text: str) -> str:
+    input_sha256 = hashlib.sha256(input_text.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{model}\0{prompt_version}\0{input_sha256}".encode("utf-8")).hexdigest()
+
+
+async def get_cached_response(model: str, prompt_version: str, input_text: str) -> Optional[Any]:
+    """Return a cached result, or None on a miss (or when caching is disabled)"""
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+
+    key = cache_key(model, prompt_version, input_text)
+    value = memory_cache.get(key)
+    if value is not None:
+        metrics.counter("llm_cache_memory_hits").inc()
+        return value
+
+    try:
+        db = await get_database()
+        document = await db.llm_cache.find_one({"_id": key, "expires_at": {"$gt": datetime.now(UTC)}})
+    except Exception as e:
+        logger.error(f"Error reading LLM cache: {str(e)}")
+        document = None
+
+    if document is None:
+        metrics.counter("llm_cache_misses").inc()
+        return None
+
+    metrics.counter("llm_cache_db_hits").inc()
+    memory_cache.set(key, prompt_version, document["value"])
+    return document["value"]
+
+
+async def set_cached_response(model: str, prompt_version: str, input_text: str, value: Any):
+    """Store a parsed result in both tiers. Only cache results that parsed successfully."""
+    if not settings.LLM_CACHE_ENABLED:
+        return
+
+    key = cache_key(model, prompt_version, input_text)
+    memory_cache.set(key, prompt_version, value)
+
+    now = datetime.now(UTC)
+    try:
+        db = await get_database()
+        await db.llm_cache.replace_one(
+            {"_id": key},
+            {
+                "model": model,
+                "prompt_version": prompt_version,
+                "input_sha256": hashlib.sha256(input_text.encode("utf-8")).hexdigest(),
+                "value": value,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=settings.LLM_CACHE_TTL_SECONDS)
+            },
+            upsert=True
+        )
+    except Exception as e:
+        logger.error(f"Error writing LLM cache: {str(e)}")
+
+
+async def invalidate_prompt_version(prompt_version: str) -> Dict[str, int]:
+    """
+    Drop every cached result produced by a prompt template version. Other
+    processes stop serving it once their memory entries expire.
+    """
+    memory_deleted = memory_cache.invalidate(prompt_version)
+    db = await get_database()
+    result = await db.llm_cache.delete_many({"prompt_version": prompt_version})
+    logger.info(f"Invalidated LLM cache for prompt version {prompt_version}: {result.deleted_count} entries")
+    return {"memory_deleted": memory_deleted, "deleted": result.deleted_count}
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit counts and hit rate since process start"""
+    memory_hits = metrics.counter("llm_cache_memory_hits").value
+    db_hits = metrics.counter("llm_cache_db_hits").value
+    misses = metrics.counter("llm_cache_misses").value
+    lookups = memory_hits + db_hits + misses
+    return {
+        "memory_hits": memory_hits,
+        "db_hits": db_hits,
+        "misses": misses,
+        "hit_rate": (memory_hits + db_hits) / lookups if lookups else 0.0,
+        "memory_entries": len(memory_cache)
+    }
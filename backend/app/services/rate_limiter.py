@@ -0,0 +1,162 @@
+"""
+Client-side flow control for the AI provider.
+
+A token bucket caps the request rate and an AIMD (additive increase,
+multiplicative decrease) limiter adapts the number of concurrent requests:
+every success raises the limit by 1/limit, every 429 or 5xx halves it.
+Rate-limit headers returned by the provider pause the bucket until the
+advertised reset time.
+"""
+from typing import Mapping, Optional
+import asyncio
+import logging
+import random
+import re
+import time
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a rate-limit duration ("2", "1.5s", "20ms", "6m0s") into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the provider's Retry-After"""
+    ceiling = min(settings.AI_RETRY_MAX_DELAY, settings.AI_RETRY_BASE_DELAY * (2 ** attempt))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, settings.AI_RETRY_MAX_DELAY))
+    return delay
+
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for a while (provider asked us to back off)"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        # The lock is FIFO, so waiters are served in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on the number of requests in flight"""
+
+    def __init__(self, max_limit: int, min_limit: int = 1, backoff_ratio: float = 0.5):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.backoff_ratio = backoff_ratio
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        # Incremented on every decrease; overloads of requests started before
+        # the last decrease are ignored so a burst of 429s halves the limit once
+        self.epoch = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> int:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            return self.epoch
+
+    async def release(self, epoch: int, overloaded: bool = False, succeeded: bool = True):
+        async with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                if epoch == self.epoch:
+                    self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                    self.epoch += 1
+                    logger.warning(f"AI provider overloaded, concurrency limit lowered to {int(self.limit)}")
+            elif succeeded:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class LLMRateLimiter:
+    """Token bucket plus adaptive concurrency, shared by all AI calls of a process"""
+
+    def __init__(self):
+        self.bucket = TokenBucket(settings.AI_REQUESTS_PER_SECOND, settings.AI_BURST)
+        self.concurrency = AdaptiveConcurrencyLimiter(settings.AI_MAX_IN_FLIGHT, settings.AI_MIN_IN_FLIGHT)
+        self.waiting = 0
+        self._publish()
+
+    def _publish(self):
+        metrics.gauge("llm_concurrency_limit").set(int(self.concurrency.limit))
+        metrics.gauge("llm_in_flight").set(self.concurrency.in_flight)
+        metrics.gauge("llm_queue_depth").set(self.waiting)
+
+    async def acquire(self) -> int:
+        """Wait for a token and a concurrency slot; returns a token for release()"""
+        started = time.perf_counter()
+        self.waiting += 1
+        self._publish()
+        try:
+            await self.bucket.acquire()
+            epoch = await self.concurrency.acquire()
+        finally:
+            self.waiting -= 1
+        metrics.latency("llm_queue_wait_ms").observe((time.perf_counter() - started) * 1000)
+        self._publish()
+        return epoch
+
+    async def release(self, epoch: int, overloaded: bool = False, succeeded: bool = True):
+        await self.concurrency.release(epoch, overloaded, succeeded)
+        self._publish()
+
+    def observe_headers(self, headers: Optional[Mapping[str, str]]):
+        """Honor Retry-After and exhausted x-ratelimit-remaining-* headers"""
+        if not headers:
+            return
+        pause = parse_duration(headers.get("retry-after"))
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is not None and remaining.strip() == "0":
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset is not None:
+                    pause = max(pause or 0.0, reset)
+        if pause:
+            pause = min(pause, settings.AI_RETRY_MAX_DELAY)
+            logger.info(f"AI provider rate limit reached, pausing requests for {pause:.1f}s")
+            self.bucket.pause(pause)
@@ -0,0 +1,187 @@
+"""
+Content-addressed index of uploaded resumes.
+
+Each document in `resume_blobs` is keyed by the SHA-256 of the PDF bytes and
+points at the GridFS file holding them, together with the cached extraction
+and analysis results, so re-uploads of the same PDF skip parsing, LLM calls
+and a second GridFS upload.
+
+Each blob counts the candidates using its file in `refs`. References are
+taken and dropped with atomic increments, and the blob is only removed (and
+its file deleted) by a conditional delete while the count is zero, so an
+upload reusing the file concurrently with the deletion of its last
+candidate either keeps the file alive or finds the blob gone and stores
+its own copy.
+
+Stored analyses are keyed on the models and prompt versions that produced
+them as well as the job scope, so changes to AI_TASK_ROUTES and prompt
+version bumps take effect for re-uploads, and invalidate_resume_analyses()
+drops them together with the LLM cache entries of a prompt version.
+"""
+from datetime import datetime, UTC
+from typing import Any, Dict, List, Optional
+import hashlib
+import logging
+
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.mongodb import get_database
+from app.services.ai import resume_analysis_versions
+
+logger = logging.getLogger(__name__)
+
+
+def analysis_scope(job_id: str) -> str:
+    """
+    Key under which analysis results are cached, per RESUME_DEDUP_SCOPE.
+    Analyses scored against the job description are always per job. The
+    key ends in a digest of resume_analysis_versions(), so analyses made by
+    other models or prompt versions are never reused.
+    """
+    if settings.RESUME_DEDUP_SCOPE == "job" or settings.AI_PROMPT_JOB_CONTEXT:
+        scope = f"job:{job_id}"
+    else:
+        scope = "global"
+    versions = hashlib.sha256("\0".join(resume_analysis_versions()).encode("utf-8")).hexdigest()[:16]
+    return f"{scope}:{versions}"
+
+
+async def get_resume_blob(sha256: str) -> Optional[dict]:
+    """Look up a previously stored resume by content hash"""
+    db = await get_database()
+    return await db.resume_blobs.find_one({"_id": sha256})
+
+
+def cached_analysis(blob: Optional[dict], scope: str) -> Optional[Dict[str, Any]]:
+    """Return the cached {basic_info, analysis} for a scope, if any"""
+    if not blob:
+        return None
+    return (blob.get("analyses") or {}).get(scope)
+
+
+def record_lookup(hit: bool):
+    """Count deduplication hits and misses"""
+    metrics.counter("resume_dedup_hits" if hit else "resume_dedup_misses").inc()
+
+
+async def register_resume_blob(sha256: str, file_id: str, filename: str, size: int) -> dict:
+    """
+    Record the GridFS file holding a resume and take a reference on it. If
+    another upload of the same bytes registered first, its document is
+    returned (with the reference taken) and the caller should use that file
+    and delete its own.
+    """
+    db = await get_database()
+    now = datetime.now(UTC)
+    return await db.resume_blobs.find_one_and_update(
+        {"_id": sha256},
+        {
+            "$setOnInsert": {
+                "file_id": file_id,
+                "filename": filename,
+                "size": size,
+                "analyses": {},
+                "hits": 0,
+                "created_at": now
+            },
+            "$set": {"updated_at": now},
+            "$inc": {"refs": 1}
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def acquire_resume_blob(sha256: str) -> Optional[dict]:
+    """
+    Take a reference on a stored resume for a new candidate. Returns None
+    when the blob was removed since it was looked up; the caller then
+    stores the file again.
+    """
+    db = await get_database()
+    return await db.resume_blobs.find_one_and_update(
+        {"_id": sha256},
+        {"$inc": {"refs": 1}, "$set": {"updated_at": datetime.now(UTC)}},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def release_resume_file(sha256: Optional[str], file_id: str) -> bool:
+    """
+    Drop a reference to a resume file, after its candidate was deleted or
+    not created. Returns True when nothing uses the file any more, so the
+    caller deletes it from GridFS.
+
+    Files stored without deduplication, and blobs registered before
+    reference counting (without refs), fall back to looking for another
+    candidate with the file.
+    """
+    db = await get_database()
+    blob_filter = {"_id": sha256, "file_id": file_id}
+    if sha256:
+        blob = await db.resume_blobs.find_one_and_update(
+            {**blob_filter, "refs": {"$gt": 0}},
+            {"$inc": {"refs": -1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if blob and blob["refs"] > 0:
+            return False
+
+    if await db.candidates.count_documents({"resume_file_id": file_id}, limit=1):
+        return False
+    if not sha256:
+        return True
+
+    result = await db.resume_blobs.delete_one({**blob_filter, "refs": {"$not": {"$gt": 0}}})
+    if result.deleted_count:
+        return True
+    # Either the file has no blob, or an upload took a reference meanwhile
+    return not await db.resume_blobs.count_documents(blob_filter, limit=1)
+
+
+async def save_resume_analysis(sha256: str, scope: str, basic_info: Dict[str, Any], analysis: Dict[str, Any]):
+    """Cache the extraction and analysis results of a resume"""
+    db = await get_database()
+    await db.resume_blobs.update_one(
+        {"_id": sha256},
+        {
+            "$set": {
+                f"analyses.{scope}": {
+                    "basic_info": basic_info,
+                    "analysis": analysis,
+                    "prompt_versions": _prompt_versions(),
+                    "created_at": datetime.now(UTC)
+                },
+                "updated_at": datetime.now(UTC)
+            }
+        }
+    )
+
+
+def _prompt_versions() -> List[str]:
+    return [version.rsplit(":", 1)[1] for version in resume_analysis_versions()]
+
+
+async def invalidate_resume_analyses(prompt_version: str) -> int:
+    """
+    Drop stored analyses produced with a prompt version; the files stay.
+    Returns the number of resumes that had one.
+    """
+    db = await get_database()
+    result = await db.resume_blobs.update_many(
+        {"analyses": {"$exists": True}},
+        [{"$set": {"analyses": {"$arrayToObject": {"$filter": {
+            "input": {"$objectToArray": "$analyses"},
+            "cond": {"$not": [{"$in": [prompt_version, {"$ifNull": ["$$this.v.prompt_versions", []]}]}]}
+        }}}}}]
+    )
+    logger.info(f"Invalidated stored resume analyses for prompt version {prompt_version}: {result.modified_count} resumes")
+    return result.modified_count
+
+
+async def increment_resume_blob_hits(sha256: str):
+    db = await get_database()
+    await db.resume_blobs.update_one({"_id": sha256}, {"$inc": {"hits": 1}})
+
@@ -0,0 +1,220 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, Dict, Optional
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import time
+
+import PyPDF2
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.text_compaction import clean_pages, compact_pages, fit_to_budget
+
+logger = logging.getLogger(__name__)
+
+# Log extraction latency percentiles every N parsed documents
+LATENCY_LOG_INTERVAL = 50
+
+
+class ResumeParseError(Exception):
+    """Raised when a PDF could not be parsed within the configured limits"""
+
+
+@dataclass(frozen=True)
+class ParsedResume:
+    """
+    A resume PDF parsed once and shared by every pipeline stage
+    (contact extraction, skill analysis, storage).
+    """
+    text: str
+    page_count: int
+    sha256: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    filename: Optional[str] = None
+    # Longer text of a resume that did not fit the prompt budget, for the
+    # chunked analysis; None when `text` already holds the whole resume
+    full_text: Optional[str] = None
+
+
+def parse_resume(
+    content: bytes,
+    filename: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    token_budget: Optional[int] = None,
+    compact: bool = False,
+    full_token_budget: Optional[int] = None
+) -> ParsedResume:
+    """
+    Parse PDF bytes in memory and extract the text of every page
+    (or of the first max_pages pages).
+
+    With compact=True the text is cleaned up for the LLM (see
+    app.services.text_compaction) and cut to token_budget tokens; the
+    estimated token counts before and after are recorded in the metadata.
+    When that cut the text and full_token_budget is larger, up to
+    full_token_budget tokens of the compacted text are kept in full_text.
+
+    Unreadable PDFs produce an empty text rather than an error so that the
+    candidate can still be stored and reviewed manually.
+    """
+    sha256 = hashlib.sha256(content).hexdigest()
+    pages = []
+    metadata: Dict[str, Any] = {}
+    try:
+        pdf_reader = PyPDF2.PdfReader(BytesIO(content))
+        page_count = len(pdf_reader.pages)
+        for page in pdf_reader.pages[:max_pages]:
+            pages.append(page.extract_text() or "")
+        if pdf_reader.metadata:
+            metadata = {
+                key.lstrip("/").lower(): str(value)
+                for key, value in pdf_reader.metadata.items()
+                if value is not None
+            }
+        if len(pages) < page_count:
+            metadata["pages_parsed"] = len(pages)
+            logger.warning(f"Only parsed {len(pages)} of {page_count} pages of {filename or sha256}")
+    except Exception as e:
+        logger.error(f"Error extracting text from PDF {filename or sha256}: {str(e)}")
+        return ParsedResume(text="", page_count=0, sha256=sha256, metadata={}, filename=filename)
+
+    full_text = None
+    if compact:
+        text, stats = compact_pages(pages, token_budget)
+        metadata.update(stats)
+        if token_budget and full_token_budget and full_token_budget > token_budget:
+            cleaned = clean_pages(pages)
+            if cleaned and cleaned + "\n" != text:
+                full_text = fit_to_budget(cleaned, full_token_budget) + "\n"
+    else:
+        text = "\n".join(pages) + "\n" if pages else ""
+
+    return ParsedResume(
+        text=text,
+        page_count=page_count,
+        sha256=sha256,
+        metadata=metadata,
+        filename=filename,
+        full_text=full_text
+    )
+
+
+def _limit_memory(limit: int):
+    """Process pool initializer: cap the address space of a parser process"""
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        # Not supported on this platform; parsing still runs without a ceiling
+        logger.warning(f"Could not set PDF parser memory limit: {str(e)}")
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PDF_PARSE_WORKERS,
+            # Never fork the API process (event loop, Mongo client threads)
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_limit_memory,
+            initargs=(settings.PDF_PARSE_MEMORY_LIMIT,)
+        )
+    return _pool
+
+
+def _reset_pool(pool: ProcessPoolExecutor):
+    """Kill the processes of a pool (e.g. one stuck on a pathological PDF) and discard it"""
+    global _pool
+    if _pool is pool:
+        _pool = None
+    # ProcessPoolExecutor cannot cancel a running call; terminating its workers is the only way
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_parser_pool():
+    """Stop the PDF parsing processes"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _record_latency(elapsed_ms: float):
+    tracker = metrics.latency("pdf_extraction_ms")
+    tracker.observe(elapsed_ms)
+    if tracker.count % LATENCY_LOG_INTERVAL == 0:
+        summary = tracker.summary()
+        logger.info(
+            f"PDF extraction latency over last {LATENCY_LOG_INTERVAL}+ documents: "
+            f"p50={summary['p50']:.0f}ms p95={summary['p95']:.0f}ms p99={summary['p99']:.0f}ms"
+        )
+
+
+def _record_compaction(resume: ParsedResume):
+    if "tokens_before" not in resume.metadata:
+        return
+    saved = resume.metadata["tokens_before"] - resume.metadata["tokens_after"]
+    metrics.counter("resume_tokens_saved").inc(saved)
+    logger.info(
+        f"Compacted {resume.filename or resume.sha256[:12]}: "
+        f"~{resume.metadata['tokens_before']} -> ~{resume.metadata['tokens_after']} tokens ({saved} saved)"
+    )
+
+
+async def parse_resume_async(content: bytes, filename: Optional[str] = None) -> ParsedResume:
+    """
+    Parse a resume off the event loop, in the PDF parsing process pool.
+
+    A parse that exceeds PDF_PARSE_TIMEOUT, or whose process dies (e.g. by
+    hitting PDF_PARSE_MEMORY_LIMIT), is killed and raises ResumeParseError.
+    """
+    started = time.perf_counter()
+    args = (
+        content,
+        filename,
+        settings.PDF_MAX_PAGES,
+        settings.RESUME_TOKEN_BUDGET,
+        settings.RESUME_COMPACTION_ENABLED,
+        settings.RESUME_CHUNK_TOKENS * settings.RESUME_MAX_CHUNKS if settings.RESUME_CHUNKING_ENABLED else None
+    )
+    if settings.PDF_PARSE_WORKERS <= 0:
+        resume = await asyncio.to_thread(parse_resume, *args)
+        _record_latency((time.perf_counter() - started) * 1000)
+        _record_compaction(resume)
+        return resume
+
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            resume = await asyncio.wait_for(
+                loop.run_in_executor(pool, parse_resume, *args),
+                timeout=settings.PDF_PARSE_TIMEOUT
+            )
+            break
+        except asyncio.TimeoutError:
+            metrics.counter("pdf_extraction_timeouts").inc()
+            logger.error(f"PDF parsing of {filename} exceeded {settings.PDF_PARSE_TIMEOUT}s, killing parser")
+            _reset_pool(pool)
+            raise ResumeParseError(f"PDF parsing timed out after {settings.PDF_PARSE_TIMEOUT}s")
+        except BrokenProcessPool:
+            # Either this document killed its process, or another document's
+            # timeout tore the pool down under us: retry once on a fresh pool
+            _reset_pool(pool)
+            if attempt:
+                metrics.counter("pdf_extraction_crashes").inc()
+                raise ResumeParseError("PDF parser process crashed (memory limit exceeded?)")
+
+    _record_latency((time.perf_counter() - started) * 1000)
+    _record_compaction(resume)
+    return resume
@@ -0,0 +1,226 @@
+"""
+Parsing and validation of JSON returned by the LLM.
+
+Model output is usually valid JSON, sometimes wrapped in a code fence or
+followed by a sentence, and occasionally cut off by max_tokens or written
+with Python literals. extract_json() takes the fast orjson path first and
+only repairs the text when that fails; parse_structured() then validates the
+result against a pydantic schema. complete_json() runs a completion and, if
+the response still does not validate, makes one retry that tells the model
+what was wrong.
+"""
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+import logging
+import re
+
+import orjson
+from pydantic import BaseModel, ValidationError
+
+from app.core.metrics import metrics
+from app.services.llm import chat_completion
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+_FENCE = re.compile(r"```[a-zA-Z]*[ \t]*\n?(.*?)(?:```|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+# Parts of a truncated response dropped one at a time until it parses
+MAX_REPAIR_CUTS = 20
+
+
+class StructuredOutputError(ValueError):
+    """
+    The LLM response could not be parsed or did not match the schema.
+    `data` holds the parsed JSON when only validation failed, so callers
+    can salvage the parts that are valid.
+    """
+
+    def __init__(self, message: str, text: str = "", data: Any = None):
+        super().__init__(message)
+        self.text = text
+        self.data = data
+
+
+def _strip_fences(text: str) -> str:
+    match = _FENCE.search(text)
+    return match.group(1) if match else text
+
+
+def _scan(text: str) -> Tuple[List[str], bool, Optional[int], List[int]]:
+    """
+    Walk the text outside of strings.
+
+    Returns:
+        (open brackets, inside a string at the end, end of the first complete
+        top-level value, positions of commas and colons)
+    """
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    separators = []
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(char)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return stack, False, index + 1, separators
+        elif char in ",:":
+            separators.append(index)
+    return stack, in_string, None, separators
+
+
+def _replace_outside_strings(text: str) -> str:
+    """Python literals to JSON, and single-quoted strings when no double quotes are used"""
+    if '"' not in text:
+        text = text.replace("'", '"')
+    return re.sub(
+        r'"(?:\\.|[^"\\])*"|\b(True|False|None)\b',
+        lambda match: _PYTHON_LITERALS[match.group(1)] if match.group(1) else match.group(0),
+        text
+    )
+
+
+def _loads(text: str) -> Any:
+    return orjson.loads(_TRAILING_COMMA.sub(r"\1", text))
+
+
+def _close_truncated(text: str) -> Any:
+    """Close a response cut off mid-way, dropping its last incomplete entry if needed"""
+    for _ in range(MAX_REPAIR_CUTS):
+        stack, in_string, _, separators = _scan(text)
+        candidate = text + ('"' if in_string else "")
+        candidate = candidate.rstrip().rstrip(",")
+        if candidate.endswith(":"):
+            candidate += " null"
+        candidate += "".join(_CLOSERS[opener] for opener in reversed(stack))
+        try:
+            return _loads(candidate)
+        except orjson.JSONDecodeError:
+            if not separators:
+                raise
+            # Drop everything from the last comma or colon and try again
+            text = text[:separators[-1]]
+    raise orjson.JSONDecodeError("Could not repair truncated JSON", text, 0)
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse the JSON value in an LLM response.
+
+    Handles code fences, text before or after the JSON, trailing commas,
+    Python literals and responses truncated mid-object.
+
+    Raises:
+        StructuredOutputError: No JSON could be recovered
+    """
+    stripped = _strip_fences(text).strip()
+    try:
+        return orjson.loads(stripped)
+    except orjson.JSONDecodeError:
+        pass
+
+    starts = [index for index in (stripped.find("{"), stripped.find("[")) if index >= 0]
+    if not starts:
+        # A bare number with some words around it ("Score: 0.85")
+        numbers = _NUMBER.findall(stripped)
+        if len(numbers) == 1:
+            metrics.counter("structured_output_repairs").inc()
+            return orjson.loads(numbers[0])
+        raise StructuredOutputError("No JSON found in the response", text=text)
+    body = _replace_outside_strings(stripped[min(starts):])
+
+    _, _, end, _ = _scan(body)
+    try:
+        value = _loads(body[:end]) if end else _close_truncated(body)
+    except orjson.JSONDecodeError as e:
+        raise StructuredOutputError(f"Invalid JSON in the response: {str(e)}", text=text)
+    metrics.counter("structured_output_repairs").inc()
+    return value
+
+
+def _describe(error: ValidationError) -> str:
+    """Short description of validation errors, for logs and the retry prompt"""
+    problems = []
+    for item in error.errors()[:5]:
+        location = ".".join(str(part) for part in item["loc"]) or "response"
+        problems.append(f"{location}: {item['msg']}")
+    return "; ".join(problems)
+
+
+def parse_structured(text: str, schema: Type[T]) -> T:
+    """
+    Parse an LLM response and validate it against `schema`.
+
+    Raises:
+        StructuredOutputError: The response is not JSON or does not match
+            the schema
+    """
+    data = extract_json(text)
+    try:
+        return schema.model_validate(data)
+    except ValidationError as e:
+        raise StructuredOutputError(f"Response does not match the schema: {_describe(e)}", text=text, data=data)
+
+
+async def complete_json(
+    messages: List[Dict[str, str]],
+    schema: Type[T],
+    model: Optional[str] = None,
+    task: Optional[str] = None,
+    **kwargs: Any
+) -> T:
+    """
+    Run a chat completion and return its response validated against `schema`.
+
+    If the response cannot be parsed or validated, the model is asked once
+    more with its previous answer and the problem found, which fixes most
+    malformed outputs without redoing the whole request.
+
+    Args:
+        messages: Chat messages of the request
+        schema: Pydantic model the response must validate against
+        model, task, **kwargs: Passed to chat_completion
+
+    Raises:
+        StructuredOutputError: The retry did not validate either
+    """
+    name = task or model or "default"
+    text = await chat_completion(messages, model=model, task=task, **kwargs)
+    try:
+        return parse_structured(text, schema)
+    except StructuredOutputError as e:
+        error = e
+
+    metrics.counter("structured_output_retries").inc()
+    logger.warning(f"Invalid structured output for {name} ({str(error)}), retrying once")
+    retry_messages = messages + [
+        {"role": "assistant", "content": text},
+        {"role": "user", "content": f"That response was invalid: {str(error)}. "
+                                    "Reply with only the corrected JSON, nothing else."}
+    ]
+    text = await chat_completion(retry_messages, model=model, task=task, **kwargs)
+    try:
+        return parse_structured(text, schema)
+    except StructuredOutputError as e:
+        metrics.counter("structured_output_failures").inc()
+        logger.error(f"Invalid structured output for {name} after retry: {str(e)}")
+        # Keep whichever attempt parsed, for callers salvaging partial results
+        if e.data is None:
+            e.data = error.data
+        raise
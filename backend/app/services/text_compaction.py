@@ -0,0 +1,261 @@
+"""
+Deterministic clean-up of extracted resume text before it is sent to the LLM.
+
+PyPDF2 output carries hyphenation breaks, runs of whitespace, headers and
+footers repeated on every page and, for academic CVs, pages of publications.
+compact_pages() normalizes the text, drops repeated page furniture and
+duplicate lines, and then shortens low-value sections (and finally the tail)
+until the text fits a token budget. chunk_text() and outline_sections() split
+and summarize resumes too long for a single prompt.
+"""
+from typing import Dict, List, Optional, Tuple
+import math
+import re
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_HYPHEN_BREAK = re.compile(r"(\w)-\n(\w)")
+_SPACES = re.compile(r"[ \t\f\v\u00a0\u2000-\u200b\u3000]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_DIGITS = re.compile(r"\d+")
+
+# Lines within this many lines of the top or bottom of a page can be furniture
+FURNITURE_WINDOW = 3
+# Shorter lines (bullets, "Python", dates) legitimately repeat and are kept
+MIN_DEDUPE_LENGTH = 25
+
+# Sections shortened first when a resume is over budget, least useful first
+LOW_PRIORITY_SECTIONS = (
+    "references",
+    "publications",
+    "selected publications",
+    "presentations",
+    "conference presentations",
+    "talks",
+    "patents",
+    "posters",
+    "hobbies",
+    "interests",
+    "volunteering",
+)
+# Other headings; any heading ends the section before it
+SECTION_HEADINGS = LOW_PRIORITY_SECTIONS + (
+    "summary",
+    "profile",
+    "experience",
+    "work experience",
+    "professional experience",
+    "employment",
+    "education",
+    "skills",
+    "technical skills",
+    "projects",
+    "certifications",
+    "awards",
+    "languages",
+)
+# Lines kept from the start of a shortened section
+SECTION_KEEP_LINES = 3
+TRUNCATION_MARKER = "[... truncated ...]"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local estimate of the LLM token count: one token per punctuation mark and
+    one per ~5 characters of each word, close to BPE tokenizers for English.
+    """
+    return sum(max(1, math.ceil(len(token) / 5)) for token in _TOKEN.findall(text))
+
+
+def normalize_page(text: str) -> str:
+    """Join hyphenated line breaks, collapse whitespace and strip every line"""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _HYPHEN_BREAK.sub(r"\1\2", text)
+    lines = [_SPACES.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _furniture_key(line: str) -> str:
+    # "Page 2 of 5" and "Page 3 of 5" are the same furniture
+    return _DIGITS.sub("#", line.lower())
+
+
+def drop_page_furniture(pages: List[str]) -> List[str]:
+    """
+    Remove header and footer lines that repeat on most pages. The first
+    occurrence (on the first page) is kept, since it is often the name.
+    """
+    if len(pages) < 2:
+        return pages
+
+    edge_lines = []
+    for page in pages:
+        lines = [line for line in page.split("\n") if line]
+        edges = lines[:FURNITURE_WINDOW] + lines[-FURNITURE_WINDOW:]
+        edge_lines.append({_furniture_key(line) for line in edges})
+
+    threshold = max(2, math.ceil(len(pages) / 2))
+    counts: Dict[str, int] = {}
+    for keys in edge_lines:
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+    furniture = {key for key, count in counts.items() if count >= threshold}
+    if not furniture:
+        return pages
+
+    result = [pages[0]]
+    for page in pages[1:]:
+        lines = [line for line in page.split("\n") if line]
+        result.append("\n".join(
+            line for index, line in enumerate(lines)
+            if not (
+                (index < FURNITURE_WINDOW or index >= len(lines) - FURNITURE_WINDOW)
+                and _furniture_key(line) in furniture
+            )
+        ))
+    return result
+
+
+def dedupe_lines(text: str) -> str:
+    """Drop exact repeats of long lines, keeping the first occurrence"""
+    seen = set()
+    lines = []
+    for line in text.split("\n"):
+        if len(line) >= MIN_DEDUPE_LENGTH:
+            if line in seen:
+                continue
+            seen.add(line)
+        lines.append(line)
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _heading(line: str) -> Optional[str]:
+    """Return the normalized heading name if the line is a known section heading"""
+    name = line.strip().rstrip(":").strip().lower()
+    return name if name in SECTION_HEADINGS else None
+
+
+def _shorten_sections(text: str, budget: int) -> str:
+    """Cut low-priority sections down to their first lines until under budget"""
+    lines = text.split("\n")
+    sections = []  # (priority, start, end) of each low-priority section body
+    current, start = None, None
+    for index in range(len(lines) + 1):
+        heading = _heading(lines[index]) if index < len(lines) else None
+        if start is not None and (heading or index == len(lines)):
+            sections.append((LOW_PRIORITY_SECTIONS.index(current), start, index))
+            current, start = None, None
+        if heading in LOW_PRIORITY_SECTIONS:
+            current, start = heading, index + 1
+
+    for _, start, end in sorted(sections):
+        if estimate_tokens("\n".join(lines)) <= budget:
+            break
+        body = [line for line in lines[start:end] if line]
+        if len(body) <= SECTION_KEEP_LINES:
+            continue
+        kept = body[:SECTION_KEEP_LINES] + [f"[... {len(body) - SECTION_KEEP_LINES} more entries omitted ...]"]
+        lines[start:end] = kept + [""] * (end - start - len(kept))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _truncate(text: str, budget: int) -> str:
+    """Keep whole lines from the top of the text while they fit the budget"""
+    kept = []
+    used = estimate_tokens(TRUNCATION_MARKER)
+    for line in text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept + [TRUNCATION_MARKER])
+
+
+def fit_to_budget(text: str, budget: int) -> str:
+    """Shorten low-priority sections, then truncate the tail, to fit `budget` tokens"""
+    if estimate_tokens(text) <= budget:
+        return text
+    text = _shorten_sections(text, budget)
+    if estimate_tokens(text) <= budget:
+        return text
+    return _truncate(text, budget)
+
+
+def clean_pages(pages: List[str]) -> str:
+    """Normalize the text of each page and drop page furniture and duplicate lines"""
+    cleaned = drop_page_furniture([normalize_page(page) for page in pages])
+    return dedupe_lines("\n".join(page for page in cleaned if page))
+
+
+def compact_pages(pages: List[str], token_budget: Optional[int] = None) -> Tuple[str, Dict[str, int]]:
+    """
+    Compact the extracted text of each page into the text sent to the LLM.
+
+    Returns:
+        (text, {"tokens_before": ..., "tokens_after": ...})
+    """
+    tokens_before = estimate_tokens("\n".join(pages))
+    text = clean_pages(pages)
+    if token_budget:
+        text = fit_to_budget(text, token_budget)
+
+    return text + "\n" if text else "", {"tokens_before": tokens_before, "tokens_after": estimate_tokens(text)}
+
+
+def split_sections(text: str) -> List[str]:
+    """Split text before every section heading; the text before the first heading is a section too"""
+    sections: List[List[str]] = [[]]
+    for line in text.split("\n"):
+        if _heading(line) and any(sections[-1]):
+            sections.append([])
+        sections[-1].append(line)
+    return ["\n".join(lines).strip() for lines in sections if any(lines)]
+
+
+def chunk_text(text: str, chunk_tokens: int) -> List[str]:
+    """
+    Pack whole sections into chunks of at most chunk_tokens tokens. A section
+    that does not fit the current chunk starts the next one, unless it is
+    longer than a chunk: then it is split between lines. A single line longer
+    than a chunk becomes a chunk of its own.
+    """
+    chunks: List[str] = []
+    lines: List[str] = []
+    used = 0
+
+    def flush():
+        nonlocal lines, used
+        if any(lines):
+            chunks.append("\n".join(lines).strip())
+        lines, used = [], 0
+
+    for section in split_sections(text):
+        cost = estimate_tokens(section) + 1
+        if used + cost <= chunk_tokens:
+            lines.extend(section.split("\n") + [""])
+            used += cost
+            continue
+        if cost <= chunk_tokens:
+            flush()
+            lines.extend(section.split("\n") + [""])
+            used += cost
+            continue
+        for line in section.split("\n"):
+            cost = estimate_tokens(line) + 1
+            if used + cost > chunk_tokens:
+                flush()
+            lines.append(line)
+            used += cost
+        lines.append("")
+    flush()
+    return chunks
+
+
+def outline_sections(text: str, keep_lines: int = SECTION_KEEP_LINES) -> str:
+    """The first lines of every section, e.g. the name and headline, each heading and the latest roles"""
+    outline = []
+    for section in split_sections(text):
+        lines = [line for line in section.split("\n") if line]
+        keep = keep_lines + 1 if _heading(lines[0]) else keep_lines
+        outline.append("\n".join(lines[:keep] + (["..."] if len(lines) > keep else [])))
+    return "\n\n".join(outline)
@@ -7,6 +7,7 @@ from io import BytesIO
 from PyPDF2 import PdfWriter, PdfReader
 from app.services.candidates import upload_resume, process_pdf_file
 from app.services.ai import extract_resume_info, analyze_resume
+from app.services.resume_parser import parse_resume
 from app.models.database import User
 
 # Mock user for testing
@@ -26,7 +27,8 @@ TEST_JOB_ID = "507f1f77bcf86cd799439012"
 @pytest.mark.asyncio
 async def test_pdf_extraction(test_pdf_path):
     """Test PDF text extraction"""
-    info = await extract_resume_info(test_pdf_path)
+    with open(test_pdf_path, 'rb') as pdf_file:
+        info = await extract_resume_info(parse_resume(pdf_file.read()))
     print("\nExtracted Information:")
     print(f"Name: {info.get('name')}")
     print(f"Email: {info.get('email')}")
@@ -42,7 +44,8 @@ async def test_pdf_extraction(test_pdf_path):
 @pytest.mark.asyncio
 async def test_resume_analysis(test_pdf_path):
     """Test resume analysis and scoring"""
-    analysis = await analyze_resume(test_pdf_path)
+    with open(test_pdf_path, 'rb') as pdf_file:
+        analysis = await analyze_resume(parse_resume(pdf_file.read()))
     print("\nResume Analysis:")
     print(f"Score: {analysis.get('score')}")
     print("Skills:")
@@ -0,0 +1,174 @@
+"""
+Standalone resume ingestion worker.
+
+Pulls queued ingestion jobs from MongoDB, runs PDF extraction and AI analysis
+and writes the candidates. Run as many of these as needed, on any host that
+can reach the database:
+
+    python -m app.workers.ingest --concurrency 4
+
+The API runs one of these itself, with concurrency 1, unless
+INGESTION_INLINE_WORKER=false; set that when dedicated workers are used.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+from typing import Optional
+
+from app.core.config import settings
+from app.core.indexes import ensure_indexes
+from app.core.mongodb import connect_to_mongo
+from app.services.ingestion import (
+    WORKER_ID,
+    claim_ingestion_job,
+    recover_stale_ingestion_jobs,
+    release_ingestion_job,
+    renew_ingestion_lease,
+    run_ingestion_job,
+)
+from app.services.llm import close_llm_client
+from app.services.resume_parser import shutdown_parser_pool
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionWorker:
+    def __init__(self, worker_id: str = WORKER_ID, concurrency: Optional[int] = None):
+        self.worker_id = worker_id
+        self.concurrency = max(1, concurrency or settings.INGESTION_WORKER_CONCURRENCY)
+        self.stopping = asyncio.Event()
+        self.wakeup = asyncio.Event()
+        self.running: set[asyncio.Task] = set()
+
+    def stop(self):
+        """Stop claiming new jobs; in-flight jobs are allowed to finish"""
+        if not self.stopping.is_set():
+            logger.info(f"Worker {self.worker_id} shutting down")
+            self.stopping.set()
+
+    def wake(self):
+        """Poll the queue now instead of at the next poll interval, e.g. when a job was queued"""
+        self.wakeup.set()
+
+    async def _keep_lease(self, ingestion_job: dict, job_task: asyncio.Task):
+        """Renew the lease while the job runs; cancel the job if the lease is lost"""
+        interval = max(1.0, settings.INGESTION_LEASE_SECONDS / 3)
+        while not job_task.done():
+            await asyncio.sleep(interval)
+            if job_task.done():
+                return
+            try:
+                renewed = await renew_ingestion_lease(ingestion_job["_id"], self.worker_id)
+            except Exception as e:
+                logger.error(f"Error renewing lease on ingestion job {ingestion_job['_id']}: {str(e)}")
+                continue
+            if not renewed:
+                logger.warning(f"Lost lease on ingestion job {ingestion_job['_id']}, abandoning it")
+                job_task.cancel()
+                return
+
+    async def _run(self, ingestion_job: dict):
+        job_task = asyncio.create_task(run_ingestion_job(ingestion_job, self.worker_id))
+        lease_task = asyncio.create_task(self._keep_lease(ingestion_job, job_task))
+        try:
+            await job_task
+        except asyncio.CancelledError:
+            if not job_task.done():
+                job_task.cancel()
+            # Shutdown or lost lease: give the unfinished files back to the queue
+            await release_ingestion_job(ingestion_job["_id"], self.worker_id)
+            logger.info(f"Released ingestion job {ingestion_job['_id']}")
+        except Exception as e:
+            logger.error(f"Error in ingestion job {ingestion_job['_id']}: {str(e)}", exc_info=True)
+        finally:
+            lease_task.cancel()
+
+    async def _wait_for_slot(self):
+        """Wait until a running job finishes, waking up early on shutdown"""
+        stop_waiter = asyncio.create_task(self.stopping.wait())
+        try:
+            await asyncio.wait(self.running | {stop_waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop_waiter.cancel()
+
+    async def _wait_for_work(self):
+        """Sleep until the next poll, waking up early when woken or on shutdown"""
+        waiters = {asyncio.create_task(self.stopping.wait()), asyncio.create_task(self.wakeup.wait())}
+        try:
+            await asyncio.wait(waiters, timeout=settings.INGESTION_POLL_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            self.wakeup.clear()
+
+    async def run(self, once: bool = False):
+        """
+        Claim and run jobs until stopped. With once=True, exit as soon as the
+        queue is empty and all claimed jobs have finished.
+        """
+        logger.info(f"Ingestion worker {self.worker_id} started with concurrency {self.concurrency}")
+        while not self.stopping.is_set():
+            try:
+                await recover_stale_ingestion_jobs()
+                while len(self.running) < self.concurrency and not self.stopping.is_set():
+                    ingestion_job = await claim_ingestion_job(self.worker_id)
+                    if not ingestion_job:
+                        break
+                    logger.info(f"Claimed ingestion job {ingestion_job['_id']}")
+                    task = asyncio.create_task(self._run(ingestion_job))
+                    self.running.add(task)
+                    task.add_done_callback(self.running.discard)
+            except Exception as e:
+                logger.error(f"Error polling ingestion queue: {str(e)}", exc_info=True)
+
+            if once and not self.running:
+                break
+            if len(self.running) >= self.concurrency or once:
+                await self._wait_for_slot()
+            else:
+                await self._wait_for_work()
+
+        await self.shutdown()
+
+    async def shutdown(self):
+        """Wait for in-flight jobs, then release whatever is still running"""
+        if not self.running:
+            return
+        logger.info(f"Waiting up to {settings.INGESTION_SHUTDOWN_TIMEOUT}s for {len(self.running)} ingestion jobs")
+        _, pending = await asyncio.wait(self.running, timeout=settings.INGESTION_SHUTDOWN_TIMEOUT)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def main(concurrency: Optional[int] = None, once: bool = False, worker_id: str = WORKER_ID):
+    await connect_to_mongo()
+    await ensure_indexes()
+
+    worker = IngestionWorker(worker_id=worker_id, concurrency=concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            # Signal handlers are not available on Windows event loops
+            pass
+
+    try:
+        await worker.run(once=once)
+    finally:
+        shutdown_parser_pool()
+        await close_llm_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume ingestion worker")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Ingestion jobs processed in parallel (default: INGESTION_WORKER_CONCURRENCY)")
+    parser.add_argument("--worker-id", default=WORKER_ID, help="Lease owner name (default: host:pid)")
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    args = parser.parse_args()
+
+    asyncio.run(main(concurrency=args.concurrency, once=args.once, worker_id=args.worker_id))
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Benchmark time-to-first-token (TTFT) of the resume analysis prompt layouts.
+
+Compares the legacy layout (resume text interpolated in the middle of the
+instructions) with the current one (static system prompt, then job context,
+then resume text) for a batch of candidates of the same job.
+
+By default the requests go to a local stand-in server that simulates
+provider prefix caching: prompts are split into blocks of tokens, and
+only blocks after the longest previously seen prefix pay prefill time.
+Point --base-url at a real OpenAI-compatible endpoint to measure it instead.
+
+    python scripts/benchmark_prompt_prefix.py --resumes 20
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import httpx
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ai import COMBINED_SYSTEM_PROMPT, COMBINED_TASK, build_job_context, build_messages
+from app.services.llm import task_model
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+BLOCK_SIZE = 16  # Tokens per cached block, as in paged KV caches
+
+SKILLS = ["Python", "FastAPI", "MongoDB", "React", "TypeScript", "Docker", "Kubernetes", "AWS",
+          "PostgreSQL", "Redis", "Kafka", "Go", "Java", "Terraform", "GraphQL", "Pandas"]
+VERBS = ["Designed", "Built", "Led", "Migrated", "Optimized", "Maintained", "Automated", "Scaled"]
+THINGS = ["a payments API", "the data pipeline", "an internal analytics dashboard", "the CI/CD platform",
+          "a recommendation service", "the customer onboarding flow", "a search backend", "event ingestion"]
+
+JOB = {
+    "title": "Senior Backend Engineer",
+    "description": "We are hiring a backend engineer to build and scale the APIs behind our recruiting platform. " * 4,
+    "responsibilities": "Design services, own reliability, mentor engineers, review code and work with product. " * 4,
+    "requirements": "5+ years of Python, experience with FastAPI or Django, MongoDB or PostgreSQL, cloud deployments. " * 4,
+}
+
+
+def make_resume(seed: int) -> str:
+    """A deterministic synthetic resume of roughly 500 words"""
+    rng = random.Random(seed)
+    lines = [
+        f"Candidate {seed}",
+        f"candidate{seed}@example.com | +1-555-01{seed % 100:02d} | Remote",
+        "EXPERIENCE",
+    ]
+    for _ in range(18):
+        lines.append(
+            f"{rng.choice(VERBS)} {rng.choice(THINGS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, "
+            f"improving throughput by {rng.randint(10, 90)}% for {rng.randint(2, 40)} teams."
+        )
+    lines.append("SKILLS")
+    lines.append(", ".join(rng.sample(SKILLS, 8)))
+    return "\n".join(lines)
+
+
+def legacy_messages(text: str, job_context: str) -> List[Dict[str, str]]:
+    """The previous layout: one user message with the resume in the middle of the instructions"""
+    instructions, response_format = COMBINED_SYSTEM_PROMPT.split("Provide your response", 1)
+    prompt = (
+        f"{instructions}\nResume text:\n{text}\n\nJob description:\n{job_context}\n\n"
+        f"Provide your response{response_format}"
+    )
+    return [{"role": "user", "content": prompt}]
+
+
+class PrefixCacheSimulator:
+    """Tracks prompt prefixes seen so far, in blocks of BLOCK_SIZE tokens"""
+
+    def __init__(self, capacity_blocks: int = 100_000):
+        self.blocks: "OrderedDict[str, None]" = OrderedDict()
+        self.capacity = capacity_blocks
+
+    def process(self, messages: List[Dict[str, str]]) -> tuple:
+        """Return (prompt tokens, cached tokens) and remember the prompt's blocks"""
+        text = "".join(f"<|{m['role']}|>{m['content']}" for m in messages)
+        tokens = TOKEN_PATTERN.findall(text)
+        digest = hashlib.sha256()
+        cached_blocks = 0
+        still_cached = True
+        for start in range(0, len(tokens) - BLOCK_SIZE + 1, BLOCK_SIZE):
+            digest.update("\0".join(tokens[start:start + BLOCK_SIZE]).encode("utf-8"))
+            key = digest.hexdigest()
+            if still_cached and key in self.blocks:
+                cached_blocks += 1
+                self.blocks.move_to_end(key)
+            else:
+                still_cached = False
+                self.blocks[key] = None
+                if len(self.blocks) > self.capacity:
+                    self.blocks.popitem(last=False)
+        return len(tokens), cached_blocks * BLOCK_SIZE
+
+
+async def run_stand_in_server(prefill_ms_per_token: float) -> asyncio.AbstractServer:
+    """Minimal streaming /chat/completions endpoint with simulated prefix caching"""
+    cache = PrefixCacheSimulator()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await reader.readline()  # Request line
+            content_length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    content_length = int(value.strip())
+            body = json.loads(await reader.readexactly(content_length))
+
+            prompt_tokens, cached_tokens = cache.process(body["messages"])
+            await asyncio.sleep((prompt_tokens - cached_tokens) * prefill_ms_per_token / 1000)
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nConnection: close\r\n"
+                + f"x-prompt-tokens: {prompt_tokens}\r\nx-cached-tokens: {cached_tokens}\r\n\r\n".encode()
+            )
+            for piece in ['{"contact": {}', ', "skills": {}', ', "score": 0.5}']:
+                chunk = {"choices": [{"index": 0, "delta": {"content": piece}}]}
+                writer.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                await writer.drain()
+                await asyncio.sleep(0.002)
+            writer.write(b"data: [DONE]\n\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def measure_ttft(client: httpx.AsyncClient, base_url: str, messages: List[Dict[str, str]],
+                       api_key: Optional[str]) -> tuple:
+    """Seconds until the first streamed token, and the cached token count if reported"""
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    started = time.perf_counter()
+    async with client.stream(
+        "POST",
+        f"{base_url}/chat/completions",
+        json={"model": task_model(COMBINED_TASK), "messages": messages, "stream": True, "max_tokens": 16},
+        headers=headers
+    ) as response:
+        response.raise_for_status()
+        ttft = None
+        async for line in response.aiter_lines():
+            if line.startswith("data:") and ttft is None:
+                ttft = time.perf_counter() - started
+    if ttft is None:
+        raise RuntimeError("No tokens received")
+    cached = response.headers.get("x-cached-tokens")
+    return ttft, int(cached) if cached is not None else None
+
+
+def report(name: str, samples: List[float], cached: List[Optional[int]]):
+    samples_ms = sorted(value * 1000 for value in samples)
+    p95 = samples_ms[max(0, int(round(0.95 * len(samples_ms))) - 1)]
+    line = f"{name:<8} TTFT p50={statistics.median(samples_ms):7.1f}ms p95={p95:7.1f}ms"
+    known = [value for value in cached if value is not None]
+    if known:
+        line += f" cached tokens/request={statistics.mean(known):.0f}"
+    logger.info(line)
+
+
+async def main(resumes: int, prefill_ms_per_token: float, base_url: Optional[str], api_key: Optional[str]):
+    server = None
+    if not base_url:
+        server = await run_stand_in_server(prefill_ms_per_token)
+        port = server.sockets[0].getsockname()[1]
+        base_url = f"http://127.0.0.1:{port}"
+        logger.info(f"Stand-in server on {base_url} ({prefill_ms_per_token}ms prefill per uncached token)")
+
+    job_context = build_job_context(JOB)
+    texts = [make_resume(seed) for seed in range(resumes)]
+    layouts = {
+        "legacy": [legacy_messages(text, job_context) for text in texts],
+        "prefix": [build_messages(COMBINED_SYSTEM_PROMPT, text, job_context=job_context) for text in texts],
+    }
+
+    try:
+        async with httpx.AsyncClient(timeout=120) as client:
+            for name, prompts in layouts.items():
+                samples, cached = [], []
+                for messages in prompts:
+                    ttft, cached_tokens = await measure_ttft(client, base_url, messages, api_key)
+                    samples.append(ttft)
+                    cached.append(cached_tokens)
+                # The first request of a job always pays the full prefill
+                report(name, samples[1:] or samples, cached[1:] or cached)
+    finally:
+        if server:
+            server.close()
+            await server.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark TTFT of the resume prompt layouts")
+    parser.add_argument("--resumes", type=int, default=20, help="Candidates of one job to send per layout")
+    parser.add_argument("--prefill-ms-per-token", type=float, default=0.2,
+                        help="Simulated prefill cost of the stand-in server")
+    parser.add_argument("--base-url", default=None,
+                        help="OpenAI-compatible endpoint to benchmark instead of the stand-in server")
+    parser.add_argument("--api-key", default=os.environ.get("AI_API_KEY"), help="API key for --base-url")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.resumes, args.prefill_ms_per_token, args.base_url, args.api_key if args.base_url else None))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Store resume term counts for candidates created before local ranking existed,
+so they appear in GET /candidates/{job_id}/candidates/ranked.
+
+    python scripts/build_lexical_index.py               # every job
+    python scripts/build_lexical_index.py --job-id ...  # one job
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from typing import Optional
+
+from bson import ObjectId
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.indexes import ensure_indexes
+from app.core.mongodb import connect_to_mongo, get_database, get_gridfs
+from app.services.lexical_index import index_candidate_text
+from app.services.resume_parser import parse_resume_async, shutdown_parser_pool
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def main(job_id: Optional[str]):
+    await connect_to_mongo()
+    await ensure_indexes()
+    db = await get_database()
+    fs = await get_gridfs()
+
+    query = {"job_id": ObjectId(job_id)} if job_id else {}
+    indexed = {doc["_id"] async for doc in db.resume_terms.find(query, {"_id": 1})}
+    cursor = db.candidates.find(query, {"job_id": 1, "resume_file_id": 1, "resume_sha256": 1})
+
+    done = failed = 0
+    async for candidate in cursor:
+        if candidate["_id"] in indexed or not candidate.get("resume_file_id"):
+            continue
+        try:
+            stream = await fs.open_download_stream(ObjectId(candidate["resume_file_id"]))
+            resume = await parse_resume_async(await stream.read(), stream.filename)
+            await index_candidate_text(
+                str(candidate["job_id"]), str(candidate["_id"]), candidate.get("resume_sha256") or resume.sha256, resume.text
+            )
+            done += 1
+        except Exception as e:
+            logger.error(f"Error indexing candidate {candidate['_id']}: {str(e)}")
+            failed += 1
+
+    shutdown_parser_pool()
+    logger.info(f"Indexed {done} candidates ({failed} failed)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill resume term counts for local candidate ranking")
+    parser.add_argument("--job-id", default=None, help="Only index the candidates of this job")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.job_id))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Create the MongoDB indexes declared in app/core/indexes.py and report how
+the database differs from them.
+
+    python scripts/ensure_indexes.py           # create missing indexes, then report
+    python scripts/ensure_indexes.py --check   # report only; exits 1 if an index is missing
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.indexes import ensure_indexes, index_report
+from app.core.mongodb import connect_to_mongo
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def main(check: bool) -> int:
+    await connect_to_mongo()
+    if not check:
+        result = await ensure_indexes()
+        logger.info(f"Created {len(result['created'])} indexes ({len(result['failed'])} failed)")
+
+    report = await index_report()
+    for name in report["missing"]:
+        logger.warning(f"Missing index: {name}")
+    for name in report["undeclared"]:
+        logger.info(f"Index not declared in app/core/indexes.py: {name}")
+    for name in report["unused"]:
+        logger.info(f"Index unused since the server started: {name}")
+    return 1 if report["missing"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile MongoDB indexes with the index registry")
+    parser.add_argument("--check", action="store_true", help="Only report, do not create missing indexes")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.check)))
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Recount the candidate counters of every job and rebuild the job stats rollup
+read by GET /jobs/stats, repairing increments that were missed. Run it
+periodically, e.g. hourly from cron, or after fixing data by hand.
+
+    python scripts/reconcile_job_stats.py
+"""
+import asyncio
+import logging
+import os
+import sys
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.mongodb import connect_to_mongo
+from app.services.job_stats import reconcile_job_stats
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    await connect_to_mongo()
+    rollup = await reconcile_job_stats()
+    logger.info(
+        f"Reconciled {rollup['total_jobs']} jobs: {rollup['total_candidates']} candidates, "
+        f"{rollup['resume_screened']} resume screened, {rollup['phone_screened']} phone screened"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,40 @@
+import pytest
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.config import settings
+from app.services import llm
+from app.services.llm_cache import memory_cache
+
+@pytest.fixture(autouse=True)
+def disable_llm_cache():
+    """AI tests talk to mocked completions only; cache tests opt back in"""
+    memory_cache.clear()
+    with patch.object(settings, "LLM_CACHE_ENABLED", False):
+        yield
+    memory_cache.clear()
+
+def completion(content: str):
+    """A chat completion response carrying `content`"""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+@pytest.fixture
+def mock_client():
+    """Replace the pooled client with one whose completions are mocked"""
+    create = AsyncMock(return_value=completion("  ok  "))
+
+    async def create_raw(**kwargs):
+        response = await create(**kwargs)
+        return SimpleNamespace(headers=getattr(response, "headers", {}), parse=lambda: response)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create=create,
+        with_raw_response=SimpleNamespace(create=create_raw)
+    )))
+    with patch.object(llm, "_client", client), patch.object(llm, "_limiter", None):
+        yield client
@@ -0,0 +1,122 @@
+import pytest
+import json
+import os
+import sys
+from unittest.mock import patch, AsyncMock
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.services.ai import extract_and_analyze_resume, extract_resume_info
+from app.services.contact_extraction import extract_contact_details, merge_contact_details
+from app.services.resume_parser import ParsedResume
+
+RESUME_TEXT = """JANE DOE
+Senior Software Engineer
+San Francisco, CA | jane.doe@example.com | (415) 555-0134 | linkedin.com/in/jane-doe-42
+EXPERIENCE
+Example Corp 2018 - 2024
+Built the payments platform serving 2000000 requests per day
+"""
+
+
+def test_extracts_all_contact_details_locally():
+    contact = extract_contact_details(RESUME_TEXT)
+
+    assert contact == {
+        "name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "+14155550134",
+        "location": "San Francisco, CA",
+        "linkedin_url": "https://www.linkedin.com/in/jane-doe-42",
+    }
+
+
+def test_ignores_dates_and_numbers_outside_the_header():
+    text = "Curriculum Vitae\nJohn Roe\njohn@example.org\n" + "Filler line\n" * 10 + "Order 20182024123 shipped"
+
+    contact = extract_contact_details(text)
+
+    assert contact["name"] == "John Roe"
+    assert contact["phone"] is None
+    assert contact["location"] is None
+
+
+def test_labelled_phone_further_down_is_found():
+    text = "John Roe\n" + "Filler line\n" * 10 + "Mobile: +91 98765 43210"
+
+    assert extract_contact_details(text)["phone"] == "+919876543210"
+
+
+def test_job_titles_are_not_names():
+    assert extract_contact_details("Curriculum Vitae\nData Scientist\nJane Doe")["name"] == "Jane Doe"
+    assert extract_contact_details("Senior Software Engineer\njane@example.com")["name"] is None
+
+
+def test_national_numbers_without_country_code_are_left_to_the_llm():
+    assert extract_contact_details("Jane Doe\n020 7946 0958")["phone"] is None
+    assert extract_contact_details("Jane Doe\n0044 20 7946 0958")["phone"] == "+442079460958"
+
+
+def test_local_values_win_over_llm():
+    local = {"name": "Jane Doe", "email": None, "phone": None, "location": None, "linkedin_url": None}
+    llm = {"name": "J. Doe", "email": "jane@example.com", "phone": "415-555-0134", "location": "SF"}
+
+    merged = merge_contact_details(local, llm)
+
+    assert merged["name"] == "Jane Doe"
+    assert merged["email"] == "jane@example.com"
+    assert merged["phone"] == "+14155550134"
+
+
+@pytest.mark.asyncio
+async def test_complete_fast_path_skips_contact_llm_call():
+    """Only skills and score are requested when contact details are found locally"""
+    completion = AsyncMock(return_value=json.dumps({"skills": {"python": 0.9}, "score": 0.7}))
+    resume = ParsedResume(text=RESUME_TEXT, page_count=1, sha256="abc")
+
+    with patch("app.services.structured_output.chat_completion", completion):
+        basic_info, analysis = await extract_and_analyze_resume(resume)
+        info = await extract_resume_info(resume)
+
+    assert completion.await_count == 1
+    assert "Extract the candidate's Full Name" not in completion.await_args.args[0][0]["content"]
+    assert basic_info["phone"] == "+14155550134"
+    assert info == basic_info
+    assert analysis["score"] == pytest.approx(70.0)
+
+
+@pytest.mark.asyncio
+async def test_missing_fields_are_filled_by_the_llm():
+    text = "Jane Doe\nPython developer\nReach me at jane@example.com"
+    response = {
+        "contact": {"name": "Jane D.", "email": "jane@example.com", "phone": "+1 415 555 0134", "location": None},
+        "skills": {}, "score": 0.5
+    }
+    completion = AsyncMock(return_value=json.dumps(response))
+
+    with patch("app.services.structured_output.chat_completion", completion):
+        basic_info, _ = await extract_and_analyze_resume(ParsedResume(text=text, page_count=1, sha256="abc"))
+
+    assert completion.await_count == 1
+    assert basic_info["name"] == "Jane Doe"
+    assert basic_info["phone"] == "+14155550134"
+
+
+@pytest.mark.asyncio
+async def test_location_is_kept_when_found_locally():
+    """Location is best effort: kept when found, never a reason for the contact prompt"""
+    analyze = AsyncMock(return_value={"skills": {}, "score": 50.0})
+
+    with patch("app.services.ai.analyze_resume", analyze):
+        found, _ = await extract_and_analyze_resume(ParsedResume(
+            text="Jane Doe\nAustin, TX | jane@example.com | (415) 555-0134", page_count=1, sha256="def"
+        ))
+        missing, _ = await extract_and_analyze_resume(ParsedResume(
+            text="Jane Doe\njane@example.com | (415) 555-0134\nEXPERIENCE", page_count=1, sha256="ghi"
+        ))
+
+    assert analyze.await_count == 2
+    assert found["location"] == "Austin, TX"
+    assert missing["location"] is None
+    assert missing["phone"] == "+14155550134"
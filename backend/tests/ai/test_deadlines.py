@@ -0,0 +1,159 @@
+import pytest
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import httpx
+from openai import InternalServerError
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, deadline, remaining
+from app.core.metrics import MetricsRegistry, metrics
+from app.services import llm
+from tests.ai.conftest import completion
+
+
+def test_nested_deadline_only_shortens():
+    with deadline(10):
+        with deadline(60):
+            assert remaining() <= 10
+        with deadline(1):
+            assert remaining() <= 1
+        assert 1 < remaining() <= 10
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_fits_the_deadline(mock_client):
+    with deadline(2.0):
+        await llm.chat_completion("hi", timeout=30.0)
+
+    assert mock_client.chat.completions.create.await_args.kwargs["timeout"] <= 2.0
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_skips_the_call(mock_client):
+    with deadline(0), pytest.raises(DeadlineExceeded):
+        await llm.chat_completion("hi")
+
+    mock_client.chat.completions.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_no_retry_past_the_deadline(mock_client):
+    """A retry whose backoff would outlast the deadline fails immediately"""
+    request = httpx.Request("POST", "http://localhost/chat/completions")
+    error = InternalServerError("error", response=httpx.Response(503, request=request), body=None)
+    mock_client.chat.completions.create.side_effect = error
+
+    with patch.object(settings, "AI_RETRY_BASE_DELAY", 5.0), \
+         patch("app.services.rate_limiter.random.uniform", lambda low, high: high), \
+         deadline(1.0), pytest.raises(InternalServerError):
+        await llm.chat_completion("hi")
+
+    assert mock_client.chat.completions.create.await_count == 1
+
+
+def test_hedge_delay_uses_latency_percentile():
+    registry = MetricsRegistry()
+    for value in range(1, 101):
+        registry.latency("llm_request_ms").observe(value * 100)
+
+    with patch.object(llm, "metrics", registry), \
+         patch.object(settings, "AI_HEDGE_ENABLED", True), \
+         patch.object(settings, "AI_HEDGE_MIN_DELAY", 1.0):
+        assert llm._hedge_delay() == pytest.approx(9.5)
+        with patch.object(settings, "AI_HEDGE_MIN_SAMPLES", 200):
+            assert llm._hedge_delay() is None
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_loser_cancelled(mock_client):
+    cancelled = asyncio.Event()
+    calls = 0
+
+    async def create(**kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return completion(f"response {calls}")
+
+    mock_client.chat.completions.create.side_effect = create
+    hedged_before = metrics.counter("llm_hedged_requests").value
+    wins_before = metrics.counter("llm_hedge_wins").value
+
+    started = time.monotonic()
+    with patch.object(llm, "_hedge_delay", lambda: 0.02):
+        result = await llm.chat_completion("hi")
+
+    assert result == "response 2"
+    assert time.monotonic() - started < 1
+    assert cancelled.is_set()
+    assert metrics.counter("llm_hedged_requests").value == hedged_before + 1
+    assert metrics.counter("llm_hedge_wins").value == wins_before + 1
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged(mock_client):
+    hedged_before = metrics.counter("llm_hedged_requests").value
+
+    with patch.object(llm, "_hedge_delay", lambda: 0.5):
+        assert await llm.chat_completion("hi") == "ok"
+
+    assert mock_client.chat.completions.create.await_count == 1
+    assert metrics.counter("llm_hedged_requests").value == hedged_before
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hedge_latency_is_not_recorded(mock_client):
+    """Only the winning attempt feeds the latency the hedge delay is derived from"""
+    registry = MetricsRegistry()
+    calls = 0
+
+    async def create(**kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(5)
+        return completion(f"response {calls}")
+
+    mock_client.chat.completions.create.side_effect = create
+
+    with patch.object(llm, "metrics", registry), patch.object(llm, "_hedge_delay", lambda: 0.02):
+        assert await llm.chat_completion("hi") == "response 2"
+
+    assert registry.latency("llm_request_ms").count == 1
+
+
+@pytest.mark.asyncio
+async def test_slot_granted_as_the_wait_times_out_is_released():
+    class Limiter:
+        in_flight = 0
+
+        async def acquire(self):
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                pass  # The slot was granted while the wait gave up
+            self.in_flight += 1
+            return 0
+
+        async def release(self, epoch, overloaded=False, succeeded=True):
+            self.in_flight -= 1
+
+    limiter = Limiter()
+    with pytest.raises(asyncio.TimeoutError):
+        await llm._acquire(limiter, 0.01)
+    await asyncio.sleep(0.01)
+
+    assert limiter.in_flight == 0
@@ -0,0 +1,117 @@
+import pytest
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.config import AITaskRoute, settings
+from app.core.metrics import metrics
+from app.services import llm
+from app.services.ai import analyze_resume, analyze_call_transcript
+from app.services.resume_parser import ParsedResume
+from tests.ai.conftest import completion as _completion
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_strips_content_and_passes_timeout(mock_client):
+    """The message content is returned stripped and the timeout reaches the provider call"""
+    result = await llm.chat_completion("hello", timeout=3.0, temperature=0)
+
+    assert result == "ok"
+    kwargs = mock_client.chat.completions.create.await_args.kwargs
+    assert kwargs["messages"] == [{"role": "user", "content": "hello"}]
+    assert kwargs["timeout"] == 3.0
+    assert kwargs["temperature"] == 0
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_uses_default_timeout(mock_client):
+    await llm.chat_completion([{"role": "system", "content": "x"}])
+
+    kwargs = mock_client.chat.completions.create.await_args.kwargs
+    assert kwargs["timeout"] == settings.AI_REQUEST_TIMEOUT
+    assert kwargs["model"] == settings.AI_DEFAULT_MODEL
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_caps_in_flight(mock_client):
+    """No more than AI_MAX_IN_FLIGHT requests reach the provider at once"""
+    active = 0
+    peak = 0
+
+    async def slow_create(**kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return _completion("ok")
+
+    mock_client.chat.completions.create.side_effect = slow_create
+    with patch.object(settings, "AI_MAX_IN_FLIGHT", 2):
+        await asyncio.gather(*(llm.chat_completion("hi") for _ in range(6)))
+
+    assert peak == 2
+    assert mock_client.chat.completions.create.await_count == 6
+
+
+@pytest.mark.asyncio
+async def test_ai_services_use_async_client(mock_client):
+    """Resume and transcript analysis await the shared client instead of blocking the loop"""
+    mock_client.chat.completions.create.side_effect = [
+        _completion('{"skills": {"python": 0.9}, "score": 0.8}'),
+        _completion('{"notice_period": "30 days", "current_compensation": "Unknown", '
+                    '"expected_compensation": "Unknown", "screening_score": 70}'),
+    ]
+
+    analysis = await analyze_resume(ParsedResume(text="Python developer", page_count=1, sha256="abc"))
+    screening = await analyze_call_transcript("Candidate is interested")
+
+    assert analysis["skills"] == {"python": 0.9}
+    assert analysis["score"] == pytest.approx(80.0)
+    assert screening["notice_period"] == "30 days"
+    assert screening["screening_score"] == 70
+    assert mock_client.chat.completions.create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_task_routes_select_model_and_parameters(mock_client):
+    """Each task uses its routed model and parameters; explicit arguments win"""
+    routes = {"contact_extraction": AITaskRoute(model="small-model", max_tokens=64, temperature=0.0, timeout=5.0)}
+    with patch.object(settings, "AI_TASK_ROUTES", routes):
+        await llm.chat_completion("hi", task="contact_extraction")
+        routed = mock_client.chat.completions.create.await_args.kwargs
+        await llm.chat_completion("hi", task="contact_extraction", max_tokens=10)
+        overridden = mock_client.chat.completions.create.await_args.kwargs
+        await llm.chat_completion("hi", task="skill_scoring")
+        unrouted = mock_client.chat.completions.create.await_args.kwargs
+
+    assert routed["model"] == "small-model"
+    assert routed["max_tokens"] == 64
+    assert routed["temperature"] == 0.0
+    assert routed["timeout"] == 5.0
+    assert overridden["max_tokens"] == 10
+    assert unrouted["model"] == settings.AI_DEFAULT_MODEL
+    assert "max_tokens" not in unrouted
+
+
+@pytest.mark.asyncio
+async def test_task_usage_is_recorded(mock_client):
+    response = _completion("ok")
+    response.usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30)
+    mock_client.chat.completions.create.return_value = response
+    before = {name: metrics.counter(f"llm_task_call_summary_{name}").value
+              for name in ("requests", "prompt_tokens", "completion_tokens")}
+
+    await llm.chat_completion("hi", task="call_summary")
+
+    stats = next(item for item in llm.task_stats() if item["task"] == "call_summary")
+    assert stats["requests"] == before["requests"] + 1
+    assert stats["prompt_tokens"] == before["prompt_tokens"] + 120
+    assert stats["completion_tokens"] == before["completion_tokens"] + 30
+    assert stats["latency_p50_ms"] is not None
+    assert stats["model"] == llm.task_model("call_summary")
@@ -0,0 +1,128 @@
+import pytest
+import json
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, MagicMock
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.ai import extract_and_analyze_resume, COMBINED_PROMPT_VERSION
+from app.services.llm_cache import (
+    LRUCache, cache_key, get_cached_response, set_cached_response, invalidate_prompt_version, memory_cache
+)
+from app.services.resume_parser import ParsedResume
+
+RESUME = ParsedResume(text="Jane Doe\nPython developer", page_count=1, sha256="abc")
+RESPONSE = json.dumps({
+    "contact": {"name": "Jane Doe", "email": "jane@example.com", "phone": None, "location": None},
+    "skills": {"python": 0.9},
+    "score": 0.8
+})
+
+
+@pytest.fixture
+def mock_cache_db():
+    """In-memory stand-in for the llm_cache collection"""
+    documents = {}
+
+    async def find_one(query):
+        return documents.get(query["_id"])
+
+    async def replace_one(query, document, upsert=False):
+        documents[query["_id"]] = {"_id": query["_id"], **document}
+
+    async def delete_many(query):
+        keys = [key for key, doc in documents.items() if doc["prompt_version"] == query["prompt_version"]]
+        for key in keys:
+            del documents[key]
+        return SimpleNamespace(deleted_count=len(keys))
+
+    db = MagicMock()
+    db.llm_cache.find_one = AsyncMock(side_effect=find_one)
+    db.llm_cache.replace_one = AsyncMock(side_effect=replace_one)
+    db.llm_cache.delete_many = AsyncMock(side_effect=delete_many)
+
+    async def _get_database():
+        return db
+
+    with patch("app.services.llm_cache.get_database", _get_database), \
+         patch.object(settings, "LLM_CACHE_ENABLED", True):
+        yield db
+
+
+def test_cache_key_depends_on_model_version_and_input():
+    key = cache_key("model", "v1", "text")
+
+    assert key == cache_key("model", "v1", "text")
+    assert key != cache_key("other-model", "v1", "text")
+    assert key != cache_key("model", "v2", "text")
+    assert key != cache_key("model", "v1", "other text")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", "v1", 1)
+    cache.set("b", "v1", 2)
+    cache.get("a")
+    cache.set("c", "v1", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_lru_entries_expire():
+    """Bounds how long another process serves an invalidated prompt version"""
+    cache = LRUCache(max_size=2, ttl=60)
+    with patch("app.services.llm_cache.time.monotonic", return_value=1000.0):
+        cache.set("a", "v1", 1)
+    with patch("app.services.llm_cache.time.monotonic", return_value=1059.0):
+        assert cache.get("a") == 1
+    with patch("app.services.llm_cache.time.monotonic", return_value=1060.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_repeated_analysis_is_served_from_cache(mock_cache_db):
+    """The second analysis of the same text makes no LLM call"""
+    completion = AsyncMock(return_value=RESPONSE)
+    memory_hits_before = metrics.counter("llm_cache_memory_hits").value
+
+    with patch("app.services.structured_output.chat_completion", completion):
+        first = await extract_and_analyze_resume(RESUME)
+        second = await extract_and_analyze_resume(RESUME)
+
+    assert completion.await_count == 1
+    assert first == second
+    assert metrics.counter("llm_cache_memory_hits").value == memory_hits_before + 1
+
+
+@pytest.mark.asyncio
+async def test_database_tier_fills_memory_tier(mock_cache_db):
+    await set_cached_response("model", "v1", "text", {"score": 1})
+    memory_cache.clear()
+    db_hits_before = metrics.counter("llm_cache_db_hits").value
+
+    assert await get_cached_response("model", "v1", "text") == {"score": 1}
+    assert await get_cached_response("model", "v1", "text") == {"score": 1}
+
+    assert metrics.counter("llm_cache_db_hits").value == db_hits_before + 1
+    assert mock_cache_db.llm_cache.find_one.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_prompt_version(mock_cache_db):
+    """Invalidation removes one prompt version from both tiers"""
+    await set_cached_response("model", COMBINED_PROMPT_VERSION, "text", {"score": 1})
+    await set_cached_response("model", "other-v1", "text", {"score": 2})
+
+    result = await invalidate_prompt_version(COMBINED_PROMPT_VERSION)
+
+    assert result == {"memory_deleted": 1, "deleted": 1}
+    assert await get_cached_response("model", COMBINED_PROMPT_VERSION, "text") is None
+    assert await get_cached_response("model", "other-v1", "text") == {"score": 2}
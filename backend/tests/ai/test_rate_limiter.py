@@ -0,0 +1,116 @@
+import pytest
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import httpx
+from openai import RateLimitError, BadRequestError
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services import llm
+from app.services.rate_limiter import (
+    AdaptiveConcurrencyLimiter, LLMRateLimiter, TokenBucket, parse_duration
+)
+from tests.ai.conftest import completion as _completion
+
+
+def _status_error(cls, status_code: int, headers=None):
+    request = httpx.Request("POST", "http://localhost/chat/completions")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    return cls("error", response=response, body=None)
+
+
+@pytest.fixture
+def fast_retries():
+    with patch.object(settings, "AI_RETRY_BASE_DELAY", 0.001), \
+         patch.object(settings, "AI_RETRY_MAX_DELAY", 0.01):
+        yield
+
+
+def test_parse_duration():
+    assert parse_duration("2") == 2.0
+    assert parse_duration("1.5s") == 1.5
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration(None) is None
+    assert parse_duration("soon") is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    """After the burst is spent, tokens are handed out at the configured rate"""
+    bucket = TokenBucket(rate=100, burst=2)
+    started = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+
+    # 2 from the burst, 4 more at 100/s
+    assert time.monotonic() - started >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_aimd_halves_once_per_overload_burst_and_recovers():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8, min_limit=1)
+    epochs = [await limiter.acquire() for _ in range(4)]
+
+    # Four concurrent 429s only count as one congestion signal
+    for epoch in epochs:
+        await limiter.release(epoch, overloaded=True)
+    assert limiter.limit == 4
+
+    for _ in range(20):
+        await limiter.release(await limiter.acquire())
+    assert 4 < limiter.limit <= 8
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_headers_pause_requests():
+    with patch.object(settings, "AI_RETRY_MAX_DELAY", 30.0):
+        limiter = LLMRateLimiter()
+        limiter.observe_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s"})
+
+    assert limiter.bucket.paused_until - time.monotonic() > 1.5
+
+
+@pytest.mark.asyncio
+async def test_429_is_retried_and_lowers_the_limit(mock_client, fast_retries):
+    """Rate-limited requests are retried instead of failing the upload"""
+    mock_client.chat.completions.create.side_effect = [
+        _status_error(RateLimitError, 429),
+        _completion("ok"),
+    ]
+    retries_before = metrics.counter("llm_retries").value
+
+    with patch.object(settings, "AI_MAX_IN_FLIGHT", 8):
+        result = await llm.chat_completion("hi")
+
+    assert result == "ok"
+    assert mock_client.chat.completions.create.await_count == 2
+    assert metrics.counter("llm_retries").value == retries_before + 1
+    assert metrics.gauge("llm_concurrency_limit").value < 8
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(mock_client, fast_retries):
+    mock_client.chat.completions.create.side_effect = _status_error(RateLimitError, 429)
+
+    with patch.object(settings, "AI_MAX_RETRIES", 2), pytest.raises(RateLimitError):
+        await llm.chat_completion("hi")
+
+    assert mock_client.chat.completions.create.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(mock_client, fast_retries):
+    mock_client.chat.completions.create.side_effect = _status_error(BadRequestError, 400)
+
+    with pytest.raises(BadRequestError):
+        await llm.chat_completion("hi")
+
+    assert mock_client.chat.completions.create.await_count == 1
@@ -0,0 +1,223 @@
+import pytest
+import json
+import os
+import sys
+from unittest.mock import patch, AsyncMock
+
+import httpx
+from openai import APIConnectionError
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded
+from app.core.metrics import metrics
+from app.services.ai import (
+    COARSE_SCREENING_SYSTEM_PROMPT,
+    COMBINED_SYSTEM_PROMPT,
+    SKILLS_SYSTEM_PROMPT,
+    SUMMARY_SCORE_SYSTEM_PROMPT,
+    analyze_resume,
+    build_job_context,
+    coarse_screen,
+    extract_and_analyze_resume,
+    merge_skill_scores,
+)
+from app.services.resume_parser import ParsedResume
+
+RESUME = ParsedResume(text="Jane Doe\njane@example.com\nPython developer", page_count=1, sha256="abc")
+CONTACT = {"name": "Jane Doe", "email": "jane@example.com", "phone": None, "location": "Berlin"}
+
+
+@pytest.fixture(autouse=True)
+def disable_contact_fast_path():
+    """These tests cover the LLM path; the fast path has its own tests"""
+    with patch.object(settings, "CONTACT_FAST_PATH_ENABLED", False):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_combined_call_returns_contact_and_analysis():
+    """Contact info, skills and score come back from a single LLM call"""
+    response = json.dumps({"contact": CONTACT, "skills": {"python": 0.9}, "score": 0.8})
+    completion = AsyncMock(return_value=f"```json\n{response}\n```")
+
+    with patch("app.services.structured_output.chat_completion", completion):
+        basic_info, analysis = await extract_and_analyze_resume(RESUME)
+
+    assert completion.await_count == 1
+    messages = completion.await_args.args[0]
+    assert messages[-1]["content"].endswith(RESUME.text)
+    assert basic_info == CONTACT
+    assert analysis["skills"] == {"python": 0.9}
+    assert analysis["score"] == pytest.approx(80.0)
+
+
+@pytest.mark.asyncio
+async def test_unparseable_response_falls_back_to_split_calls():
+    fallbacks_before = metrics.counter("resume_analysis_fallbacks").value
+    extract = AsyncMock(return_value=CONTACT)
+    analyze = AsyncMock(return_value={"skills": {}, "score": 0.0})
+
+    with patch("app.services.structured_output.chat_completion", AsyncMock(return_value="Sorry, I can't help")), \
+         patch("app.services.ai._extract_resume_info_llm", extract), \
+         patch("app.services.ai.analyze_resume", analyze):
+        basic_info, analysis = await extract_and_analyze_resume(RESUME)
+
+    extract.assert_awaited_once_with(RESUME.text)
+    analyze.assert_awaited_once_with(RESUME, None)
+    assert basic_info == CONTACT
+    assert metrics.counter("resume_analysis_fallbacks").value == fallbacks_before + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [
+    APIConnectionError(request=httpx.Request("POST", "http://localhost/chat/completions")),
+    DeadlineExceeded(),
+])
+async def test_provider_errors_are_not_retried_as_split_calls(error):
+    """Only unusable responses fall back; failed requests would fail again"""
+    extract = AsyncMock(return_value=CONTACT)
+    analyze = AsyncMock(return_value={"skills": {}, "score": 0.0})
+
+    with patch("app.services.structured_output.chat_completion", AsyncMock(side_effect=error)), \
+         patch("app.services.ai._extract_resume_info_llm", extract), \
+         patch("app.services.ai.analyze_resume", analyze), \
+         pytest.raises(type(error)):
+        await extract_and_analyze_resume(RESUME)
+
+    extract.assert_not_called()
+    analyze.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_only_the_malformed_part_is_retried():
+    """A valid contact block is kept when only the score is malformed"""
+    response = json.dumps({"contact": CONTACT, "skills": {"python": 0.9}, "score": "high"})
+    extract = AsyncMock()
+    analyze = AsyncMock(return_value={"skills": {"python": 0.9}, "score": 75.0})
+
+    with patch("app.services.structured_output.chat_completion", AsyncMock(return_value=response)), \
+         patch("app.services.ai._extract_resume_info_llm", extract), \
+         patch("app.services.ai.analyze_resume", analyze):
+        basic_info, analysis = await extract_and_analyze_resume(RESUME)
+
+    extract.assert_not_called()
+    analyze.assert_awaited_once()
+    assert basic_info == CONTACT
+    assert analysis["score"] == 75.0
+
+
+@pytest.mark.asyncio
+async def test_prompts_share_a_static_prefix():
+    """Candidates of the same job differ only after the instructions and job context"""
+    completion = AsyncMock(return_value=json.dumps({"contact": CONTACT, "skills": {}, "score": 0.5}))
+    job_context = build_job_context({"title": "Backend Engineer", "description": "Build APIs"})
+    other = ParsedResume(text="John Roe\nGo developer", page_count=1, sha256="def")
+
+    with patch("app.services.structured_output.chat_completion", completion):
+        await extract_and_analyze_resume(RESUME, job_context)
+        await extract_and_analyze_resume(other, job_context)
+
+    first, second = (call.args[0] for call in completion.await_args_list)
+    assert first[0] == second[0] == {"role": "system", "content": COMBINED_SYSTEM_PROMPT}
+    prefix = f"Job description:\n{job_context}\n\nResume text:\n"
+    assert first[1]["content"] == prefix + RESUME.text
+    assert second[1]["content"] == prefix + other.text
+
+
+@pytest.mark.asyncio
+async def test_coarse_screen_uses_truncated_resume_and_requirements():
+    """The coarse pass sees the start of the resume and the job's requirements only"""
+    completion = AsyncMock(return_value="0.3")
+    long_resume = ParsedResume(text="\n".join(f"Line {i} of a very long resume" for i in range(2000)),
+                               page_count=9, sha256="long")
+
+    with patch("app.services.structured_output.chat_completion", completion), \
+         patch.object(settings, "SCREENING_CASCADE_TOKEN_BUDGET", 100):
+        score = await coarse_screen(long_resume, "5+ years of Python")
+
+    assert score == pytest.approx(30.0)
+    messages = completion.await_args.args[0]
+    assert messages[0] == {"role": "system", "content": COARSE_SCREENING_SYSTEM_PROMPT}
+    assert "5+ years of Python" in messages[1]["content"]
+    assert len(messages[1]["content"]) < len(long_resume.text) // 10
+    assert completion.await_args.kwargs["task"] == "coarse_screening"
+
+
+LONG_RESUME = ParsedResume(
+    text="Jane Doe\nResearch engineer\n[... truncated ...]",
+    page_count=12,
+    sha256="long",
+    full_text="\n".join(
+        ["Jane Doe", "Research engineer", "Experience"]
+        + [f"Built simulation pipeline {i} in Python" for i in range(100)]
+        + ["Publications"]
+        + [f"Paper {i} on numerical methods in Julia" for i in range(100)]
+    ),
+)
+
+
+def test_merge_skill_scores_deduplicates_names():
+    chunks = [{"Python": 0.6, "Julia": 0.4}, {"python ": 0.9}, {"JULIA": 0.8}]
+
+    assert merge_skill_scores(chunks) == {"Python": 0.9, "Julia": 0.8}
+    assert merge_skill_scores(chunks, "mean") == pytest.approx({"Python": 0.75, "Julia": 0.6})
+
+
+@pytest.mark.asyncio
+async def test_long_resume_is_analyzed_in_chunks():
+    """Skills come from one call per chunk, the score from one call on the merged summary"""
+    async def complete(messages, **kwargs):
+        if messages[0]["content"] == SUMMARY_SCORE_SYSTEM_PROMPT:
+            return "0.7"
+        if "Paper" in messages[1]["content"]:
+            return '{"julia": 0.8, "python": 0.5}'
+        return '{"Python": 0.9}'
+
+    completion = AsyncMock(side_effect=complete)
+    chunked_before = metrics.counter("resume_chunked_analyses").value
+
+    with patch("app.services.structured_output.chat_completion", completion), \
+         patch.object(settings, "RESUME_CHUNK_TOKENS", 300):
+        analysis = await analyze_resume(LONG_RESUME, job_context="Job title: Research engineer")
+
+    calls = [call.args[0] for call in completion.await_args_list]
+    chunk_calls = [messages for messages in calls if messages[0]["content"] == SKILLS_SYSTEM_PROMPT]
+    assert len(chunk_calls) == len(calls) - 1 > 2
+    assert "".join(messages[1]["content"] for messages in chunk_calls).count("Built simulation") == 100
+    summary = calls[-1][1]["content"]
+    assert summary.startswith("Job description:\nJob title: Research engineer")
+    assert "Skills: Python (0.9), julia (0.8)" in summary
+    assert len(summary) < len(LONG_RESUME.full_text) // 4
+    assert analysis == {"skills": {"Python": 0.9, "julia": 0.8}, "score": pytest.approx(70.0)}
+    assert metrics.counter("resume_chunked_analyses").value == chunked_before + 1
+
+
+@pytest.mark.asyncio
+async def test_long_resume_skips_failed_chunks():
+    async def complete(messages, **kwargs):
+        if messages[0]["content"] == SUMMARY_SCORE_SYSTEM_PROMPT:
+            return "0.7"
+        return "Sorry" if "Paper" in messages[1]["content"] else '{"python": 0.9}'
+
+    with patch("app.services.structured_output.chat_completion", AsyncMock(side_effect=complete)), \
+         patch.object(settings, "RESUME_CHUNK_TOKENS", 300):
+        analysis = await analyze_resume(LONG_RESUME)
+
+    assert analysis["skills"] == {"python": 0.9}
+
+
+@pytest.mark.asyncio
+async def test_long_resume_contact_comes_from_the_top():
+    """The combined call is skipped: contact details from the budgeted text, analysis from the chunks"""
+    extract = AsyncMock(return_value=CONTACT)
+    analyze = AsyncMock(return_value={"skills": {"python": 0.9}, "score": 70.0})
+
+    with patch("app.services.ai._extract_resume_info_llm", extract), \
+         patch("app.services.ai.analyze_long_resume", analyze):
+        basic_info, analysis = await extract_and_analyze_resume(LONG_RESUME)
+
+    extract.assert_awaited_once_with(LONG_RESUME.text)
+    analyze.assert_awaited_once_with(LONG_RESUME, None)
+    assert basic_info == CONTACT
+    assert analysis["score"] == 70.0
@@ -0,0 +1,115 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch, AsyncMock
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.metrics import metrics
+from app.models.llm_outputs import OverallScore, ResumeAnalysis, SkillScores
+from app.services.structured_output import (
+    StructuredOutputError,
+    complete_json,
+    extract_json,
+    parse_structured,
+)
+
+MESSAGES = [{"role": "system", "content": "Analyze"}, {"role": "user", "content": "Resume text:\nPython"}]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"score": 0.5}', {"score": 0.5}),
+    ('```json\n{"score": 0.5}\n```', {"score": 0.5}),
+    ('Here is the analysis:\n{"score": 0.5}\nLet me know if you need more.', {"score": 0.5}),
+    ('{"skills": {"python": 0.9,}, "score": 0.5,}', {"skills": {"python": 0.9}, "score": 0.5}),
+    ("{'name': 'Jane', 'phone': None, 'remote': True}", {"name": "Jane", "phone": None, "remote": True}),
+    ('{"text": "a } inside", "score": 0.5} trailing', {"text": "a } inside", "score": 0.5}),
+    ("0.85", 0.85),
+    ("Score: 0.85", 0.85),
+])
+def test_extract_json(text, expected):
+    assert extract_json(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"skills": {"python": 0.9, "go": 0.7', {"skills": {"python": 0.9, "go": 0.7}}),
+    ('{"skills": {"python": 0.9, "go": 0.', {"skills": {"python": 0.9}}),
+    ('{"name": "Jane", "location": "San Fr', {"name": "Jane", "location": "San Fr"}),
+    ('{"name": "Jane", "email":', {"name": "Jane", "email": None}),
+    ('```json\n{"skills": ["python", "go"', {"skills": ["python", "go"]}),
+])
+def test_extract_json_repairs_truncated_responses(text, expected):
+    assert extract_json(text) == expected
+
+
+def test_extract_json_rejects_text_without_json():
+    with pytest.raises(StructuredOutputError):
+        extract_json("Sorry, I can't help with that")
+
+
+def test_parse_structured_keeps_data_on_schema_errors():
+    with pytest.raises(StructuredOutputError) as error:
+        parse_structured('{"skills": {"python": 0.9}, "score": "high"}', ResumeAnalysis)
+
+    assert "score" in str(error.value)
+    assert error.value.data == {"skills": {"python": 0.9}, "score": "high"}
+
+
+def test_parse_structured_checks_ranges():
+    with pytest.raises(StructuredOutputError):
+        parse_structured('{"python": 9}', SkillScores)
+
+
+@pytest.mark.asyncio
+async def test_complete_json_retries_once_with_the_error():
+    retries_before = metrics.counter("structured_output_retries").value
+    completion = AsyncMock(side_effect=['{"skills": {}, "score": "high"}', '{"skills": {}, "score": 0.6}'])
+
+    with patch("app.services.structured_output.chat_completion", completion):
+        result = await complete_json(MESSAGES, ResumeAnalysis)
+
+    assert result.score == 0.6
+    assert completion.await_count == 2
+    retry_messages = completion.await_args.args[0]
+    assert retry_messages[:2] == MESSAGES
+    assert retry_messages[2] == {"role": "assistant", "content": '{"skills": {}, "score": "high"}'}
+    assert "score" in retry_messages[3]["content"]
+    assert metrics.counter("structured_output_retries").value == retries_before + 1
+
+
+@pytest.mark.asyncio
+async def test_complete_json_raises_after_one_retry():
+    failures_before = metrics.counter("structured_output_failures").value
+    completion = AsyncMock(side_effect=['{"skills": {}, "score": "high"}', "Sorry"])
+
+    with patch("app.services.structured_output.chat_completion", completion):
+        with pytest.raises(StructuredOutputError) as error:
+            await complete_json(MESSAGES, ResumeAnalysis)
+
+    assert completion.await_count == 2
+    # The first attempt's JSON is kept for salvaging
+    assert error.value.data == {"skills": {}, "score": "high"}
+    assert metrics.counter("structured_output_failures").value == failures_before + 1
+
+
+@pytest.mark.asyncio
+async def test_valid_response_needs_no_retry():
+    completion = AsyncMock(return_value="0.7")
+
+    with patch("app.services.structured_output.chat_completion", completion):
+        result = await complete_json(MESSAGES, OverallScore)
+
+    assert result.root == 0.7
+    completion.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_python_style_dict_parses_without_eval():
+    completion = AsyncMock(return_value="{'python': 0.9, 'go': 0.5}")
+
+    with patch("app.services.structured_output.chat_completion", completion):
+        result = await complete_json(MESSAGES, SkillScores)
+
+    assert result.root == {"python": 0.9, "go": 0.5}
+    completion.assert_awaited_once()
@@ -127,6 +127,9 @@ class MockCursor:
         self._skip = 0
         self._limit = None
 
+    def sort(self, *args, **kwargs):
+        return self
+
     def skip(self, count):
         self._skip = count
         return self
@@ -165,6 +168,19 @@ def mock_db(mock_job, mock_candidate):
     # Mock count_documents
     mock_database.candidates.count_documents.return_value = 1
     
+    # No previously uploaded resumes; registering a blob returns the new document
+    # and taking a reference returns the stored one
+    mock_database.resume_blobs = AsyncMock()
+    mock_database.resume_blobs.find_one.return_value = None
+    
+    async def update_blob(query, update, **kwargs):
+        if "$setOnInsert" in update:
+            return {"_id": query["_id"], **update["$setOnInsert"], "refs": 1}
+        stored = mock_database.resume_blobs.find_one.return_value
+        return stored and {**stored, "refs": stored.get("refs", 0) + update["$inc"]["refs"]}
+    
+    mock_database.resume_blobs.find_one_and_update.side_effect = update_blob
+    
     return mock_database
 
 @pytest.fixture
@@ -173,7 +189,10 @@ def mock_get_database(mock_db):
     async def _get_database():
         return mock_db
     
-    with patch("app.services.candidates.get_database", _get_database):
+    with patch("app.services.candidates.get_database", _get_database), \
+         patch("app.services.resume_blobs.get_database", _get_database), \
+         patch("app.services.lexical_index.get_database", _get_database), \
+         patch("app.services.job_stats.get_database", _get_database):
         yield mock_db
 
 @pytest.fixture
@@ -188,8 +207,9 @@ def mock_get_gridfs(mock_gridfs):
 @pytest.fixture
 def mock_ai_services():
     """Mock the AI services for resume processing"""
-    with patch("app.services.candidates.extract_resume_info", 
-               return_value={"name": "Test Candidate", "email": "test.candidate@example.com", "phone": "+1234567890", "location": "Test Location"}), \
-         patch("app.services.candidates.analyze_resume", 
-               return_value={"skills": {"Python": 0.8, "JavaScript": 0.7}, "score": 85.0}):
+    with patch("app.services.candidates.extract_and_analyze_resume",
+               return_value=(
+                   {"name": "Test Candidate", "email": "test.candidate@example.com", "phone": "+1234567890", "location": "Test Location"},
+                   {"skills": {"Python": 0.8, "JavaScript": 0.7}, "score": 85.0}
+               )):
         yield 
\ No newline at end of file
@@ -0,0 +1,140 @@
+import pytest
+import asyncio
+import os
+import sys
+import zipfile
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from unittest.mock import patch
+from bson import ObjectId
+from fastapi import UploadFile, HTTPException
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from pymongo.errors import DuplicateKeyError
+
+from app.services.candidates import process_pdf_file, process_resume_batch, upload_resumes_bulk, upload_resume
+from app.models.database import User
+
+def make_zip_upload(files: dict, filename: str = "resumes.zip") -> UploadFile:
+    """Build an UploadFile wrapping a ZIP archive with the given members"""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    spooled_file = SpooledTemporaryFile()
+    spooled_file.write(buffer.getvalue())
+    spooled_file.seek(0)
+    return UploadFile(file=spooled_file, filename=filename, size=len(buffer.getvalue()))
+
+def fake_candidate(filename: str) -> dict:
+    return {"id": str(ObjectId()), "name": filename}
+
+@pytest.mark.asyncio
+async def test_process_resume_batch_respects_concurrency(mock_user):
+    """No more than `concurrency` resumes should be processed at the same time"""
+    in_flight = 0
+    peak = 0
+
+    async def slow_process(content, filename, job_id, created_by, job_context=None, cascade=None, ingestion_key=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return fake_candidate(filename)
+
+    files = [(f"resume_{i}.pdf", lambda: b"%PDF-1.4") for i in range(10)]
+    with patch("app.services.candidates.process_pdf_file", side_effect=slow_process):
+        results = await process_resume_batch(files, str(ObjectId()), User(**mock_user), concurrency=3)
+
+    assert peak == 3
+    assert [result["filename"] for result in results] == [f"resume_{i}.pdf" for i in range(10)]
+    assert all(result["status"] == "succeeded" for result in results)
+
+@pytest.mark.asyncio
+async def test_upload_resumes_bulk_reports_every_file(mock_user):
+    """A failing member should be reported without aborting the rest of the ZIP"""
+    async def process(content, filename, job_id, created_by, job_context=None, cascade=None, ingestion_key=None):
+        if filename == "broken.pdf":
+            raise ValueError("Unreadable PDF")
+        return fake_candidate(filename)
+
+    upload = make_zip_upload({
+        "a.pdf": b"%PDF-1.4 a",
+        "nested/b.pdf": b"%PDF-1.4 b",
+        "broken.pdf": b"not a pdf",
+        "notes.txt": b"ignored"
+    })
+    with patch("app.services.candidates.process_pdf_file", side_effect=process):
+        report = await upload_resumes_bulk(str(ObjectId()), upload, User(**mock_user))
+
+    assert report["total"] == 3
+    assert report["succeeded"] == 2
+    assert report["failed"] == 1
+    by_name = {result["filename"]: result for result in report["results"]}
+    assert by_name["broken.pdf"]["status"] == "failed"
+    assert by_name["broken.pdf"]["error"] == "Unreadable PDF"
+    assert by_name["broken.pdf"]["candidate_id"] is None
+    assert by_name["a.pdf"]["candidate_id"] is not None
+    assert all("candidate" not in result for result in report["results"])
+
+@pytest.mark.asyncio
+async def test_upload_resume_zip_returns_last_candidate(mock_user):
+    """The single-candidate endpoint keeps returning a candidate for ZIP uploads"""
+    async def process(content, filename, job_id, created_by, job_context=None, cascade=None, ingestion_key=None):
+        return fake_candidate(filename)
+
+    upload = make_zip_upload({"a.pdf": b"%PDF-1.4 a", "b.pdf": b"%PDF-1.4 b"})
+    with patch("app.services.candidates.process_pdf_file", side_effect=process):
+        candidate = await upload_resume(str(ObjectId()), upload, User(**mock_user))
+
+    assert candidate["name"] in {"a.pdf", "b.pdf"}
+
+@pytest.mark.asyncio
+async def test_bulk_upload_rejects_too_many_members(mock_user):
+    """The member-count guard is enforced from the central directory"""
+    upload = make_zip_upload({f"{i}.pdf": b"%PDF-1.4" for i in range(3)})
+    with patch("app.services.candidates.settings.MAX_ZIP_MEMBERS", 2), \
+         patch("app.services.candidates.process_pdf_file") as mock_process:
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_resumes_bulk(str(ObjectId()), upload, User(**mock_user))
+
+    assert exc_info.value.status_code == 413
+    mock_process.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_bulk_upload_rejects_oversized_upload(mock_user):
+    """Uploads larger than MAX_UPLOAD_SIZE are rejected while spooling"""
+    upload = make_zip_upload({"a.pdf": b"%PDF-1.4" + b"x" * 4096})
+    with patch("app.services.candidates.settings.MAX_UPLOAD_SIZE", 1024):
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_resumes_bulk(str(ObjectId()), upload, User(**mock_user))
+
+    assert exc_info.value.status_code == 413
+
+@pytest.mark.asyncio
+async def test_processed_ingestion_item_is_not_created_again(mock_get_database, mock_get_gridfs, mock_ai_services, mock_candidate, mock_resume_file, mock_user):
+    """A retried queue item returns the candidate its earlier attempt created"""
+    mock_get_database.candidates.find_one.return_value = {**mock_candidate, "ingestion_key": "job:0"}
+
+    result = await process_pdf_file(
+        mock_resume_file, "resume.pdf", str(mock_candidate["job_id"]), User(**mock_user), ingestion_key="job:0"
+    )
+
+    assert result["id"] == str(mock_candidate["_id"])
+    mock_get_database.candidates.insert_one.assert_not_called()
+    mock_get_gridfs.upload_from_stream.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_concurrent_ingestion_item_returns_the_first_candidate(mock_get_database, mock_get_gridfs, mock_ai_services, mock_candidate, mock_resume_file, mock_user):
+    mock_get_database.candidates.find_one.side_effect = [None, mock_candidate]
+    mock_get_database.candidates.insert_one.side_effect = DuplicateKeyError("ingestion_key")
+
+    result = await process_pdf_file(
+        mock_resume_file, "resume.pdf", str(mock_candidate["job_id"]), User(**mock_user), ingestion_key="job:0"
+    )
+
+    assert result["id"] == str(mock_candidate["_id"])
+    assert mock_get_database.candidates.insert_one.call_args.args[0]["ingestion_key"] == "job:0"
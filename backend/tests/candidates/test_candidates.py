@@ -6,6 +6,7 @@ from unittest.mock import patch, AsyncMock, MagicMock
 from bson import ObjectId
 from datetime import datetime
 from fastapi import HTTPException
+from pymongo import ReturnDocument
 
 # Add parent directory to path to allow imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
@@ -13,14 +14,28 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.
 from app.services.candidates import (
     upload_resume,
     process_pdf_file,
+    build_candidate_query,
+    CANDIDATE_FULL_FIELDS,
+    candidate_projection,
+    serialize_candidate,
     get_candidates,
     get_candidate,
+    parse_notice_period_days,
     get_resume_file,
     update_candidate_info,
-    delete_candidate
+    delete_candidate,
+    process_call_results
 )
+from app.core.pagination import keyset_filter, next_cursor
 from app.models.database import User
 
+def job_stats_updates(mock_db):
+    """The jobs.update_one calls changing candidate counters, not the lexical_version"""
+    return [
+        call.args[1] for call in mock_db.jobs.update_one.call_args_list
+        if "lexical_version" not in call.args[1]["$inc"]
+    ]
+
 class MockUser(User):
     def __init__(self, user_dict):
         super().__init__(**user_dict)
@@ -53,7 +68,7 @@ async def test_process_pdf_file(mock_get_database, mock_get_gridfs, mock_resume_
     # Verify the database was called correctly
     mock_db = mock_get_database
     mock_db.candidates.insert_one.assert_called_once()
-    mock_db.jobs.update_one.assert_called_once()
+    assert len(job_stats_updates(mock_db)) == 1
     
     # Verify GridFS was called correctly
     mock_fs = mock_get_gridfs
@@ -81,7 +96,7 @@ async def test_upload_resume_pdf(mock_get_database, mock_get_gridfs, mock_upload
     # Verify the database was called correctly
     mock_db = mock_get_database
     mock_db.candidates.insert_one.assert_called_once()
-    mock_db.jobs.update_one.assert_called_once()
+    assert len(job_stats_updates(mock_db)) == 1
 
 @pytest.mark.asyncio
 async def test_get_candidates(mock_get_database, mock_candidate, mock_job):
@@ -102,6 +117,144 @@ async def test_get_candidates(mock_get_database, mock_candidate, mock_job):
     mock_db = mock_get_database
     mock_db.candidates.find.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_get_candidates_after_cursor(mock_get_database, mock_candidate, mock_job):
+    """Pages continue after the cursor's (created_at, _id), oldest first, without skipping"""
+    job_id = str(mock_job["_id"])
+    find = MagicMock(wraps=mock_get_database.candidates.find)
+    mock_get_database.candidates.find = find
+
+    page = await get_candidates(job_id, limit=1)
+    await get_candidates(job_id, limit=1, cursor=next_cursor(page, 1))
+
+    query = find.call_args.args[0]
+    assert query["job_id"] == mock_job["_id"]
+    assert query["$or"][1]["_id"] == {"$gt": mock_candidate["_id"]}
+
+@pytest.mark.asyncio
+async def test_get_candidates_rejects_invalid_cursor(mock_get_database, mock_job):
+    with pytest.raises(HTTPException) as error:
+        await get_candidates(str(mock_job["_id"]), cursor="garbage")
+
+    assert error.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_get_candidates_sorted_and_filtered(mock_get_database, mock_candidate, mock_job):
+    """Top candidates by score come from a (job_id, resume_score, _id) ordered query"""
+    job_id = str(mock_job["_id"])
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor.skip.return_value = cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=[mock_candidate])
+    mock_get_database.candidates.find = MagicMock(return_value=cursor)
+
+    page = await get_candidates(job_id, limit=1, sort="-resume_score", min_resume_score=70)
+    await get_candidates(job_id, limit=1, cursor=next_cursor(page, 1, "resume_score"),
+                         sort="-resume_score", min_resume_score=70)
+
+    cursor.sort.assert_called_with([("resume_score", -1), ("_id", -1)])
+    query = mock_get_database.candidates.find.call_args.args[0]
+    assert query["resume_score"] == {"$gte": 70}
+    assert query["$or"][0] == {"resume_score": {"$lt": mock_candidate["resume_score"]}}
+
+@pytest.mark.asyncio
+async def test_get_candidates_rejects_unknown_sort(mock_get_database, mock_job):
+    with pytest.raises(HTTPException) as error:
+        await get_candidates(str(mock_job["_id"]), sort="name")
+
+    assert error.value.status_code == 400
+
+def listing_cursor(*candidates):
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor.skip.return_value = cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=list(candidates))
+    return cursor
+
+@pytest.mark.asyncio
+async def test_get_candidates_summary_view(mock_get_database, mock_candidate, mock_job):
+    """The summary view reads only the table's columns and the top skills, never the transcript"""
+    mock_candidate["skills"] = {"Python": 0.8, "SQL": 0.9, "Go": 0.2, "JavaScript": 0.7}
+    mock_get_database.candidates.find = MagicMock(return_value=listing_cursor(mock_candidate))
+
+    result = await get_candidates(str(mock_job["_id"]), view="summary")
+
+    projection = mock_get_database.candidates.find.call_args.args[1]
+    assert "call_transcript" not in projection and "screening_summary" not in projection
+    assert projection["_id"] == projection["skills"] == 1
+    assert result[0]["id"] == str(mock_candidate["_id"])
+    assert result[0]["skills"] == {"SQL": 0.9, "Python": 0.8, "JavaScript": 0.7}
+    assert "screening_summary" not in result[0]
+
+@pytest.mark.asyncio
+async def test_get_candidates_fields(mock_get_database, mock_candidate, mock_job):
+    """Requested fields come with the id and the sort field, which make up the cursor"""
+    mock_get_database.candidates.find = MagicMock(return_value=listing_cursor(mock_candidate))
+
+    result = await get_candidates(str(mock_job["_id"]), sort="-resume_score", fields="name, skills")
+
+    assert mock_get_database.candidates.find.call_args.args[1] == {"_id": 1, "name": 1, "skills": 1, "resume_score": 1}
+    assert result == [{
+        "id": str(mock_candidate["_id"]),
+        "name": mock_candidate["name"],
+        "skills": mock_candidate["skills"],
+        "resume_score": mock_candidate["resume_score"],
+    }]
+
+@pytest.mark.asyncio
+async def test_get_candidates_rejects_unknown_fields(mock_get_database, mock_job):
+    for params in ({"fields": "name,call_transcript"}, {"view": "compact"}):
+        with pytest.raises(HTTPException) as error:
+            await get_candidates(str(mock_job["_id"]), **params)
+        assert error.value.status_code == 400
+
+def test_full_view_projection_covers_serialize_candidate(mock_candidate):
+    del mock_candidate["call_transcript"]
+    projection = candidate_projection(CANDIDATE_FULL_FIELDS)
+    projected = {key: value for key, value in mock_candidate.items() if key in projection}
+
+    assert tuple(serialize_candidate(projected)) == CANDIDATE_FULL_FIELDS
+    assert "call_transcript" not in projection
+
+def test_build_candidate_query(mock_job):
+    job_id = str(mock_job["_id"])
+
+    assert build_candidate_query(job_id, min_screening_score=70, screening_status="screened", max_notice_days=30) == {
+        "job_id": mock_job["_id"],
+        "screening_score": {"$gte": 70, "$ne": None},
+        "notice_period_days": {"$lte": 30},
+    }
+    assert build_candidate_query(job_id, screening_status="not_screened") == {
+        "job_id": mock_job["_id"],
+        "screening_score": {"$eq": None},
+        "screening_in_progress": {"$ne": True},
+    }
+    with pytest.raises(HTTPException):
+        build_candidate_query(job_id, screening_status="done")
+
+def test_keyset_filter_reaches_unscreened_candidates():
+    """Descending by score, candidates without a score come last and are not skipped"""
+    item = {"id": str(ObjectId()), "screening_score": 80.0}
+    unscored = {"id": str(ObjectId()), "screening_score": None}
+
+    assert {"screening_score": None} in keyset_filter(next_cursor([item], 1, "screening_score"), "screening_score", -1)["$or"]
+    assert keyset_filter(next_cursor([unscored], 1, "screening_score"), "screening_score", -1) == {
+        "$or": [{"screening_score": None, "_id": {"$lt": ObjectId(unscored["id"])}}]
+    }
+    assert {"screening_score": {"$ne": None}} in keyset_filter(
+        next_cursor([unscored], 1, "screening_score"), "screening_score", 1
+    )["$or"]
+
+@pytest.mark.parametrize("notice_period, days", [
+    ("30 days", 30),
+    ("2 months", 60),
+    ("Two weeks", 14),
+    ("1.5 months", 45),
+    ("immediate", 0),
+    ("Unknown", None),
+    (None, None),
+])
+def test_parse_notice_period_days(notice_period, days):
+    assert parse_notice_period_days(notice_period) == days
+
 @pytest.mark.asyncio
 async def test_get_candidate(mock_get_database, mock_candidate, mock_job):
     """Test getting a specific candidate"""
@@ -196,4 +349,34 @@ async def test_delete_candidate(mock_get_database, mock_candidate):
     
     # Verify the database was called correctly
     mock_db.candidates.delete_one.assert_called_once()
-    mock_db.jobs.update_one.assert_called_once() 
\ No newline at end of file
+    assert len(job_stats_updates(mock_db)) == 1
+
+    # The candidate had a resume score but no screening score
+    update = job_stats_updates(mock_db)[0]
+    assert update == {"$inc": {"total_candidates": -1, "resume_screened": -1}}
+    mock_db.job_stats.update_one.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_repeated_call_webhooks_count_one_phone_screening(mock_get_database, mock_candidate):
+    """The previous score comes from the same atomic update, so a redelivered webhook is not counted twice"""
+    db = mock_get_database
+    job_id = str(mock_candidate["job_id"])
+    db.call_sessions.find_one.return_value = {
+        "call_id": "CA1", "candidate_id": str(mock_candidate["_id"]), "job_id": job_id, "ultravox_call_id": "uv-1"
+    }
+    db.candidates.find_one_and_update.side_effect = [{"screening_score": None}, {"screening_score": 85}]
+    response = MagicMock()
+    response.json.return_value = {"summary": "Interested", "messages": []}
+    client = AsyncMock()
+    client.__aenter__.return_value = client
+    client.get.return_value = response
+
+    with patch("app.services.candidates.httpx.AsyncClient", return_value=client), \
+         patch("app.services.candidates.asyncio.sleep", AsyncMock()), \
+         patch("app.services.candidates.analyze_call_transcript", AsyncMock(return_value={"screening_score": 85})), \
+         patch("app.services.candidates.record_stats_change", AsyncMock()) as record:
+        await process_call_results({"CallSid": "CA1"})
+        await process_call_results({"CallSid": "CA1"})
+
+    record.assert_awaited_once_with(job_id, phone_screened=1)
+    assert db.candidates.find_one_and_update.call_args.kwargs["return_document"] == ReturnDocument.BEFORE
@@ -0,0 +1,196 @@
+import pytest
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from bson import ObjectId
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.database import User
+from app.services.candidates import create_candidate, process_pdf_file
+from app.services.lexical_index import JobIndex, _indexes, clear_lexical_indexes, get_job_index, term_counts, tokenize
+
+QUERY = "Senior Python engineer. Requirements: Python, FastAPI, MongoDB, Docker"
+
+def add(index, candidate_id, text):
+    counts = term_counts(text)
+    index.add(candidate_id, list(counts), list(counts.values()))
+
+class AsyncCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+@pytest.fixture(autouse=True)
+def fresh_indexes():
+    clear_lexical_indexes()
+    yield
+    clear_lexical_indexes()
+
+def test_tokenize_keeps_technical_terms():
+    assert tokenize("Built APIs in C++, C# and Node.js on .NET; knows R and the AWS stack.") == \
+        ["built", "apis", "c++", "c#", "node.js", "net", "knows", "r", "aws", "stack"]
+
+def test_rank_orders_by_relevance():
+    index = JobIndex()
+    add(index, "python", "Python engineer building FastAPI services on MongoDB, deployed with Docker")
+    add(index, "partial", "Java developer with some Python scripting experience")
+    add(index, "unrelated", "Registered nurse with ten years of ward experience")
+
+    ranked = index.rank(QUERY)
+
+    assert [candidate_id for candidate_id, _ in ranked] == ["python", "partial"]
+    assert ranked[0][1] > ranked[1][1] > 0
+
+def test_rank_limit_returns_best_candidates():
+    index = JobIndex()
+    for i in range(20):
+        add(index, f"c{i}", "python " * (i + 1) + "filler text about something else " * 5)
+
+    ranked = index.rank("python", limit=3)
+
+    assert [candidate_id for candidate_id, _ in ranked] == ["c19", "c18", "c17"]
+
+def test_rank_is_incremental():
+    index = JobIndex()
+    add(index, "first", "Go developer")
+    assert index.rank("python") == []
+
+    add(index, "second", "Python developer")
+    assert [candidate_id for candidate_id, _ in index.rank("python")] == ["second"]
+
+def test_rank_thousands_of_candidates_quickly():
+    rng = random.Random(0)
+    vocabulary = [f"term{i}" for i in range(5000)] + ["python", "fastapi", "mongodb", "docker"]
+    index = JobIndex()
+    for i in range(5000):
+        add(index, str(i), " ".join(rng.choices(vocabulary, k=300)))
+    index.rank(QUERY)  # Builds the matrix
+
+    started = time.perf_counter()
+    ranked = index.rank(QUERY, limit=50)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert len(ranked) == 50
+    assert elapsed_ms < 100
+
+@pytest.mark.asyncio
+async def test_get_job_index_syncs_with_stored_terms(mock_get_database):
+    job_id = str(ObjectId())
+    docs = {
+        ObjectId(): {"terms": ["python"], "counts": [3]},
+        ObjectId(): {"terms": ["java"], "counts": [2]},
+    }
+
+    def find(query, projection=None):
+        ids = query["_id"]["$in"] if "_id" in query else list(docs)
+        return AsyncCursor([{"_id": _id, **docs[_id]} for _id in ids if _id in docs])
+
+    mock_get_database.resume_terms.find = find
+    mock_get_database.jobs.find_one.return_value = {"lexical_version": 1}
+    index = await get_job_index(job_id)
+    assert len(index) == 2
+
+    # A new candidate is added without a rebuild
+    docs[ObjectId()] = {"terms": ["python", "go"], "counts": [1, 1]}
+    mock_get_database.jobs.find_one.return_value = {"lexical_version": 2}
+    rebuilds_before = metrics.counter("lexical_index_rebuilds").value
+    assert await get_job_index(job_id) is index
+    assert len(index) == 3
+
+    # A deleted candidate triggers a rebuild
+    del docs[next(iter(docs))]
+    mock_get_database.jobs.find_one.return_value = {"lexical_version": 3}
+    index = await get_job_index(job_id)
+    assert len(index) == 2
+    assert metrics.counter("lexical_index_rebuilds").value == rebuilds_before + 1
+
+@pytest.mark.asyncio
+async def test_get_job_index_skips_sync_when_version_is_unchanged(mock_get_database):
+    job_id = str(ObjectId())
+    scans = []
+
+    def find(query, projection=None):
+        scans.append(query)
+        return AsyncCursor([])
+
+    mock_get_database.resume_terms.find = find
+    mock_get_database.jobs.find_one.return_value = {"lexical_version": 4}
+    index = await get_job_index(job_id)
+    assert await get_job_index(job_id) is index
+    assert len(scans) == 1
+
+    mock_get_database.jobs.find_one.return_value = {"lexical_version": 5}
+    await get_job_index(job_id)
+    assert len(scans) == 2
+
+@pytest.mark.asyncio
+async def test_least_recently_ranked_jobs_are_dropped(mock_get_database):
+    mock_get_database.resume_terms.find = lambda query, projection=None: AsyncCursor([])
+    jobs = [str(ObjectId()) for _ in range(3)]
+    evictions_before = metrics.counter("lexical_index_evictions").value
+
+    with patch.object(settings, "LEXICAL_INDEX_MAX_JOBS", 2):
+        await get_job_index(jobs[0])
+        await get_job_index(jobs[1])
+        await get_job_index(jobs[0])
+        await get_job_index(jobs[2])
+
+    assert list(_indexes) == [jobs[0], jobs[2]]
+    assert metrics.counter("lexical_index_evictions").value == evictions_before + 1
+
+@pytest.mark.asyncio
+async def test_new_candidates_are_indexed(mock_get_database, mock_get_gridfs, mock_ai_services, mock_resume_file, mock_user):
+    result = await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    stored = mock_get_database.resume_terms.replace_one.call_args.args[1]
+    assert str(stored["_id"]) == result["id"]
+    assert len(stored["terms"]) == len(stored["counts"])
+    mock_get_database.jobs.update_one.assert_any_await(
+        {"_id": stored["job_id"]}, {"$inc": {"lexical_version": 1}}
+    )
+
+@pytest.mark.asyncio
+async def test_terms_are_indexed_before_analysis(mock_get_database, mock_get_gridfs, mock_resume_file, mock_user):
+    async def screen_resume(*args):
+        mock_get_database.resume_terms.replace_one.assert_called_once()
+        raise RuntimeError("analysis failed")
+
+    with patch("app.services.candidates.screen_resume", screen_resume), \
+         patch("app.services.candidates.get_job_context", AsyncMock(return_value="")), \
+         patch("app.services.candidates.get_screening_cascade", AsyncMock(return_value=None)):
+        with pytest.raises(RuntimeError):
+            await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    # No candidate was created, so its terms are removed again
+    stored = mock_get_database.resume_terms.replace_one.call_args.args[1]
+    mock_get_database.resume_terms.delete_one.assert_called_once_with({"_id": stored["_id"]})
+
+@pytest.mark.asyncio
+async def test_single_uploads_are_indexed(mock_get_database, mock_get_gridfs, mock_ai_services, mock_resume_file):
+    """Candidates created outside the ingestion path are ranked too"""
+    candidate_id = ObjectId()
+    mock_get_database.candidates.insert_one.return_value = SimpleNamespace(inserted_id=candidate_id)
+    upload = SimpleNamespace(filename="resume.pdf", read=AsyncMock(return_value=mock_resume_file))
+
+    with patch("app.services.candidates.record_candidate_added", AsyncMock()):
+        await create_candidate(str(ObjectId()), upload)
+
+    stored = mock_get_database.resume_terms.replace_one.call_args.args[1]
+    assert stored["_id"] == candidate_id
+    assert len(stored["terms"]) == len(stored["counts"])
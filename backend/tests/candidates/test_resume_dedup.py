@@ -0,0 +1,215 @@
+import pytest
+import hashlib
+import os
+import sys
+from unittest.mock import patch, AsyncMock
+from bson import ObjectId
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.metrics import metrics
+from app.services.candidates import delete_candidate, process_pdf_file
+from app.services.resume_blobs import analysis_scope, invalidate_resume_analyses, release_resume_file
+from app.services.resume_parser import ParsedResume
+from app.models.database import User
+
+BASIC_INFO = {"name": "Test Candidate", "email": "test.candidate@example.com", "phone": "+1234567890", "location": "Test Location"}
+ANALYSIS = {"skills": {"Python": 0.8}, "score": 85.0}
+
+@pytest.fixture
+def mock_pipeline():
+    """Mock parsing and AI analysis so calls can be counted"""
+    parse = AsyncMock(return_value=ParsedResume(text="resume", page_count=1, sha256="x"))
+    analyze = AsyncMock(return_value=(BASIC_INFO, ANALYSIS))
+    with patch("app.services.candidates.parse_resume_async", parse), \
+         patch("app.services.candidates.extract_and_analyze_resume", analyze):
+        yield {"parse": parse, "analyze": analyze}
+
+def stored_blob(content, file_id, analyses):
+    return {"_id": hashlib.sha256(content).hexdigest(), "file_id": file_id, "analyses": analyses}
+
+@pytest.mark.asyncio
+async def test_duplicate_resume_reuses_file_and_analysis(mock_get_database, mock_get_gridfs, mock_pipeline, mock_resume_file, mock_user):
+    """A hit skips parsing, LLM calls and the GridFS upload"""
+    file_id = str(ObjectId())
+    mock_get_database.resume_blobs.find_one.return_value = stored_blob(
+        mock_resume_file, file_id, {analysis_scope(str(ObjectId())): {"basic_info": BASIC_INFO, "analysis": ANALYSIS}}
+    )
+    hits_before = metrics.counter("resume_dedup_hits").value
+
+    result = await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    mock_pipeline["parse"].assert_not_called()
+    mock_pipeline["analyze"].assert_not_called()
+    mock_get_gridfs.upload_from_stream.assert_not_called()
+    assert result["resume_file_id"] == file_id
+    assert result["resume_score"] == 85.0
+    assert metrics.counter("resume_dedup_hits").value == hits_before + 1
+
+@pytest.mark.asyncio
+async def test_reused_file_takes_a_reference(mock_get_database, mock_get_gridfs, mock_pipeline, mock_resume_file, mock_user):
+    """Reuse increments the blob's refs atomically instead of only reading it"""
+    file_id = str(ObjectId())
+    blob = stored_blob(mock_resume_file, file_id, {})
+    mock_get_database.resume_blobs.find_one.return_value = blob
+
+    await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    query, update = mock_get_database.resume_blobs.find_one_and_update.call_args.args
+    assert query == {"_id": blob["_id"]}
+    assert update["$inc"] == {"refs": 1}
+    mock_get_gridfs.upload_from_stream.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_blob_removed_since_lookup_stores_the_file_again(mock_get_database, mock_get_gridfs, mock_pipeline, mock_resume_file, mock_user):
+    """If the last candidate using the file was deleted meanwhile, the upload keeps its own copy"""
+    mock_get_database.resume_blobs.find_one.return_value = stored_blob(mock_resume_file, str(ObjectId()), {})
+
+    async def update_blob(query, update, **kwargs):
+        if "$setOnInsert" in update:
+            return {"_id": query["_id"], **update["$setOnInsert"], "refs": 1}
+        return None
+
+    mock_get_database.resume_blobs.find_one_and_update.side_effect = update_blob
+
+    result = await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    mock_get_gridfs.upload_from_stream.assert_called_once()
+    assert result["resume_file_id"] == str(mock_get_gridfs.upload_from_stream.return_value)
+
+@pytest.mark.asyncio
+async def test_failed_upload_releases_its_reference(mock_get_database, mock_get_gridfs, mock_pipeline, mock_resume_file, mock_user):
+    """A candidate that is never created does not keep the file alive"""
+    mock_get_database.candidates.insert_one.side_effect = RuntimeError("insert failed")
+    mock_get_database.candidates.count_documents.return_value = 0
+    mock_get_database.resume_blobs.delete_one.return_value.deleted_count = 1
+
+    with pytest.raises(RuntimeError):
+        await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    assert mock_get_database.resume_blobs.find_one_and_update.call_args.args[1] == {"$inc": {"refs": -1}}
+    mock_get_gridfs.delete.assert_called_once_with(mock_get_gridfs.upload_from_stream.return_value)
+
+@pytest.mark.asyncio
+async def test_release_keeps_file_with_other_references(mock_get_database):
+    mock_get_database.resume_blobs.find_one_and_update.side_effect = None
+    mock_get_database.resume_blobs.find_one_and_update.return_value = {"_id": "abc", "file_id": "f", "refs": 1}
+
+    assert await release_resume_file("abc", "f") is False
+    mock_get_database.resume_blobs.delete_one.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_release_deletes_blob_at_zero_references(mock_get_database):
+    mock_get_database.resume_blobs.find_one_and_update.side_effect = None
+    mock_get_database.resume_blobs.find_one_and_update.return_value = {"_id": "abc", "file_id": "f", "refs": 0}
+    mock_get_database.candidates.count_documents.return_value = 0
+    mock_get_database.resume_blobs.delete_one.return_value.deleted_count = 1
+
+    assert await release_resume_file("abc", "f") is True
+    query = mock_get_database.resume_blobs.delete_one.call_args.args[0]
+    assert query == {"_id": "abc", "file_id": "f", "refs": {"$not": {"$gt": 0}}}
+
+@pytest.mark.asyncio
+async def test_release_keeps_file_reused_concurrently(mock_get_database):
+    """An upload that took a reference after the count reached zero keeps the file"""
+    mock_get_database.resume_blobs.find_one_and_update.side_effect = None
+    mock_get_database.resume_blobs.find_one_and_update.return_value = {"_id": "abc", "file_id": "f", "refs": 0}
+    mock_get_database.candidates.count_documents.return_value = 0
+    mock_get_database.resume_blobs.delete_one.return_value.deleted_count = 0
+    mock_get_database.resume_blobs.count_documents.return_value = 1
+
+    assert await release_resume_file("abc", "f") is False
+
+@pytest.mark.asyncio
+async def test_delete_candidate_deletes_file_after_last_reference(mock_get_database, mock_get_gridfs, mock_candidate):
+    file_id = str(ObjectId())
+    mock_get_database.candidates.find_one.return_value = {**mock_candidate, "resume_file_id": file_id, "resume_sha256": "abc"}
+    mock_get_database.resume_blobs.find_one.return_value = {"_id": "abc", "file_id": file_id, "refs": 1}
+    mock_get_database.candidates.count_documents.return_value = 0
+    mock_get_database.resume_blobs.delete_one.return_value.deleted_count = 1
+
+    await delete_candidate(str(mock_candidate["_id"]))
+
+    mock_get_gridfs.delete.assert_called_once_with(ObjectId(file_id))
+
+@pytest.mark.asyncio
+async def test_new_resume_is_registered_and_cached(mock_get_database, mock_get_gridfs, mock_pipeline, mock_resume_file, mock_user):
+    """A miss runs the pipeline, stores the file once and caches the results"""
+    misses_before = metrics.counter("resume_dedup_misses").value
+
+    await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    mock_pipeline["analyze"].assert_called_once()
+    mock_get_gridfs.upload_from_stream.assert_called_once()
+    mock_get_database.resume_blobs.find_one_and_update.assert_called_once()
+    saved = mock_get_database.resume_blobs.update_one.call_args.args[1]["$set"]
+    entry = saved[f"analyses.{analysis_scope(str(ObjectId()))}"]
+    assert entry["analysis"] == ANALYSIS
+    assert "resume-combined-v3" in entry["prompt_versions"]
+    inserted = mock_get_database.candidates.insert_one.call_args.args[0]
+    assert inserted["resume_sha256"] == hashlib.sha256(mock_resume_file).hexdigest()
+    assert metrics.counter("resume_dedup_misses").value == misses_before + 1
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_shares_winning_file(mock_get_database, mock_get_gridfs, mock_pipeline, mock_resume_file, mock_user):
+    """When another upload registered the same bytes first, our copy is deleted"""
+    winner_id = str(ObjectId())
+
+    async def register_blob(query, update, **kwargs):
+        return {"_id": query["_id"], "file_id": winner_id, "analyses": {}}
+
+    mock_get_database.resume_blobs.find_one_and_update.side_effect = register_blob
+
+    result = await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    mock_get_gridfs.delete.assert_called_once()
+    assert result["resume_file_id"] == winner_id
+
+@pytest.mark.asyncio
+async def test_job_scope_reanalyzes_for_other_jobs(mock_get_database, mock_get_gridfs, mock_pipeline, mock_resume_file, mock_user):
+    """With per-job scope the stored file is reused but the analysis is redone"""
+    file_id = str(ObjectId())
+    mock_get_database.resume_blobs.find_one.return_value = stored_blob(
+        mock_resume_file, file_id, {analysis_scope(str(ObjectId())): {"basic_info": BASIC_INFO, "analysis": ANALYSIS}}
+    )
+
+    with patch("app.services.resume_blobs.settings.RESUME_DEDUP_SCOPE", "job"):
+        mock_get_database.resume_blobs.find_one.return_value = stored_blob(
+            mock_resume_file, file_id, {analysis_scope(str(ObjectId())): {"basic_info": BASIC_INFO, "analysis": ANALYSIS}}
+        )
+        result = await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    mock_pipeline["analyze"].assert_called_once()
+    mock_get_gridfs.upload_from_stream.assert_not_called()
+    assert result["resume_file_id"] == file_id
+
+@pytest.mark.asyncio
+async def test_model_route_change_reanalyzes(mock_get_database, mock_get_gridfs, mock_pipeline, mock_resume_file, mock_user):
+    """Analyses made by another model are not reused"""
+    file_id = str(ObjectId())
+    mock_get_database.resume_blobs.find_one.return_value = stored_blob(
+        mock_resume_file, file_id, {analysis_scope(str(ObjectId())): {"basic_info": BASIC_INFO, "analysis": ANALYSIS}}
+    )
+
+    with patch("app.services.llm.settings.AI_DEFAULT_MODEL", "other-model"):
+        await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    mock_pipeline["analyze"].assert_called_once()
+    mock_get_gridfs.upload_from_stream.assert_not_called()
+
+def test_prompt_version_bump_changes_scope():
+    """A new prompt version gives a new scope"""
+    job_id = str(ObjectId())
+    scope = analysis_scope(job_id)
+    with patch("app.services.ai.RESUME_ANALYSIS_PROMPTS", (("resume_combined", "resume-combined-v4"),)):
+        assert analysis_scope(job_id) != scope
+
+@pytest.mark.asyncio
+async def test_invalidate_resume_analyses(mock_get_database):
+    """Stored analyses are dropped by prompt version"""
+    mock_get_database.resume_blobs.update_many.return_value.modified_count = 2
+
+    assert await invalidate_resume_analyses("resume-combined-v3") == 2
+    pipeline = mock_get_database.resume_blobs.update_many.call_args.args[1]
+    assert "resume-combined-v3" in str(pipeline)
@@ -0,0 +1,83 @@
+import pytest
+import hashlib
+import os
+import sys
+from unittest.mock import patch, AsyncMock
+from bson import ObjectId
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from io import BytesIO
+from PyPDF2 import PdfWriter
+from app.services.resume_parser import (
+    parse_resume, parse_resume_async, shutdown_parser_pool, ParsedResume, ResumeParseError
+)
+from app.services.candidates import process_pdf_file
+from app.models.database import User
+
+def test_parse_resume_reads_pages_and_hash(mock_resume_file):
+    """The PDF is parsed from memory and fingerprinted"""
+    resume = parse_resume(mock_resume_file, "test_resume.pdf")
+
+    assert resume.page_count == 1
+    assert resume.sha256 == hashlib.sha256(mock_resume_file).hexdigest()
+    assert resume.filename == "test_resume.pdf"
+
+def test_parse_resume_tolerates_invalid_pdf():
+    """Unreadable files produce an empty document instead of an error"""
+    resume = parse_resume(b"not a pdf")
+
+    assert resume.text == ""
+    assert resume.page_count == 0
+    assert resume.sha256 == hashlib.sha256(b"not a pdf").hexdigest()
+
+@pytest.mark.asyncio
+async def test_process_pdf_file_parses_once(mock_get_database, mock_get_gridfs, mock_resume_file, mock_user):
+    """Extraction and analysis share a single parsed document"""
+    parsed = ParsedResume(text="Jane Doe\nPython", page_count=1, sha256="abc")
+    analyze = AsyncMock(return_value=(
+        {"name": "Jane Doe", "email": "jane@example.com"},
+        {"skills": {"python": 0.9}, "score": 90.0}
+    ))
+
+    with patch("app.services.candidates.parse_resume_async", AsyncMock(return_value=parsed)) as mock_parse, \
+         patch("app.services.candidates.extract_and_analyze_resume", analyze):
+        result = await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    mock_parse.assert_called_once_with(mock_resume_file, "resume.pdf")
+    assert analyze.call_args.args[0] is parsed
+    assert result["name"] == "Jane Doe"
+
+def test_parse_resume_limits_pages():
+    """Only the first max_pages pages are extracted"""
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=612, height=792)
+    buffer = BytesIO()
+    writer.write(buffer)
+
+    resume = parse_resume(buffer.getvalue(), max_pages=2)
+
+    assert resume.page_count == 3
+    assert resume.metadata["pages_parsed"] == 2
+
+@pytest.mark.asyncio
+async def test_parse_resume_async_uses_process_pool(mock_resume_file):
+    resume = await parse_resume_async(mock_resume_file, "test_resume.pdf")
+
+    assert resume.page_count == 1
+    assert resume.filename == "test_resume.pdf"
+
+@pytest.mark.asyncio
+async def test_parse_resume_async_kills_slow_parses(mock_resume_file):
+    """A parse exceeding the timeout fails instead of stalling the caller"""
+    # A cold pool has to spawn its processes, which takes far longer than the timeout
+    shutdown_parser_pool()
+    with patch("app.services.resume_parser.settings.PDF_PARSE_TIMEOUT", 0.001):
+        with pytest.raises(ResumeParseError):
+            await parse_resume_async(mock_resume_file)
+
+    # A fresh pool is started for the next document
+    resume = await parse_resume_async(mock_resume_file)
+    assert resume.page_count == 1
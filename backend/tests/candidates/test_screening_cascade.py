@@ -0,0 +1,126 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch, AsyncMock
+from bson import ObjectId
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.config import settings
+from app.services.candidates import process_pdf_file, promote_candidate
+from app.services.resume_parser import ParsedResume
+from app.models.database import User
+
+BASIC_INFO = {"name": "Test Candidate", "email": "test.candidate@example.com", "phone": "+1234567890", "location": "Test Location"}
+ANALYSIS = {"skills": {"Python": 0.8}, "score": 85.0}
+
+@pytest.fixture
+def cascade_pipeline():
+    """Enable the cascade and mock parsing and every AI stage"""
+    parse = AsyncMock(return_value=ParsedResume(text="resume", page_count=1, sha256="x"))
+    coarse = AsyncMock(return_value=20.0)
+    extract = AsyncMock(return_value=BASIC_INFO)
+    analyze = AsyncMock(return_value=(BASIC_INFO, ANALYSIS))
+    with patch.object(settings, "SCREENING_CASCADE_ENABLED", True), \
+         patch.object(settings, "SCREENING_CASCADE_THRESHOLD", 40.0), \
+         patch("app.services.candidates.parse_resume_async", parse), \
+         patch("app.services.candidates.coarse_screen", coarse), \
+         patch("app.services.candidates.extract_resume_info", extract), \
+         patch("app.services.candidates.extract_and_analyze_resume", analyze):
+        yield {"parse": parse, "coarse": coarse, "extract": extract, "analyze": analyze}
+
+@pytest.mark.asyncio
+async def test_low_coarse_score_skips_full_analysis(mock_get_database, mock_get_gridfs, cascade_pipeline, mock_resume_file, mock_user):
+    result = await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    cascade_pipeline["coarse"].assert_awaited_once()
+    assert cascade_pipeline["coarse"].await_args.args[1] == "Test requirements"
+    cascade_pipeline["extract"].assert_awaited_once()
+    cascade_pipeline["analyze"].assert_not_called()
+    inserted = mock_get_database.candidates.insert_one.call_args.args[0]
+    assert inserted["screening_tier"] == "coarse"
+    assert inserted["coarse_score"] == 20.0
+    assert inserted["resume_score"] is None
+    assert inserted["skills"] == {}
+    assert result["screening_tier"] == "coarse"
+    assert result["resume_score"] is None
+    # Coarse results are not cached as the resume's analysis
+    mock_get_database.resume_blobs.update_one.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_shortlisted_resume_gets_full_analysis(mock_get_database, mock_get_gridfs, cascade_pipeline, mock_resume_file, mock_user):
+    cascade_pipeline["coarse"].return_value = 75.0
+
+    await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    cascade_pipeline["analyze"].assert_awaited_once()
+    inserted = mock_get_database.candidates.insert_one.call_args.args[0]
+    assert inserted["screening_tier"] == "full"
+    assert inserted["coarse_score"] == 75.0
+    assert inserted["resume_score"] == 85.0
+
+@pytest.mark.asyncio
+async def test_job_threshold_overrides_default(mock_get_database, mock_get_gridfs, cascade_pipeline, mock_job, mock_resume_file, mock_user):
+    mock_get_database.jobs.find_one.return_value = {**mock_job, "screening_threshold": 10}
+
+    await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    cascade_pipeline["analyze"].assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_cascade_disabled_runs_full_analysis(mock_get_database, mock_get_gridfs, cascade_pipeline, mock_resume_file, mock_user):
+    with patch.object(settings, "SCREENING_CASCADE_ENABLED", False):
+        await process_pdf_file(mock_resume_file, "resume.pdf", str(ObjectId()), User(**mock_user))
+
+    cascade_pipeline["coarse"].assert_not_called()
+    inserted = mock_get_database.candidates.insert_one.call_args.args[0]
+    assert inserted["screening_tier"] == "full"
+    assert inserted["coarse_score"] is None
+
+@pytest.mark.asyncio
+async def test_promote_runs_full_analysis(mock_get_database, cascade_pipeline, mock_candidate):
+    coarse_candidate = {**mock_candidate, "screening_tier": "coarse", "coarse_score": 20.0, "skills": {}, "resume_score": None}
+    mock_get_database.candidates.find_one.return_value = coarse_candidate
+
+    async def find_one_and_update(query, update, **kwargs):
+        return {**coarse_candidate, **update["$set"]}
+
+    mock_get_database.candidates.find_one_and_update.side_effect = find_one_and_update
+    get_file = AsyncMock(return_value=(b"%PDF", "resume.pdf"))
+    record = AsyncMock()
+
+    with patch("app.services.candidates.get_resume_file", get_file), \
+         patch("app.services.candidates.record_stats_change", record):
+        result = await promote_candidate(str(mock_candidate["job_id"]), str(mock_candidate["_id"]))
+
+    cascade_pipeline["analyze"].assert_awaited_once()
+    assert result["screening_tier"] == "full"
+    assert result["resume_score"] == 85.0
+    assert result["skills"] == {"Python": 0.8}
+    assert result["coarse_score"] == 20.0
+    assert mock_get_database.candidates.find_one_and_update.call_args.args[0]["screening_tier"] == "coarse"
+    record.assert_awaited_once_with(str(mock_candidate["job_id"]), resume_screened=1)
+
+@pytest.mark.asyncio
+async def test_concurrent_promotion_counts_once(mock_get_database, cascade_pipeline, mock_candidate):
+    """When another request promoted the candidate first, the stats are left alone"""
+    coarse_candidate = {**mock_candidate, "screening_tier": "coarse", "coarse_score": 20.0, "skills": {}, "resume_score": None}
+    mock_get_database.candidates.find_one.side_effect = [coarse_candidate, mock_candidate]
+    mock_get_database.candidates.find_one_and_update.return_value = None
+    record = AsyncMock()
+
+    with patch("app.services.candidates.get_resume_file", AsyncMock(return_value=(b"%PDF", "resume.pdf"))), \
+         patch("app.services.candidates.record_stats_change", record):
+        result = await promote_candidate(str(mock_candidate["job_id"]), str(mock_candidate["_id"]))
+
+    record.assert_not_called()
+    assert result["screening_tier"] == "full"
+
+@pytest.mark.asyncio
+async def test_promote_leaves_fully_analyzed_candidates(mock_get_database, cascade_pipeline, mock_candidate):
+    result = await promote_candidate(str(mock_candidate["job_id"]), str(mock_candidate["_id"]))
+
+    cascade_pipeline["analyze"].assert_not_called()
+    assert result["screening_tier"] == "full"
+    assert result["resume_score"] == 85.0
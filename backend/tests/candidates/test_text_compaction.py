@@ -0,0 +1,120 @@
+import os
+import sys
+from io import BytesIO
+from unittest.mock import patch
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from PyPDF2 import PageObject, PdfWriter
+from app.services.text_compaction import (
+    TRUNCATION_MARKER, chunk_text, compact_pages, dedupe_lines, drop_page_furniture, estimate_tokens,
+    fit_to_budget, normalize_page, outline_sections
+)
+from app.services.resume_parser import parse_resume
+
+def test_normalize_page_joins_hyphenation_and_whitespace():
+    text = "Senior   soft-\nware  engineer\r\n\n\n\n  Built APIs  "
+
+    assert normalize_page(text) == "Senior software engineer\n\nBuilt APIs"
+
+def test_repeated_headers_and_footers_are_dropped():
+    """Page furniture is removed from every page but the first"""
+    bodies = ["Led the payments team", "Built the search backend", "Migrated services to Kubernetes"]
+    pages = [
+        f"Jane Doe - Curriculum Vitae\n{body}\nPage {n} of 3"
+        for n, body in enumerate(bodies, start=1)
+    ]
+
+    result = drop_page_furniture(pages)
+
+    assert result[0] == pages[0]
+    assert result[1] == "Built the search backend"
+    assert result[2] == "Migrated services to Kubernetes"
+
+def test_dedupe_keeps_short_repeated_lines():
+    text = "Worked on the billing platform migration\nPython\nWorked on the billing platform migration\nPython"
+
+    assert dedupe_lines(text) == "Worked on the billing platform migration\nPython\nPython"
+
+def test_budget_shortens_publications_before_truncating():
+    publications = "\n".join(f"Paper {n}: A study of distributed systems at scale" for n in range(200))
+    text = f"Jane Doe\nEXPERIENCE\nStaff engineer at Example Corp\nPublications\n{publications}\nSkills\nPython, Go"
+
+    result = fit_to_budget(text, 120)
+
+    assert "Staff engineer at Example Corp" in result
+    assert "Python, Go" in result
+    assert "[... 197 more entries omitted ...]" in result
+    assert TRUNCATION_MARKER not in result
+    assert estimate_tokens(result) <= 120
+
+def test_budget_truncates_as_last_resort():
+    text = "\n".join(f"Responsibility number {n} for the platform team" for n in range(500))
+
+    result = fit_to_budget(text, 200)
+
+    assert result.endswith(TRUNCATION_MARKER)
+    assert result.startswith("Responsibility number 0")
+    assert estimate_tokens(result) <= 200
+
+def test_compact_pages_reports_tokens_saved():
+    pages = ["Header line\n\n\nSome   text here", "Header line\nOther text"]
+
+    text, stats = compact_pages(pages)
+
+    assert text == "Header line\n\nSome text here\nOther text\n"
+    assert stats["tokens_after"] < stats["tokens_before"]
+
+def test_parse_resume_compacts_text(mock_resume_file):
+    resume = parse_resume(mock_resume_file, "resume.pdf", compact=True, token_budget=3000)
+
+    assert resume.metadata["tokens_after"] <= resume.metadata["tokens_before"]
+    assert "  " not in resume.text
+
+LONG_CV = "\n".join(
+    ["Dr. Jane Doe", "Research Software Engineer", "Experience"]
+    + [f"Built simulation pipeline number {i} in Python and C++" for i in range(60)]
+    + ["Education", "PhD Computational Physics", "Publications"]
+    + [f"Doe J. et al. A study of topic {i}. Journal of Things, 20{i:02d}" for i in range(80)]
+)
+
+def test_chunk_text_respects_budget_and_keeps_all_lines():
+    chunks = chunk_text(LONG_CV, 300)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 300 for chunk in chunks)
+    assert [line for chunk in chunks for line in chunk.split("\n") if line] == LONG_CV.split("\n")
+
+def test_chunk_text_packs_sections_whole():
+    """A section that fits a chunk is never split; only sections longer than a chunk are"""
+    text = "\n".join(["Dr. Jane Doe", "Skills", "Python, C++", "Education", "PhD Computational Physics"])
+
+    assert chunk_text(text, 14) == ["Dr. Jane Doe\n\nSkills\nPython, C++", "Education\nPhD Computational Physics"]
+    assert chunk_text(LONG_CV, 300)[0].startswith("Dr. Jane Doe\nResearch Software Engineer\n\nExperience\n")
+
+def test_outline_sections_keeps_first_lines_of_each_section():
+    outline = outline_sections(LONG_CV, keep_lines=2)
+
+    assert outline.split("\n\n") == [
+        "Dr. Jane Doe\nResearch Software Engineer",
+        "Experience\nBuilt simulation pipeline number 0 in Python and C++\n"
+        "Built simulation pipeline number 1 in Python and C++\n...",
+        "Education\nPhD Computational Physics",
+        "Publications\nDoe J. et al. A study of topic 0. Journal of Things, 2000\n"
+        "Doe J. et al. A study of topic 1. Journal of Things, 2001\n...",
+    ]
+
+def test_parse_resume_keeps_full_text_of_long_resumes():
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    buffer = BytesIO()
+    writer.write(buffer)
+
+    with patch.object(PageObject, "extract_text", return_value=LONG_CV):
+        long = parse_resume(buffer.getvalue(), compact=True, token_budget=200, full_token_budget=3000)
+        short = parse_resume(buffer.getvalue(), compact=True, token_budget=3000, full_token_budget=6000)
+
+    assert estimate_tokens(long.text) <= 200
+    assert long.full_text == short.text == LONG_CV + "\n"
+    assert short.full_text is None
@@ -0,0 +1,187 @@
+import pytest
+import pytest_asyncio
+import os
+import sys
+from functools import lru_cache
+from unittest.mock import AsyncMock, MagicMock
+from bson import ObjectId
+from pymongo import MongoClient
+from pymongo.errors import OperationFailure, PyMongoError
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.core.indexes import INDEXES, IndexSpec, ensure_indexes, index_report
+
+# explain() tests run against a real server and are skipped without one
+TEST_MONGODB_URL = os.getenv("TEST_MONGODB_URL", "mongodb://localhost:27017")
+
+JOB_ID = ObjectId()
+
+
+class AsyncCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def fake_db(existing, ops=None):
+    """A database whose collections have the `existing` {collection: [index names]}"""
+    collections = {}
+
+    def collection(name):
+        if name not in collections:
+            mock = MagicMock()
+            names = ["_id_"] + existing.get(name, [])
+            mock.index_information = AsyncMock(return_value={index: {} for index in names})
+            mock.create_index = AsyncMock()
+            mock.aggregate = lambda pipeline: AsyncCursor([
+                {"name": index, "accesses": {"ops": (ops or {}).get(f"{name}.{index}", 1)}} for index in names
+            ])
+            collections[name] = mock
+        return collections[name]
+
+    db = MagicMock()
+    db.__getitem__.side_effect = collection
+    db.list_collection_names = AsyncMock(return_value=list(existing))
+    return db
+
+
+REGISTRY = [
+    IndexSpec("users", (("email", 1),), "Login", {"unique": True}),
+    IndexSpec("candidates", (("job_id", 1), ("created_at", 1), ("_id", 1)), "Listing"),
+]
+
+
+def test_index_names_are_unique():
+    names = [(spec.collection, spec.name) for spec in INDEXES]
+    assert len(names) == len(set(names))
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_creates_missing_indexes_only():
+    db = fake_db({"users": ["email_1"]})
+
+    result = await ensure_indexes(db, REGISTRY)
+
+    assert result == {"created": ["candidates.job_id_1_created_at_1__id_1"], "failed": []}
+    db["users"].create_index.assert_not_called()
+    db["candidates"].create_index.assert_awaited_once_with(
+        [("job_id", 1), ("created_at", 1), ("_id", 1)], name="job_id_1_created_at_1__id_1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_reports_conflicts_and_continues():
+    db = fake_db({})
+    db["users"].create_index.side_effect = OperationFailure("Index already exists with different options", 85)
+
+    result = await ensure_indexes(db, REGISTRY)
+
+    assert result == {"created": ["candidates.job_id_1_created_at_1__id_1"], "failed": ["users.email_1"]}
+
+
+@pytest.mark.asyncio
+async def test_index_report():
+    db = fake_db(
+        {"users": ["email_1"], "candidates": ["name_1"], "fs.files": ["filename_1_uploadDate_1"]},
+        ops={"users.email_1": 0}
+    )
+
+    report = await index_report(db, REGISTRY)
+
+    assert report == {
+        "missing": ["candidates.job_id_1_created_at_1__id_1"],
+        "undeclared": ["candidates.name_1"],
+        "unused": ["users.email_1"],
+    }
+
+
+@lru_cache(maxsize=1)
+def mongo_available() -> bool:
+    try:
+        MongoClient(TEST_MONGODB_URL, serverSelectionTimeoutMS=500).admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
+
+
+@pytest_asyncio.fixture
+async def mongo_db():
+    """A scratch database with the registry's indexes and a little data"""
+    if not mongo_available():
+        pytest.skip(f"No MongoDB server at {TEST_MONGODB_URL}")
+    client = AsyncIOMotorClient(TEST_MONGODB_URL)
+    db = client[f"talent_sourcing_index_test_{os.getpid()}"]
+    await ensure_indexes(db)
+    await db.candidates.insert_many([
+        {"job_id": JOB_ID if i % 10 == 0 else ObjectId(), "resume_score": i % 100, "screening_score": None,
+         "resume_file_id": str(ObjectId()), "created_at": i}
+        for i in range(500)
+    ])
+    await db.jobs.insert_many([{"title": f"Job {i}", "created_at": i} for i in range(100)])
+    yield db
+    await client.drop_database(db.name)
+    client.close()
+
+
+def plan_stages(plan) -> set:
+    """Every stage name in an explain() plan tree"""
+    if isinstance(plan, dict):
+        stages = {plan["stage"]} if isinstance(plan.get("stage"), str) else set()
+        for value in plan.values():
+            stages |= plan_stages(value)
+        return stages
+    if isinstance(plan, list):
+        return set().union(*(plan_stages(value) for value in plan)) if plan else set()
+    return set()
+
+
+HOT_QUERIES = [
+    ("users", {"email": "jane@example.com"}, None),
+    ("jobs", {}, [("created_at", -1), ("_id", -1)]),
+    ("candidates", {"job_id": JOB_ID}, [("created_at", 1), ("_id", 1)]),
+    ("candidates", {"job_id": JOB_ID, "resume_score": {"$gte": 70}}, [("resume_score", -1), ("_id", -1)]),
+    ("candidates", {"job_id": JOB_ID, "screening_score": {"$ne": None}}, None),
+    ("candidates", {"resume_file_id": "abc", "_id": {"$ne": ObjectId()}}, None),
+    ("call_sessions", {"call_id": "CA123"}, None),
+    ("voice_configs", {"type": "global"}, None),
+    ("voice_configs", {"job_id": str(JOB_ID), "type": "job"}, None),
+    ("ingestion_jobs", {"job_id": JOB_ID}, [("created_at", -1)]),
+    ("llm_cache", {"prompt_version": "resume-analysis-v3"}, None),
+    ("resume_terms", {"job_id": JOB_ID}, None),
+    ("resume_terms", {"sha256": "abc"}, None),
+]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize("collection, query, sort", HOT_QUERIES)
+async def test_hot_queries_use_an_index(mongo_db, collection, query, sort):
+    cursor = mongo_db[collection].find(query).limit(10)
+    if sort:
+        cursor = cursor.sort(sort)
+
+    explain = await cursor.explain()
+
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+    assert "SORT" not in stages
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_ensure_indexes_is_idempotent(mongo_db):
+    assert await ensure_indexes(mongo_db) == {"created": [], "failed": []}
+    assert (await index_report(mongo_db))["missing"] == []
@@ -0,0 +1,82 @@
+import pytest
+import os
+import sys
+import zipfile
+from datetime import datetime, UTC
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from fastapi import UploadFile
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+# Fixtures for testing
+
+@pytest.fixture
+def mock_user():
+    """Create a mock user for testing"""
+    user_id = str(ObjectId())
+    return {
+        "_id": ObjectId(user_id),
+        "id": user_id,
+        "email": "test@example.com",
+        "full_name": "Test User",
+        "is_active": True,
+        "is_superuser": False,
+        "created_at": datetime.now(UTC),
+        "updated_at": datetime.now(UTC)
+    }
+
+@pytest.fixture
+def zip_bytes():
+    """A ZIP archive with two resumes and one non-PDF member"""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("alice.pdf", b"%PDF-1.4 alice")
+        archive.writestr("team/bob.pdf", b"%PDF-1.4 bob")
+        archive.writestr("readme.txt", b"ignored")
+    return buffer.getvalue()
+
+@pytest.fixture
+def zip_upload(zip_bytes):
+    """Create an UploadFile wrapping the ZIP archive"""
+    spooled_file = SpooledTemporaryFile()
+    spooled_file.write(zip_bytes)
+    spooled_file.seek(0)
+    return UploadFile(file=spooled_file, filename="resumes.zip", size=len(zip_bytes))
+
+@pytest.fixture
+def mock_gridfs(zip_bytes):
+    """Mock GridFS bucket that serves the ZIP archive back to workers"""
+    mock_fs = AsyncMock()
+    mock_fs.upload_from_stream.return_value = ObjectId()
+
+    async def download_to_stream(file_id, destination):
+        destination.write(zip_bytes)
+
+    mock_fs.download_to_stream.side_effect = download_to_stream
+    return mock_fs
+
+@pytest.fixture
+def mock_db():
+    """Mock database with an ingestion_jobs collection"""
+    mock_database = MagicMock()
+    mock_database.ingestion_jobs = AsyncMock()
+    mock_database.ingestion_jobs.update_one.return_value = MagicMock(matched_count=1)
+    return mock_database
+
+@pytest.fixture
+def mock_services(mock_db, mock_gridfs):
+    """Patch database and GridFS access in the ingestion service"""
+    async def _get_database():
+        return mock_db
+
+    async def _get_gridfs():
+        return mock_gridfs
+
+    with patch("app.services.ingestion.get_database", _get_database), \
+         patch("app.services.ingestion.get_gridfs", _get_gridfs), \
+         patch("app.services.ingestion.settings.INGESTION_INLINE_WORKER", False):
+        yield mock_db, mock_gridfs
@@ -0,0 +1,166 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.services.ingestion import (
+    add_enqueue_listener,
+    claim_ingestion_job,
+    enqueue_ingestion,
+    remove_enqueue_listener,
+    run_ingestion_job,
+)
+from app.models.database import User
+
+def make_ingestion_job(statuses):
+    return {
+        "_id": ObjectId(),
+        "job_id": ObjectId(),
+        "created_by_id": ObjectId(),
+        "filename": "resumes.zip",
+        "file_id": str(ObjectId()),
+        "kind": "zip",
+        "status": "processing",
+        "items": [
+            {"filename": name, "status": status, "candidate_id": None, "duration_ms": None, "error": None}
+            for name, status in zip(["alice.pdf", "bob.pdf"], statuses)
+        ],
+        "attempts": 1,
+        "lease_owner": "worker-1"
+    }
+
+@pytest.mark.asyncio
+async def test_enqueue_ingestion_stores_upload_and_lists_members(mock_services, zip_upload, mock_user):
+    """Enqueueing stores the archive in GridFS and creates one pending item per PDF"""
+    mock_db, mock_fs = mock_services
+
+    result = await enqueue_ingestion(str(ObjectId()), zip_upload, User(**mock_user))
+
+    mock_fs.upload_from_stream.assert_called_once()
+    mock_db.ingestion_jobs.insert_one.assert_called_once()
+    assert result["status"] == "pending"
+    assert result["total"] == 2
+    assert [item["filename"] for item in result["items"]] == ["alice.pdf", "bob.pdf"]
+
+@pytest.mark.asyncio
+async def test_enqueue_ingestion_wakes_listeners(mock_services, zip_upload, mock_user):
+    """Queueing only inserts the job and wakes the inline worker, it runs nothing itself"""
+    wake = MagicMock()
+    add_enqueue_listener(wake)
+    try:
+        await enqueue_ingestion(str(ObjectId()), zip_upload, User(**mock_user))
+    finally:
+        remove_enqueue_listener(wake)
+
+    wake.assert_called_once_with()
+
+@pytest.mark.asyncio
+async def test_enqueue_ingestion_rejects_other_files(mock_services, zip_upload, mock_user):
+    zip_upload.filename = "resumes.docx"
+    with pytest.raises(HTTPException) as exc_info:
+        await enqueue_ingestion(str(ObjectId()), zip_upload, User(**mock_user))
+    assert exc_info.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_claim_ingestion_job_takes_pending_or_expired_leases(mock_services):
+    """Claiming is a single find_one_and_update that sets the lease owner"""
+    mock_db, _ = mock_services
+
+    await claim_ingestion_job("worker-1")
+
+    query, update = mock_db.ingestion_jobs.find_one_and_update.call_args.args
+    assert query["$or"][0]["status"] == "pending"
+    assert "$gt" in query["$or"][0]["available_at"]["$not"]
+    assert query["$or"][1]["status"] == "processing"
+    assert "$lt" in query["$or"][1]["lease_expires_at"]
+    assert update["$set"]["lease_owner"] == "worker-1"
+    assert update["$inc"] == {"attempts": 1}
+
+@pytest.mark.asyncio
+async def test_run_ingestion_job_records_progress_per_file(mock_services):
+    """Only pending items are processed and each one is written back individually"""
+    mock_db, mock_fs = mock_services
+    ingestion_job = make_ingestion_job(["succeeded", "pending"])
+    processed = []
+
+    async def process(content, filename, job_id, created_by, job_context=None, cascade=None, ingestion_key=None):
+        processed.append((filename, content, ingestion_key))
+        return {"id": str(ObjectId())}
+
+    with patch("app.services.candidates.process_pdf_file", side_effect=process):
+        await run_ingestion_job(ingestion_job, "worker-1")
+
+    assert processed == [("bob.pdf", b"%PDF-1.4 bob", f"{ingestion_job['_id']}:1")]
+    progress_query, progress_update = mock_db.ingestion_jobs.update_one.call_args_list[0].args
+    assert progress_query["lease_owner"] == "worker-1"
+    assert progress_update["$set"]["items.1.status"] == "succeeded"
+    assert progress_update["$inc"] == {"processed": 1, "succeeded": 1}
+    final_update = mock_db.ingestion_jobs.update_one.call_args_list[-1].args[1]
+    assert final_update["$set"]["status"] == "completed"
+    mock_fs.delete.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_run_ingestion_job_stops_when_lease_is_lost(mock_services):
+    """A worker that lost its lease must not mark the job completed"""
+    mock_db, mock_fs = mock_services
+    mock_db.ingestion_jobs.update_one.return_value = MagicMock(matched_count=0)
+    ingestion_job = make_ingestion_job(["pending", "pending"])
+
+    async def process(content, filename, job_id, created_by, job_context=None, cascade=None, ingestion_key=None):
+        return {"id": str(ObjectId())}
+
+    with patch("app.services.candidates.process_pdf_file", side_effect=process):
+        await run_ingestion_job(ingestion_job, "worker-1")
+
+    for call in mock_db.ingestion_jobs.update_one.call_args_list:
+        assert call.args[1]["$set"].get("status") != "completed"
+    mock_fs.delete.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_failed_ingestion_job_is_retried_after_a_delay(mock_services):
+    """A failed attempt puts the job back with a backoff that doubles per attempt"""
+    mock_db, mock_fs = mock_services
+    mock_fs.download_to_stream.side_effect = RuntimeError("GridFS unavailable")
+    ingestion_job = {**make_ingestion_job(["pending", "pending"]), "attempts": 2}
+
+    with patch("app.services.ingestion.settings.INGESTION_RETRY_BACKOFF_SECONDS", 10):
+        await run_ingestion_job(ingestion_job, "worker-1")
+
+    update = mock_db.ingestion_jobs.update_one.call_args.args[1]["$set"]
+    assert update["status"] == "pending"
+    assert (update["available_at"] - update["updated_at"]).total_seconds() == 20
+
+@pytest.mark.asyncio
+async def test_failed_files_are_queued_again(mock_services):
+    """Files that failed go back to pending with a backoff while attempts remain"""
+    mock_db, mock_fs = mock_services
+    ingestion_job = make_ingestion_job(["pending", "pending"])
+
+    async def process(content, filename, job_id, created_by, job_context=None, cascade=None, ingestion_key=None):
+        if filename == "bob.pdf":
+            raise RuntimeError("LLM unavailable")
+        return {"id": str(ObjectId())}
+
+    with patch("app.services.candidates.process_pdf_file", side_effect=process):
+        await run_ingestion_job(ingestion_job, "worker-1")
+
+    update = mock_db.ingestion_jobs.update_one.call_args.args[1]
+    assert update["$set"]["items.1.status"] == "pending"
+    assert "items.0.status" not in update["$set"]
+    assert update["$set"]["status"] == "pending"
+    assert update["$set"]["available_at"] > update["$set"]["updated_at"]
+    assert update["$inc"] == {"processed": -1, "failed": -1}
+    mock_fs.delete.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_failed_files_are_kept_on_the_last_attempt(mock_services):
+    mock_db, mock_fs = mock_services
+    ingestion_job = {**make_ingestion_job(["succeeded", "pending"]), "attempts": 3}
+
+    with patch("app.services.candidates.process_pdf_file", side_effect=RuntimeError("LLM unavailable")), \
+         patch("app.services.ingestion.settings.INGESTION_MAX_ATTEMPTS", 3):
+        await run_ingestion_job(ingestion_job, "worker-1")
+
+    final_update = mock_db.ingestion_jobs.update_one.call_args.args[1]["$set"]
+    assert final_update["status"] == "completed"
+    mock_fs.delete.assert_called_once()
@@ -0,0 +1,103 @@
+import pytest
+import asyncio
+from unittest.mock import patch, AsyncMock
+from bson import ObjectId
+
+from app.workers.ingest import IngestionWorker
+
+def queued_jobs(count):
+    jobs = [{"_id": ObjectId(), "attempts": 1} for _ in range(count)]
+    return AsyncMock(side_effect=jobs + [None] * 10)
+
+@pytest.fixture
+def mock_queue():
+    """Patch the queue operations used by the worker"""
+    with patch("app.workers.ingest.recover_stale_ingestion_jobs", AsyncMock(return_value=0)) as recover, \
+         patch("app.workers.ingest.release_ingestion_job", AsyncMock()) as release, \
+         patch("app.workers.ingest.renew_ingestion_lease", AsyncMock(return_value=True)) as renew:
+        yield {"recover": recover, "release": release, "renew": renew}
+
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_up_to_concurrency(mock_queue):
+    """The worker never runs more ingestion jobs at once than its concurrency"""
+    in_flight = 0
+    peak = 0
+    finished = []
+
+    async def run_job(ingestion_job, worker_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        finished.append(ingestion_job["_id"])
+
+    with patch("app.workers.ingest.claim_ingestion_job", queued_jobs(5)), \
+         patch("app.workers.ingest.run_ingestion_job", side_effect=run_job):
+        await IngestionWorker(worker_id="worker-1", concurrency=2).run(once=True)
+
+    assert len(finished) == 5
+    assert peak == 2
+    mock_queue["recover"].assert_called()
+    mock_queue["release"].assert_not_called()
+
+@pytest.mark.asyncio
+async def test_worker_abandons_job_when_lease_is_lost(mock_queue):
+    """A failed lease renewal cancels the job instead of racing the new owner"""
+    mock_queue["renew"].return_value = False
+    cancelled = asyncio.Event()
+
+    async def run_job(ingestion_job, worker_id):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with patch("app.workers.ingest.claim_ingestion_job", queued_jobs(1)), \
+         patch("app.workers.ingest.run_ingestion_job", side_effect=run_job), \
+         patch("app.workers.ingest.settings.INGESTION_LEASE_SECONDS", 0):
+        await asyncio.wait_for(IngestionWorker(worker_id="worker-1").run(once=True), timeout=5)
+
+    assert cancelled.is_set()
+    mock_queue["renew"].assert_called()
+
+@pytest.mark.asyncio
+async def test_worker_releases_jobs_on_shutdown(mock_queue):
+    """Jobs still running after the shutdown timeout go back to the queue"""
+    started = asyncio.Event()
+
+    async def run_job(ingestion_job, worker_id):
+        started.set()
+        await asyncio.sleep(10)
+
+    worker = IngestionWorker(worker_id="worker-1", concurrency=1)
+    with patch("app.workers.ingest.claim_ingestion_job", queued_jobs(1)), \
+         patch("app.workers.ingest.run_ingestion_job", side_effect=run_job), \
+         patch("app.workers.ingest.settings.INGESTION_SHUTDOWN_TIMEOUT", 0.01), \
+         patch("app.workers.ingest.settings.INGESTION_POLL_INTERVAL", 0.01):
+        run_task = asyncio.create_task(worker.run())
+        await started.wait()
+        worker.stop()
+        await asyncio.wait_for(run_task, timeout=5)
+
+    mock_queue["release"].assert_called_once()
+
+@pytest.mark.asyncio
+async def test_wake_polls_the_queue_before_the_poll_interval(mock_queue):
+    """A queued job is picked up right away instead of at the next poll"""
+    claim = AsyncMock(return_value=None)
+    worker = IngestionWorker(worker_id="worker-1", concurrency=1)
+    with patch("app.workers.ingest.claim_ingestion_job", claim), \
+         patch("app.workers.ingest.settings.INGESTION_POLL_INTERVAL", 60):
+        run_task = asyncio.create_task(worker.run())
+        while not claim.await_count:
+            await asyncio.sleep(0)
+        worker.wake()
+        await asyncio.wait_for(_until(lambda: claim.await_count >= 2), timeout=5)
+        worker.stop()
+        await asyncio.wait_for(run_task, timeout=5)
+
+async def _until(condition):
+    while not condition():
+        await asyncio.sleep(0.001)
@@ -76,7 +76,20 @@ def mock_db(mock_job):
     mock_database.jobs.insert_one = AsyncMock(return_value=MagicMock(inserted_id=mock_job["_id"]))
     mock_database.jobs.find_one_and_update = AsyncMock(return_value=mock_job)
     mock_database.jobs.delete_one = AsyncMock(return_value=MagicMock(deleted_count=1))
-    mock_database.jobs.update_one = AsyncMock()
+    mock_database.jobs.update_one = AsyncMock(return_value=MagicMock(matched_count=1))
+    mock_database.jobs.find_one_and_delete = AsyncMock(return_value=mock_job)
+    mock_database.jobs.bulk_write = AsyncMock()
+
+    # Mock the job stats rollup
+    mock_database.job_stats = MagicMock()
+    mock_database.job_stats.find_one = AsyncMock(return_value={
+        "_id": "global",
+        "total_jobs": 10,
+        "total_candidates": 50,
+        "resume_screened": 40,
+        "phone_screened": 30
+    })
+    mock_database.job_stats.update_one = AsyncMock()
     
     # Mock find with cursor that supports method chaining
     mock_cursor = MagicMock()
@@ -110,5 +123,6 @@ def mock_get_database(mock_db):
     async def _get_database():
         return mock_db
     
-    with patch("app.services.jobs.get_database", _get_database):
+    with patch("app.services.jobs.get_database", _get_database), \
+         patch("app.services.job_stats.get_database", _get_database):
         yield mock_db 
\ No newline at end of file
@@ -0,0 +1,92 @@
+import pytest
+import os
+import sys
+from unittest.mock import MagicMock
+from bson import ObjectId
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.services.job_stats import (
+    candidate_counts,
+    get_rollup,
+    record_candidate_added,
+    reconcile_job_stats,
+)
+
+
+class AsyncCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def test_candidate_counts():
+    assert candidate_counts({"resume_score": 0, "screening_score": None}) == {
+        "total_candidates": 1, "resume_screened": 1, "phone_screened": 0
+    }
+    assert candidate_counts({"screening_score": 72.5})["phone_screened"] == 1
+
+
+@pytest.mark.asyncio
+async def test_record_candidate_added_updates_job_and_rollup(mock_get_database, mock_job):
+    await record_candidate_added(mock_job["_id"], {"resume_score": 80.0, "screening_score": None})
+
+    increment = {"total_candidates": 1, "resume_screened": 1}
+    mock_get_database.jobs.update_one.assert_awaited_once_with({"_id": mock_job["_id"]}, {"$inc": increment})
+    assert mock_get_database.job_stats.update_one.call_args.args[1]["$inc"] == increment
+
+
+@pytest.mark.asyncio
+async def test_candidates_of_deleted_jobs_are_not_counted(mock_get_database, mock_job):
+    mock_get_database.jobs.update_one.return_value = MagicMock(matched_count=0)
+
+    await record_candidate_added(mock_job["_id"], {"resume_score": 80.0})
+
+    mock_get_database.job_stats.update_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_job_stats(mock_get_database):
+    """Drifted job counters are rewritten and the rollup rebuilt from the candidates"""
+    drifted, correct, empty = ObjectId(), ObjectId(), ObjectId()
+    db = mock_get_database
+    db.candidates.aggregate = MagicMock(return_value=AsyncCursor([
+        {"_id": drifted, "total_candidates": 3, "resume_screened": 3, "phone_screened": 1},
+        {"_id": correct, "total_candidates": 2, "resume_screened": 1, "phone_screened": 0},
+        {"_id": ObjectId(), "total_candidates": 7, "resume_screened": 7, "phone_screened": 7},  # Deleted job
+    ]))
+    db.jobs.find = MagicMock(return_value=AsyncCursor([
+        {"_id": drifted, "total_candidates": 5, "resume_screened": 3, "phone_screened": 0},
+        {"_id": correct, "total_candidates": 2, "resume_screened": 1, "phone_screened": 0},
+        {"_id": empty},
+    ]))
+
+    rollup = await reconcile_job_stats()
+
+    updates = db.jobs.bulk_write.call_args.args[0]
+    assert [update._filter for update in updates] == [{"_id": drifted}]
+    assert updates[0]._doc == {"$set": {"total_candidates": 3, "resume_screened": 3, "phone_screened": 1}}
+    assert {key: rollup[key] for key in ("total_jobs", "total_candidates", "resume_screened", "phone_screened")} == {
+        "total_jobs": 3, "total_candidates": 5, "resume_screened": 4, "phone_screened": 1
+    }
+    assert db.job_stats.update_one.call_args.kwargs["upsert"] is True
+
+
+@pytest.mark.asyncio
+async def test_get_rollup_reconciles_when_missing(mock_get_database):
+    db = mock_get_database
+    db.job_stats.find_one.return_value = None
+    db.candidates.aggregate = MagicMock(return_value=AsyncCursor([]))
+    db.jobs.find = MagicMock(return_value=AsyncCursor([{"_id": ObjectId()}]))
+
+    assert await get_rollup() == {"total_jobs": 1, "total_candidates": 0, "resume_screened": 0, "phone_screened": 0}
@@ -9,6 +9,7 @@ from datetime import datetime
 # Add parent directory to path to allow imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
+from app.core.pagination import InvalidCursor, decode_cursor, next_cursor
 from app.services.jobs import (
     create_job,
     get_job,
@@ -90,6 +91,31 @@ async def test_get_jobs(mock_get_database, mock_job):
     mock_db = mock_get_database
     mock_db.jobs.find.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_get_jobs_after_cursor(mock_get_database, mock_job):
+    """A cursor turns the page into a range query on (created_at, _id) instead of a skip"""
+    page = await get_jobs(limit=1)
+    cursor = next_cursor(page, 1)
+
+    await get_jobs(limit=1, cursor=cursor)
+
+    query = mock_get_database.jobs.find.call_args.args[0]
+    created_at = datetime.fromisoformat(page[0]["created_at"])
+    assert query == {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": mock_job["_id"]}},
+        {"created_at": None}
+    ]}
+    mock_get_database.jobs.find.return_value.sort.assert_called_with([("created_at", -1), ("_id", -1)])
+
+def test_pagination_cursor_round_trip(mock_job):
+    item = {"id": str(mock_job["_id"]), "created_at": mock_job["created_at"].isoformat()}
+
+    assert next_cursor([item], 2) is None
+    assert decode_cursor(next_cursor([item], 1)) == ("created_at", mock_job["created_at"], mock_job["_id"])
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
 @pytest.mark.asyncio
 async def test_update_job(mock_get_database, mock_job):
     """Test updating a job"""
@@ -120,9 +146,11 @@ async def test_delete_job(mock_get_database):
     """Test deleting a job"""
     job_id = "507f1f77bcf86cd799439011"
     
-    # Setup the mock to return a successful deletion
+    # Setup the mock to return the deleted job and its counters
     mock_db = mock_get_database
-    mock_db.jobs.delete_one.return_value = AsyncMock(deleted_count=1)
+    mock_db.jobs.find_one_and_delete.return_value = {
+        "_id": ObjectId(job_id), "total_candidates": 4, "resume_screened": 3, "phone_screened": 1
+    }
     
     # Call the delete_job function
     result = await delete_job(job_id)
@@ -131,7 +159,9 @@ async def test_delete_job(mock_get_database):
     assert result is True
     
     # Verify the database was called correctly
-    mock_db.jobs.delete_one.assert_called_once()
+    mock_db.jobs.find_one_and_delete.assert_called_once()
+    update = mock_db.job_stats.update_one.call_args.args[1]
+    assert update["$inc"] == {"total_jobs": -1, "total_candidates": -4, "resume_screened": -3, "phone_screened": -1}
 
 @pytest.mark.asyncio
 async def test_get_job_stats(mock_get_database):
@@ -140,15 +170,13 @@ async def test_get_job_stats(mock_get_database):
     result = await get_job_stats()
     
     # Verify the result
-    assert result is not None
-    assert "total_jobs" in result
-    assert "total_candidates" in result
-    assert "resume_screened" in result
-    assert "phone_screened" in result
+    assert result == {"total_jobs": 10, "total_candidates": 50, "resume_screened": 40, "phone_screened": 30}
     
-    # Verify the database was called correctly
+    # Verify one document was read, without counting candidates
     mock_db = mock_get_database
-    mock_db.jobs.aggregate.assert_called_once()
+    mock_db.job_stats.find_one.assert_called_once_with({"_id": "global"})
+    mock_db.jobs.aggregate.assert_not_called()
+    mock_db.candidates.count_documents.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_sync_job_candidates_count(mock_get_database, mock_job):
@@ -157,7 +185,9 @@ async def test_sync_job_candidates_count(mock_get_database, mock_job):
     
     # Setup the mocks for candidate counts
     mock_db = mock_get_database
-    mock_db.candidates.count_documents.side_effect = [10, 8, 5]  # total, resume, phone
+    mock_db.candidates.aggregate.return_value.to_list = AsyncMock(return_value=[{
+        "_id": mock_job["_id"], "total_candidates": 10, "resume_screened": 8, "phone_screened": 5
+    }])
     mock_db.jobs.find_one_and_update.return_value = {
         **mock_job,
         "total_candidates": 10,
@@ -175,5 +205,9 @@ async def test_sync_job_candidates_count(mock_get_database, mock_job):
     assert result["phone_screened"] == 5
     
     # Verify the database was called correctly
-    assert mock_db.candidates.count_documents.call_count == 3
-    mock_db.jobs.find_one_and_update.assert_called_once() 
\ No newline at end of file
+    mock_db.candidates.aggregate.assert_called_once()
+    mock_db.jobs.find_one_and_update.assert_called_once()
+    
+    # The stats of all jobs move by the drift of the job's stored counts
+    update = mock_db.job_stats.update_one.call_args.args[1]
+    assert update["$inc"] == {"total_candidates": 10, "resume_screened": 8, "phone_screened": 5} 
\ No newline at end of file
@@ -14,6 +14,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')
 # Import app modules
 from app.main import app
 from app.api.v1.api import api_router
+from app.api.deps import get_current_superuser, get_current_user
+from app.core.metrics import metrics
 from app.services.auth import get_current_active_user
 
 # Create a test client
@@ -40,6 +42,23 @@ def override_dependency():
     yield
     app.dependency_overrides = {}
 
+@pytest.fixture
+def as_user():
+    """Authenticate routes using app.api.deps.get_current_user, such as the candidate routes"""
+    app.dependency_overrides[get_current_user] = lambda: mock_user
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+@pytest.fixture
+def as_superuser():
+    """Authenticate admin routes as a superuser"""
+    async def mock_get_current_superuser():
+        return {**mock_user, "is_superuser": True}
+
+    app.dependency_overrides[get_current_superuser] = mock_get_current_superuser
+    yield
+    app.dependency_overrides.pop(get_current_superuser, None)
+
 # Test cases for API endpoints
 
 def test_create_job():
@@ -127,6 +146,25 @@ def test_get_jobs():
         # Verify the service was called
         mock_get_jobs.assert_called_once()
 
+def test_get_jobs_next_cursor():
+    """A full page carries the cursor of the next one"""
+    job = {"id": str(ObjectId()), "title": "Test Job", "created_at": datetime.utcnow().isoformat()}
+    with patch("app.api.v1.jobs.jobs.get_jobs", AsyncMock(return_value=[job])) as mock_get_jobs:
+        response = client.get("/api/v1/jobs/?limit=1")
+        next_page = client.get(f"/api/v1/jobs/?limit=1&cursor={response.headers['X-Next-Cursor']}")
+
+    assert response.status_code == next_page.status_code == 200
+    assert mock_get_jobs.call_args.kwargs["cursor"] == response.headers["X-Next-Cursor"]
+
+    with patch("app.api.v1.jobs.jobs.get_jobs", AsyncMock(return_value=[job])):
+        assert "X-Next-Cursor" not in client.get("/api/v1/jobs/?limit=2").headers
+
+def test_get_jobs_invalid_cursor():
+    with patch("app.services.jobs.get_database", AsyncMock()):
+        response = client.get("/api/v1/jobs/?cursor=garbage")
+
+    assert response.status_code == 400
+
 def test_get_job():
     """Test getting a specific job through the API"""
     job_id = str(ObjectId())
@@ -186,31 +224,24 @@ def test_get_job_stats():
         # Verify the service was called
         mock_get_job_stats.assert_called_once()
 
-def test_upload_resume():
-    """Test uploading a resume through the API"""
+def test_upload_resume(as_user):
+    """Test that uploading a resume through the API queues it and returns 202"""
     job_id = str(ObjectId())
-    candidate_id = str(ObjectId())
+    ingestion_job_id = str(ObjectId())
     
-    # Mock the upload_resume service
-    with patch("app.api.v1.candidates.upload_resume") as mock_upload_resume:
+    # Mock the enqueue_ingestion service
+    with patch("app.api.v1.candidates.enqueue_ingestion") as mock_enqueue_ingestion:
         # Setup the mock
-        mock_upload_resume.return_value = {
-            "id": candidate_id,
+        mock_enqueue_ingestion.return_value = {
+            "id": ingestion_job_id,
             "job_id": job_id,
-            "name": "Test Candidate",
-            "email": "test.candidate@example.com",
-            "phone": "+1234567890",
-            "location": "Test Location",
-            "resume_file_id": str(ObjectId()),
-            "skills": {"Python": 0.8, "JavaScript": 0.7},
-            "resume_score": 85.0,
-            "screening_score": None,
-            "screening_summary": None,
-            "screening_in_progress": False,
-            "call_transcript": None,
-            "notice_period": None,
-            "current_compensation": None,
-            "expected_compensation": None,
+            "filename": "test_resume.pdf",
+            "status": "pending",
+            "total": 1,
+            "processed": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "items": [{"filename": "test_resume.pdf", "status": "pending"}],
             "created_at": datetime.utcnow().isoformat(),
             "updated_at": datetime.utcnow().isoformat()
         }
@@ -220,20 +251,19 @@ def test_upload_resume():
         
         # Make the request
         response = client.post(
-            f"/api/v1/{job_id}/upload",
+            f"/api/v1/candidates/{job_id}/upload",
             files={"file": ("test_resume.pdf", test_file_content, "application/pdf")}
         )
         
         # Verify the response
-        assert response.status_code == 200
+        assert response.status_code == 202
         data = response.json()
-        assert data["id"] == candidate_id
+        assert data["id"] == ingestion_job_id
         assert data["job_id"] == job_id
-        assert data["name"] == "Test Candidate"
-        assert data["email"] == "test.candidate@example.com"
+        assert data["status"] == "pending"
         
         # Verify the service was called
-        mock_upload_resume.assert_called_once()
+        mock_enqueue_ingestion.assert_called_once()
 
 def test_get_candidates():
     """Test getting candidates through the API"""
@@ -292,4 +322,16 @@ def test_get_candidates():
         assert data[1]["name"] == "Test Candidate 2"
         
         # Verify the service was called
-        mock_get_candidates.assert_called_once_with(job_id, 0, 10) 
\ No newline at end of file
+        mock_get_candidates.assert_called_once()
+        assert mock_get_candidates.call_args.args == (job_id, 0, 10, None)
+
+def test_get_metrics(as_superuser):
+    """Test reading the process metrics as a superuser"""
+    metrics.counter("resume_dedup_hits").inc()
+
+    response = client.get("/api/v1/admin/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["counters"]["resume_dedup_hits"] >= 1
+    assert set(data) == {"counters", "gauges", "latencies"}
@@ -195,7 +195,7 @@ export default function JobDetails() {
           try {
             // Upload phase (0-30%)
             setStatusMessage(`Uploading ${file.name}...`);
-            await jobsApi.createCandidate(job.id, formData, (progressEvent) => {
+            let ingestionJob = await jobsApi.createCandidate(job.id, formData, (progressEvent) => {
               if (progressEvent.total) {
                 const uploadProgress = (progressEvent.loaded / progressEvent.total) * 30;
                 setUploadProgress(prev => ({
@@ -205,34 +205,26 @@ export default function JobDetails() {
               }
             });
             
-            // AI Analysis phase (30-60%)
+            // AI Analysis phase (30-100%), processed in the background
             setStatusMessage(`Analyzing ${file.name} using AI...`);
-            await new Promise(resolve => setTimeout(resolve, 1000));
-            setUploadProgress(prev => ({
-              ...prev,
-              [file.name]: 60
-            }));
-            
-            // Information Extraction phase (60-80%)
-            setStatusMessage(`Extracting information from ${file.name}...`);
-            await new Promise(resolve => setTimeout(resolve, 1000));
-            setUploadProgress(prev => ({
-              ...prev,
-              [file.name]: 80
-            }));
-            
-            // Final Processing phase (80-100%)
-            setStatusMessage(`Computing skills and experience scores...`);
-            await new Promise(resolve => setTimeout(resolve, 1000));
-            setUploadProgress(prev => ({
-              ...prev,
-              [file.name]: 100
-            }));
+            while (ingestionJob.status === 'pending' || ingestionJob.status === 'processing') {
+              await new Promise(resolve => setTimeout(resolve, 2000));
+              ingestionJob = await jobsApi.getIngestionJob(ingestionJob.id);
+              const processed = ingestionJob.total ? ingestionJob.processed / ingestionJob.total : 0;
+              setUploadProgress(prev => ({
+                ...prev,
+                [file.name]: 30 + processed * 70
+              }));
+            }
+            if (ingestionJob.status === 'failed' || ingestionJob.succeeded === 0) {
+              const failedItem = ingestionJob.items.find(item => item.error);
+              throw new Error(failedItem?.error || ingestionJob.error || 'Processing failed');
+            }
             
           } catch (error: any) {
             console.error(`Error uploading ${file.name}:`, error);
             setStatusMessage(`Failed to process ${file.name}`);
-            alert(`Failed to upload ${file.name}: ${error.response?.data?.detail || 'Unknown error'}`);
+            alert(`Failed to upload ${file.name}: ${error.response?.data?.detail || error.message || 'Unknown error'}`);
           }
         }
         
@@ -484,11 +476,11 @@ export default function JobDetails() {
                             color: theme.palette.mode === 'dark' ? 'primary.light' : 'primary.main'
                           }}
                         >
-                          {candidate.resume_score}%
+                          {candidate.resume_score !== null ? `${candidate.resume_score}%` : '-'}
                         </Typography>
                         <LinearProgress 
                           variant="determinate" 
-                          value={candidate.resume_score}
+                          value={candidate.resume_score ?? 0}
                           sx={{ 
                             width: 60,
                             height: 6,
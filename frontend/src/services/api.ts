@@ -59,7 +59,7 @@ export interface Candidate {
   location?: string | null;
   resume_file_id: string;  // Changed from resume_path
   skills: Record<string, number>;
-  resume_score: number;
+  resume_score: number | null;
   screening_score?: number | null;
   screening_summary?: string | null;
   screening_in_progress?: boolean;
@@ -72,6 +72,30 @@ export interface Candidate {
   updated_at: string;
 }
 
+export interface IngestionItem {
+  filename: string;
+  status: 'pending' | 'succeeded' | 'failed';
+  candidate_id?: string | null;
+  duration_ms?: number | null;
+  error?: string | null;
+}
+
+export interface IngestionJob {
+  id: string;
+  job_id: string;
+  filename: string;
+  status: 'pending' | 'processing' | 'completed' | 'failed';
+  total: number;
+  processed: number;
+  succeeded: number;
+  failed: number;
+  items: IngestionItem[];
+  error?: string | null;
+  created_at: string;
+  updated_at: string;
+  completed_at?: string | null;
+}
+
 export interface JobStats {
   total_jobs: number;
   total_candidates: number;
@@ -178,16 +202,19 @@ export const jobsApi = {
 
   // Candidates
   getCandidates: (jobId: string) =>
-    api.get<Candidate[]>(`/candidates/${jobId}/candidates`).then(res => res.data),
+    api.get<Candidate[]>(`/candidates/${jobId}/candidates`, { params: { view: 'summary' } }).then(res => res.data),
   getCandidate: (jobId: string, candidateId: string) =>
     api.get<Candidate>(`/candidates/${jobId}/candidates/${candidateId}`).then(res => res.data),
+  // Queues the upload for background processing; poll getIngestionJob for the outcome
   createCandidate: (jobId: string, formData: FormData, onProgress?: (progressEvent: AxiosProgressEvent) => void) =>
-    api.post<Candidate>(`/candidates/${jobId}/upload`, formData, {
+    api.post<IngestionJob>(`/candidates/${jobId}/upload`, formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
       onUploadProgress: onProgress,
     }).then(res => res.data),
+  getIngestionJob: (ingestionJobId: string) =>
+    api.get<IngestionJob>(`/ingestion-jobs/${ingestionJobId}`).then(res => res.data),
   updateCandidate: (jobId: string, candidateId: string, data: Partial<Candidate>) =>
     api.put<Candidate>(`/candidates/${jobId}/${candidateId}`, data).then(res => res.data),
   deleteCandidate: (jobId: string, candidateId: string) => 